@@ -0,0 +1,135 @@
+"""
+선수 조회 마이크로 벤치마크: pandas boolean mask vs PlayerIndex 해시 조회 vs SQLite(player_db)
+(+ 이름 오타 보정: 전체 이름 편집 거리 비교 vs 자모 bigram 역색인)
+(+ 순위표: 질문마다 pandas 정렬 vs 미리 정렬된 NumPy 배열)
+
+    python benchmarks/lookup_bench.py --repeat 2000
+"""
+import argparse
+import difflib
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from data_snapshot import coerce_stats  # noqa: E402
+from fuzzy_names import FuzzyNameIndex, bounded_edit_distance, to_jamo  # noqa: E402
+from leaderboard import QUALIFIED_PA, Leaderboard  # noqa: E402
+from player_db import SqlitePlayerIndex, build_player_db  # noqa: E402
+from player_index import PlayerIndex  # noqa: E402
+
+DATA_DIR = ROOT / "data"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    profiles = pd.read_csv(DATA_DIR / "player_profiles_1.csv", dtype=str)
+    stats = pd.read_csv(DATA_DIR / "KBO_2025_player_stats_type.csv", dtype=str)
+    team_instagram = pd.read_csv(DATA_DIR / "team_instagram_1.csv", dtype=str)
+
+    build = timeit.timeit(lambda: PlayerIndex(profiles, stats, team_instagram), number=5) / 5
+    tracemalloc.start()
+    index = PlayerIndex(profiles, stats, team_instagram)
+    index_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    db_path = Path(tmp_dir.name) / "players.sqlite3"
+    frames = {"profiles": profiles, "stats": coerce_stats(stats), "team_instagram": team_instagram}
+    sources = {"profiles": DATA_DIR / "player_profiles_1.csv", "stats": DATA_DIR / "KBO_2025_player_stats_type.csv",
+               "team_instagram": DATA_DIR / "team_instagram_1.csv"}
+    db_build = timeit.timeit(lambda: build_player_db(frames, sources, db_path), number=1)
+    db = SqlitePlayerIndex(db_path)
+
+    team, number, name, pid = "LG", "6", "구본혁", "69100"
+
+    cases = {
+        "(team, 등번호)": (
+            lambda: profiles[
+                (profiles["team"].str.contains(team, na=False)) &
+                (profiles["등번호"].astype(str)
+                 .str.replace("No.", "", case=False)
+                 .str.strip()
+                 .replace(".0", "", regex=False)
+                 == number)
+            ].iloc[0].to_dict(),
+            lambda: index.by_team_number(team, number)[0],
+            lambda: db.by_team_number(team, number)[0],
+        ),
+        "name -> profile": (
+            lambda: profiles[profiles["name"] == name].iloc[0].to_dict(),
+            lambda: index.by_name(name)[0],
+            lambda: db.by_name(name)[0],
+        ),
+        "playerId -> stats": (
+            lambda: stats[stats["playerId"] == pid],
+            lambda: index.stats_row(pid),
+            lambda: db.stats_row(pid),
+        ),
+        "team -> instagram": (
+            lambda: team_instagram.loc[team_instagram["team"] == team, "instagram"].values[0],
+            lambda: index.instagram(team),
+            lambda: db.instagram(team),
+        ),
+    }
+
+    print(f"index build: {build * 1000:.2f} ms ({len(profiles)} profiles, {len(stats)} stats rows), "
+          f"heap {index_bytes / 1024:.0f} KB per process")
+    print(f"sqlite build: {db_build * 1000:.2f} ms, file {db_path.stat().st_size / 1024:.0f} KB (shared, read-only)")
+    print(f"{'lookup':<20}{'pandas mask':>14}{'index':>12}{'sqlite':>12}{'speedup':>10}")
+    for label, (before, after, sqlite) in cases.items():
+        assert before is not None and after() is not None and sqlite() is not None
+        t_before = timeit.timeit(before, number=args.repeat) / args.repeat * 1e6
+        t_after = timeit.timeit(after, number=args.repeat) / args.repeat * 1e6
+        t_sqlite = timeit.timeit(sqlite, number=args.repeat) / args.repeat * 1e6
+        print(f"{label:<20}{t_before:>11.1f} us{t_after:>9.2f} us{t_sqlite:>9.2f} us{t_before / t_after:>9.0f}x")
+
+    # 이름 오타 보정
+    fuzzy = FuzzyNameIndex(profiles.to_dict("records"))
+    names = list(profiles["name"].dropna().unique())
+    jamo_names = [(n, to_jamo(n)) for n in names]
+    typo = "양의즤"
+
+    def brute_force():
+        q = to_jamo(typo)
+        return sorted((bounded_edit_distance(q, j, 2), n) for n, j in jamo_names)[0]
+
+    cases = {
+        "difflib": lambda: difflib.get_close_matches(typo, names, n=5),
+        "jamo brute force": brute_force,
+        "jamo bigram index": lambda: fuzzy.lookup(typo),
+    }
+    print(f"\ntypo '{typo}' -> {fuzzy.lookup(typo)}")
+    for label, fn in cases.items():
+        t = timeit.timeit(fn, number=max(1, args.repeat // 10)) / max(1, args.repeat // 10) * 1e6
+        print(f"{label:<20}{t:>11.1f} us")
+
+
+    # 순위표 (LG 타율 top 5)
+    typed = coerce_stats(stats)
+    build = timeit.timeit(lambda: Leaderboard(typed, profiles), number=5) / 5
+    board = Leaderboard(typed, profiles)
+
+    def pandas_top():
+        df = typed[(typed["팀명"] == team) & typed["AB"].notna()]
+        pa = df["PA"].fillna(df[["AB", "BB", "HBP", "SAC", "SF"]].fillna(0).sum(axis=1))
+        df = df[pa >= QUALIFIED_PA].sort_values("AVG", ascending=False).head(5)
+        return df.merge(profiles[["playerId", "name"]], on="playerId", how="left")
+
+    print(f"\nleaderboard build: {build * 1000:.2f} ms")
+    t_before = timeit.timeit(pandas_top, number=max(1, args.repeat // 10)) / max(1, args.repeat // 10) * 1e6
+    t_after = timeit.timeit(lambda: board.top("AVG", 5, team), number=args.repeat) / args.repeat * 1e6
+    print(f"{'LG 타율 top 5':<20}{t_before:>11.1f} us{t_after:>9.2f} us{t_before / t_after:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+뉴스 클라이언트 오프라인 점검/벤치마크 (로컬 fixture 서버의 뉴스 API 대역 사용)
+
+    python benchmarks/news_client_bench.py --iterations 200 --delay 0.05
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from fixture_server import start_fixture_server  # noqa: E402
+from news_client import NewsClient, RateLimiter  # noqa: E402
+
+TEAM_QUERIES = [f"{team} 야구 KBO 프로야구 경기" for team in ["LG", "KT", "SSG", "KIA", "NC"]]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--delay", type=float, default=0.05, help="대역 서버 응답 지연(초)")
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server(delay=args.delay)
+    handler = server.RequestHandlerClass
+    try:
+        # 1) 캐시: 같은 팀 검색어는 첫 요청만 API 호출
+        client = NewsClient(base_url=base_url, cache_ttl=60, stale_ttl=60)
+        cold, hot = [], []
+        for i in range(args.iterations):
+            query = TEAM_QUERIES[i % len(TEAM_QUERIES)]
+            items, ms = timed(lambda: client.search(query, display=3))
+            assert len(items) == 3 and "<b>" not in items[0]["title"]
+            (cold if i < len(TEAM_QUERIES) else hot).append(ms)
+        print(f"cold  p50={np.median(cold):.1f}ms   cached p50={np.median(hot) * 1000:.1f}us")
+        print(f"api requests: {handler.request_count} / searches: {args.iterations}  {client.stats}")
+
+        # 2) stale-while-revalidate: TTL 이 지나도 이전 결과를 즉시 반환하고 뒤에서 갱신
+        client = NewsClient(base_url=base_url, cache_ttl=0.1, stale_ttl=60)
+        client.search(TEAM_QUERIES[0])
+        time.sleep(0.15)
+        _, ms = timed(lambda: client.search(TEAM_QUERIES[0]))
+        time.sleep(args.delay * 2 + 0.1)
+        print(f"stale hit {ms:.2f}ms  {client.stats}")
+
+        # 3) 재시도: 500 두 번 뒤 성공
+        handler.fail_next = 2
+        client = NewsClient(base_url=base_url, retries=2)
+        items, ms = timed(lambda: client.search("재시도 확인"))
+        print(f"retry: {len(items)}건 ({ms:.0f}ms, 500 응답 2회 후 성공)")
+
+        # 4) 속도 제한: 초당 5회 → 10건 요청에 약 1초
+        client = NewsClient(base_url=base_url, cache_ttl=0, stale_ttl=0,
+                            rate_limiter=RateLimiter(rate=5, burst=5))
+        start = time.perf_counter()
+        for i in range(10):
+            client.search(f"속도 제한 {i}")
+        print(f"rate limit: 10 requests at 5/s took {time.perf_counter() - start:.2f}s  {client.stats}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
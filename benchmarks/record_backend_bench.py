@@ -0,0 +1,52 @@
+"""
+HTTP 기록 백엔드 오프라인 벤치마크 (로컬 fixture 서버 사용)
+
+    python benchmarks/record_backend_bench.py --iterations 200 --delay 0.05
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from fixture_server import start_fixture_server  # noqa: E402
+import record_parse  # noqa: E402
+from record_http import fetch_snapshot_http  # noqa: E402
+
+PLAYER_IDS = ["69100", "77263"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--delay", type=float, default=0.0, help="fixture 서버 응답 지연(초)")
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server(delay=args.delay)
+    record_parse.NAVER_SPORTS_BASE = base_url
+
+    try:
+        # 결과 표가 Selenium 경로와 같은 형태인지 확인
+        for pid in PLAYER_IDS:
+            snap = fetch_snapshot_http(pid)
+            assert snap.game_log is not None and snap.game_log.columns[0] == "일자", pid
+            assert snap.career is not None and snap.career.columns[0] == "시즌", pid
+            print(f"{pid}: 경기별 기록 {len(snap.game_log)}행 / 통산기록 {len(snap.career)}행")
+
+        samples = []
+        for i in range(args.iterations):
+            start = time.perf_counter()
+            fetch_snapshot_http(PLAYER_IDS[i % len(PLAYER_IDS)])
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        server.shutdown()
+
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    print(f"http backend  n={len(samples)}  p50={p50:.1f}ms  p95={p95:.1f}ms  p99={p99:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
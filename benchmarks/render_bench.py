@@ -0,0 +1,83 @@
+"""
+채팅 기록 다시 그리기 비용: 메시지마다 to_html + CSS 주입 vs 렌더 캐시(chat_render)
+
+대화가 N 개 쌓였을 때 rerun 한 번에 드는 HTML 생성 시간과 페이지에 넣는 HTML 크기를 비교.
+(Streamlit 자체의 요소 전송 / iframe 생성 비용은 포함하지 않음)
+
+    python benchmarks/render_bench.py --messages 40 80 160
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from chat_render import (  # noqa: E402
+    CHAT_CSS, EXPANDED_MESSAGES, HISTORY_MAX, append_message, collapsed_html, split_history,
+)
+
+DATA_DIR = ROOT / "data"
+RATINGS = {"pool": "batter", "sample_ok": True, "ratings": [("컨택", 79, "A"), ("파워", 18, "D"), ("스피드", 82, "A")]}
+
+
+def sample_answers(profiles, count):
+    answers = []
+    for i in range(count):
+        row = profiles.iloc[i % len(profiles)]
+        df = pd.DataFrame({"항목": row.index, "내용": row.values})
+        answers.append({"role": "user", "content": f"{row['name']} 알려줘"})
+        answers.append({"role": "bot", "content": f"📌 {row['name']} 선수의 기본 프로필입니다.",
+                        "profile": df, "ratings": RATINGS})
+    return answers
+
+
+def render_uncached(history):
+    # 기존 방식: 메시지마다 말풍선 + CSS + to_html
+    out = []
+    for chat in history:
+        out.append(f"<div class='bot-bubble'>⚾ {chat['content']}</div>")
+        if "profile" in chat:
+            out.append(CHAT_CSS)
+            out.append(chat["profile"].to_html(index=False, classes="styled-profile", border=0))
+    return out
+
+
+def render_cached(history):
+    older, recent = split_history(history)
+    out = [CHAT_CSS]
+    if older:
+        out.append(collapsed_html(older))
+    for chat in recent:
+        out.append(chat["bubble"])
+        if "extra" in chat:
+            out.append(chat["extra"])
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, nargs="+", default=[40, 80, 160])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    profiles = pd.read_csv(DATA_DIR / "player_profiles_1.csv", dtype=str)
+    print(f"cap={HISTORY_MAX} expanded={EXPANDED_MESSAGES}")
+    print(f"{'messages':>9}{'uncached':>12}{'cached':>12}{'html KB':>16}")
+    for n in args.messages:
+        raw = sample_answers(profiles, n // 2)
+        compact = []
+        for msg in raw:
+            append_message(compact, msg)
+        t_raw = timeit.timeit(lambda: render_uncached(raw), number=args.repeat) / args.repeat
+        t_cached = timeit.timeit(lambda: render_cached(compact), number=args.repeat) / args.repeat
+        kb_raw = sum(map(len, render_uncached(raw))) / 1024
+        kb_cached = sum(map(len, render_cached(compact))) / 1024
+        print(f"{n:>9}{t_raw * 1000:>10.2f}ms{t_cached * 1000:>10.3f}ms{kb_raw:>8.0f} -> {kb_cached:<5.0f}")
+
+
+if __name__ == "__main__":
+    main()
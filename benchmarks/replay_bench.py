@@ -0,0 +1,236 @@
+"""
+generate_answer 오프라인 재생 벤치마크 (API 키 / Chrome 없이)
+
+OpenAI client, 뉴스 검색(fetch_news), Selenium webdriver 를 지연 시간을 조절할 수 있는
+가짜 객체로 바꾼 뒤 data/replay_queries.csv 의 질문을 반복 재생한다.
+분기(branch)별 p50 / p95 / p99 지연 시간과 질문당 외부 호출 수를 출력.
+--spans 를 주면 단계(span)별 누적 시간도 함께 출력.
+
+    python benchmarks/replay_bench.py --rounds 5 --llm-delay 0.3 --news-delay 0.1 --page-delay 0.5
+    python benchmarks/replay_bench.py --warm       # 캐시를 비우지 않고 재생 (반복 질문 성능)
+"""
+import argparse
+import csv
+import logging
+import os
+import sys
+import threading
+import time
+import warnings
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import NoSuchElementException
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+os.environ.setdefault("OPENAI_API_KEY", "replay")     # 가짜 client 로 바꾸기 전 OpenAI() 생성용
+os.environ["KBO_LLM_CACHE_PATH"] = ""                 # 실제 응답 캐시 파일을 건드리지 않도록
+
+from tracing import span_metrics, start_trace  # noqa: E402
+
+CORPUS = ROOT / "data" / "replay_queries.csv"
+RECORD_FIXTURES = ROOT / "data" / "fixtures" / "naver_record"
+DEFAULT_FIXTURE = "69100"
+
+
+class CallCounter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = defaultdict(int)
+
+    def add(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counts)
+
+
+calls = CallCounter()
+
+
+# === 가짜 OpenAI client ===
+class _Obj:
+    def __init__(self, **kw):
+        self.__dict__.update(kw)
+
+
+class FakeCompletions:
+    def __init__(self, delay, ttft):
+        self.delay = delay
+        self.ttft = ttft
+
+    def create(self, model, messages, temperature=None, max_tokens=None, stream=False, **kw):
+        calls.add("openai")
+        words = ["가짜 ", "답변입니다. ", "기록이 ", "좋습니다."]
+        if stream:
+            return self._stream(words)
+        time.sleep(self.delay)
+        usage = _Obj(prompt_tokens=100, completion_tokens=len(words), total_tokens=100 + len(words))
+        return _Obj(choices=[_Obj(message=_Obj(content="".join(words)))], usage=usage)
+
+    def _stream(self, words):
+        time.sleep(self.ttft)
+        per_word = max(0.0, self.delay - self.ttft) / len(words)
+        for i, w in enumerate(words):
+            if i:
+                time.sleep(per_word)
+            yield _Obj(choices=[_Obj(delta=_Obj(content=w))])
+
+
+class FakeOpenAI:
+    def __init__(self, delay=0.3, ttft=0.1):
+        self.chat = _Obj(completions=FakeCompletions(delay, ttft))
+
+
+def fake_fetch_news(delay):
+    def fetch_news(query, display=3):
+        calls.add("news")
+        time.sleep(delay)
+        return [{"title": f"{query} 기사 {i}", "link": f"https://news.example/{i}"} for i in range(display)]
+    return fetch_news
+
+
+# === 가짜 webdriver (저장된 네이버 기록 페이지를 그대로 돌려줌) ===
+class FakeElement:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def click(self):
+        pass
+
+
+class FakeDriver:
+    def __init__(self, delay=0.5):
+        self.delay = delay
+        self.page_source = ""
+        self._soup = None
+        self.current_window_handle = "fake"
+
+    def get(self, url):
+        calls.add("page_load")
+        time.sleep(self.delay)
+        pid = url.rsplit("playerId=", 1)[-1]
+        path = RECORD_FIXTURES / f"{pid}.html"
+        if not path.exists():
+            path = RECORD_FIXTURES / f"{DEFAULT_FIXTURE}.html"
+        self.page_source = path.read_text(encoding="utf-8")
+        self._soup = BeautifulSoup(self.page_source, "html.parser")
+
+    def find_element(self, by, value):
+        if self._soup is None or self._soup.select_one(value) is None:
+            raise NoSuchElementException(value)
+        return FakeElement(self)
+
+    def find_elements(self, by, value):
+        return [FakeElement(self)] if self._soup is not None and self._soup.select_one(value) else []
+
+    def quit(self):
+        pass
+
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [(row["query"], row["branch"]) for row in csv.DictReader(f)]
+
+
+def install_fakes(args):
+    """챗봇 엔진을 import 하고 외부 의존성을 가짜로 교체"""
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.CRITICAL)
+    from browser_pool import BrowserPool, set_browser_pool
+    import record_snapshot
+    from record_store import set_record_store
+
+    set_record_store(None)      # 로컬 기록 저장소가 있어도 실시간 경로(가짜 webdriver)를 측정
+    set_browser_pool(BrowserPool(size=args.browsers, driver_factory=lambda: FakeDriver(args.page_delay)))
+    record_snapshot.set_record_backend("selenium")
+
+    import chatbot_engine as bot
+    bot.client = FakeOpenAI(args.llm_delay, args.llm_ttft)
+    bot.fetch_news = fake_fetch_news(args.news_delay)
+    return bot, record_snapshot
+
+
+def reset_caches(bot, record_snapshot):
+    bot.llm_cache.clear()
+    record_snapshot.get_snapshot_cache().invalidate()
+
+
+def run_query(bot, query, stream):
+    with start_trace("answer"):
+        result = bot.generate_answer(query, stream=stream)
+        content = result.get("content")
+        if not isinstance(content, str) and content is not None:
+            for _ in content:       # 스트리밍 답변은 끝까지 소비해야 전체 시간
+                pass
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default=str(CORPUS))
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--llm-delay", type=float, default=0.3, help="LLM 전체 응답 시간(초)")
+    parser.add_argument("--llm-ttft", type=float, default=0.1, help="스트리밍 첫 토큰 시간(초)")
+    parser.add_argument("--news-delay", type=float, default=0.1, help="뉴스 검색 응답 시간(초)")
+    parser.add_argument("--page-delay", type=float, default=0.5, help="기록 페이지 로드 시간(초)")
+    parser.add_argument("--browsers", type=int, default=2, help="가짜 브라우저 풀 크기")
+    parser.add_argument("--stream", action="store_true", help="LLM 답변을 스트리밍으로 받기")
+    parser.add_argument("--warm", action="store_true", help="질문 사이에 캐시를 비우지 않음")
+    parser.add_argument("--spans", action="store_true", help="단계(span)별 누적 시간 출력")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    bot, record_snapshot = install_fakes(args)
+
+    latencies = defaultdict(list)
+    branch_calls = defaultdict(lambda: defaultdict(int))
+    errors = []
+    for _ in range(args.rounds):
+        for query, branch in corpus:
+            if not args.warm:
+                reset_caches(bot, record_snapshot)
+            before = calls.snapshot()
+            start = time.perf_counter()
+            try:
+                run_query(bot, query, args.stream)
+            except Exception as e:
+                errors.append((query, f"{type(e).__name__}: {e}"))
+                continue
+            latencies[branch].append((time.perf_counter() - start) * 1000)
+            after = calls.snapshot()
+            for name, count in after.items():
+                branch_calls[branch][name] += count - before.get(name, 0)
+
+    mode = "warm" if args.warm else "cold"
+    print(f"{len(corpus)} queries x {args.rounds} rounds ({mode}, stream={args.stream}) "
+          f"llm={args.llm_delay}s news={args.news_delay}s page={args.page_delay}s")
+    header = f"{'branch':<14}{'n':>4}{'p50':>10}{'p95':>10}{'p99':>10}{'openai/q':>10}{'news/q':>8}{'page/q':>8}"
+    print(header)
+    print("-" * len(header))
+    for branch in sorted(latencies, key=lambda b: -np.median(latencies[b])):
+        samples = latencies[branch]
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        per_query = {k: v / len(samples) for k, v in branch_calls[branch].items()}
+        print(f"{branch:<14}{len(samples):>4}{p50:>8.1f}ms{p95:>8.1f}ms{p99:>8.1f}ms"
+              f"{per_query.get('openai', 0):>10.2f}{per_query.get('news', 0):>8.2f}{per_query.get('page_load', 0):>8.2f}")
+    all_samples = [ms for samples in latencies.values() for ms in samples]
+    if all_samples:
+        p50, p95, p99 = np.percentile(all_samples, [50, 95, 99])
+        print(f"{'all':<14}{len(all_samples):>4}{p50:>8.1f}ms{p95:>8.1f}ms{p99:>8.1f}ms")
+    print(f"external calls: {calls.snapshot()}")
+    if args.spans:
+        print(f"\n{'span':<24}{'count':>7}{'p50':>10}{'p95':>10}{'total':>10}")
+        for name, m in sorted(span_metrics.summary().items(), key=lambda x: -x[1]["total"]):
+            print(f"{name:<24}{m['count']:>7}{m['p50'] * 1000:>8.1f}ms{m['p95'] * 1000:>8.1f}ms{m['total']:>9.2f}s")
+    for query, err in errors:
+        print(f"error: {query!r} -> {err}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+시작 시간 벤치마크: CSV 파싱 vs 바이너리 스냅샷(Feather) 로드
+
+    python src/data_snapshot.py               # 스냅샷 먼저 생성
+    python benchmarks/startup_bench.py --repeat 20
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from data_snapshot import load_snapshot  # noqa: E402
+from data_store import SNAPSHOT_SOURCES, DataStore, read_csv_frames  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if load_snapshot(SNAPSHOT_SOURCES) is None:
+        sys.exit("스냅샷이 없거나 원본 CSV 보다 오래되었습니다. python src/data_snapshot.py 를 먼저 실행하세요.")
+
+    cases = {
+        "frames: csv": lambda: read_csv_frames(SNAPSHOT_SOURCES),
+        "frames: snapshot": lambda: load_snapshot(SNAPSHOT_SOURCES),
+        "DataStore: csv": lambda: DataStore(use_snapshot=False),
+        "DataStore: snapshot": lambda: DataStore(use_snapshot=True),
+    }
+    for label, fn in cases.items():
+        fn()    # 첫 import / 디스크 캐시 영향 제거
+        ms = timeit.timeit(fn, number=args.repeat) / args.repeat * 1000
+        print(f"{label:<22}{ms:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
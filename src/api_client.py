@@ -0,0 +1,105 @@
+"""
+챗봇 HTTP API 클라이언트 (KBO_API_URL 을 지정하면 Streamlit 화면이 이 클라이언트로 답변을 받음)
+
+api_server.py 의 NDJSON 스트림을 읽어
+- partial 이벤트는 on_partial(문구) 로 바로 전달하고
+- delta 이벤트(LLM 토큰)는 StreamingAnswer 로 감싸 화면이 로컬 답변과 똑같이 그리게 한다.
+"""
+import json
+import os
+
+import pandas as pd
+import requests
+
+from streaming import StreamingAnswer
+
+API_TIMEOUT = float(os.getenv("KBO_API_TIMEOUT", "60"))
+
+
+class ApiError(RuntimeError):
+    pass
+
+
+def answer_from_json(data):
+    """chatbot_engine.answer_to_json 의 역변환 (프로필 records -> DataFrame, 능력치 [이름, 점수, 등급] -> tuple)"""
+    answer = dict(data)
+    if isinstance(answer.get("profile"), list):
+        answer["profile"] = pd.DataFrame(answer["profile"])
+    if answer.get("ratings"):
+        answer["ratings"] = {**answer["ratings"], "ratings": [tuple(r) for r in answer["ratings"]["ratings"]]}
+    return answer
+
+
+class ApiClient:
+    def __init__(self, base_url, timeout=API_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _get(self, path):
+        res = self.session.get(self.base_url + path, timeout=self.timeout)
+        res.raise_for_status()
+        return res
+
+    def stats(self):
+        return self._get("/v1/stats").json()
+
+    def metrics_text(self):
+        return self._get("/metrics").text
+
+    def spans_jsonl(self):
+        return self._get("/metrics/spans.jsonl").text
+
+    def ask(self, question, on_partial=None):
+        """
+        질문 하나 -> generate_answer 와 같은 모양의 답변 dict
+        LLM 답변이면 content 가 StreamingAnswer 이고, 끝까지 읽으면 나머지 키와 "_trace" 가 채워진다.
+        """
+        res = self.session.post(
+            f"{self.base_url}/v1/answer", json={"question": question, "stream": True},
+            stream=True, timeout=self.timeout,
+        )
+        if res.status_code != 200:
+            try:
+                message = res.json().get("error")
+            except ValueError:
+                message = res.text
+            raise ApiError(f"{res.status_code}: {message}")
+        events = (json.loads(line) for line in res.iter_lines() if line)
+
+        for event in events:
+            if event["event"] == "partial":
+                if on_partial:
+                    on_partial(event["text"])
+            elif event["event"] == "delta":
+                answer = {"role": "bot"}
+                answer["content"] = StreamingAnswer(self._deltas(event["text"], events, answer))
+                return answer
+            else:
+                return self._final(event)
+        raise ApiError("응답이 중간에 끊겼습니다.")
+
+    def _deltas(self, first, events, answer):
+        # 토큰을 다 흘려보낸 뒤 마지막 answer 이벤트로 나머지 키를 채움 (content 는 화면 쪽에서 저장)
+        # 스트림 도중 끊기거나 서버가 error 이벤트를 보내면 받은 데까지의 답변 뒤에 오류 문구를 붙임
+        yield first
+        try:
+            for event in events:
+                if event["event"] == "delta":
+                    yield event["text"]
+                else:
+                    final = self._final(event)
+                    final.pop("content", None)
+                    answer.update(final)
+                    return
+            raise ApiError("응답이 중간에 끊겼습니다.")
+        except (ApiError, requests.RequestException, ValueError) as e:
+            yield f"\n\n❌ 답변을 받는 중 오류가 발생했습니다. ({e})"
+
+    @staticmethod
+    def _final(event):
+        if event["event"] == "error":
+            raise ApiError(event["error"])
+        final = answer_from_json(event["answer"])
+        final["_trace"] = event.get("trace")
+        return final
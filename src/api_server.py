@@ -0,0 +1,255 @@
+"""
+챗봇 HTTP API (ASGI / Starlette)
+
+    uvicorn api_server:app --app-dir src --host 0.0.0.0 --port 8000
+    python src/api_server.py --port 8000
+
+    curl -X POST localhost:8000/v1/answer -H 'Content-Type: application/json' \
+         -d '{"question": "LG 타율 top 5"}'
+
+- POST /v1/answer  {"question": ..., "stream": false}
+    stream=false : 답변 JSON 한 번에 (Server-Timing 헤더에 대기 / 단계별 시간)
+    stream=true  : NDJSON 이벤트 {"event": "partial" | "delta" | "answer", ...}
+- POST /v1/prefetch {"player_ids": [...], "teams": [...], "first_pitch": "18:30", "until": "22:30"}
+    오늘 경기 출전 선수 기록 / AI 요약 미리 가져오기 등록 (prefetch, 현황은 /v1/stats 의 "prefetch")
+- GET /v1/stats    응답 캐시 / 기록 캐시 / 페이지 준비 대기 분포 / 데이터 저장소 / 스트리밍 지연 / 미리 가져오기 현황
+- GET /healthz     상태 확인
+- GET /metrics     단계(span)별 시간 Prometheus text (+ 처리 중 / 대기 중 요청 수)
+
+generate_answer 는 동기 함수(Selenium / OpenAI 호출)라 작업 스레드 풀에서 실행한다.
+같은 프로세스의 요청은 데이터 저장소 / 응답 캐시 / 기록 스냅샷 / 뉴스 캐시 / 브라우저 풀을 공유하고,
+KBO_API_CONCURRENCY 개를 넘는 요청은 KBO_API_QUEUE_TIMEOUT 초까지 기다렸다가 503 으로 거절한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+import chatbot_engine as engine
+from prefetch import get_prefetch_scheduler
+from tracing import span_metrics, start_trace
+
+API_CONCURRENCY = int(os.getenv("KBO_API_CONCURRENCY", "8"))          # 동시에 답변을 만드는 요청 수
+API_QUEUE_TIMEOUT = float(os.getenv("KBO_API_QUEUE_TIMEOUT", "30"))    # 자리가 날 때까지 기다리는 최대 시간(초)
+MAX_QUESTION_LENGTH = 500
+
+executor = ThreadPoolExecutor(max_workers=API_CONCURRENCY, thread_name_prefix="kbo-answer")
+_slots = None
+_gauges = {"in_flight": 0, "waiting": 0, "rejected": 0}
+_gauges_lock = threading.Lock()
+
+
+def _gauge(name, delta):
+    with _gauges_lock:
+        _gauges[name] += delta
+
+
+def _get_slots():
+    # 이벤트 루프 안에서 처음 쓸 때 생성
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(API_CONCURRENCY)
+    return _slots
+
+
+def server_timing(queue_seconds, trace):
+    """Server-Timing 헤더 값 (대기 시간 + 최상위 단계별 합계 + 엔진 전체), 단위 ms"""
+    parts = [f"queue;dur={queue_seconds * 1000:.1f}"]
+    if trace:
+        roots = {s["id"] for s in trace["spans"] if s["parent"] is None}
+        totals = {}
+        for s in trace["spans"]:
+            if s["duration"] is not None and (s["parent"] is None or s["parent"] in roots):
+                totals[s["name"]] = totals.get(s["name"], 0.0) + s["duration"]
+        parts += [f"{name};dur={sec * 1000:.1f}" for name, sec in totals.items()]
+        parts.append(f"engine;dur={trace['duration'] * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def _answer(question, emit=None):
+    """
+    작업 스레드에서 실행. (답변 JSON, trace dict) 반환
+    emit 이 있으면 진행 상황 / LLM 토큰을 이벤트로 흘려보냄
+    """
+    on_partial = (lambda r: emit({"event": "partial", "text": engine.describe_partial(r)})) if emit else None
+    with start_trace("answer") as trace:
+        answer = engine.generate_answer(question, stream=emit is not None, on_partial=on_partial)
+        content = answer.get("content")
+        if emit and isinstance(content, engine.StreamingAnswer):
+            for chunk in content:
+                emit({"event": "delta", "text": chunk})
+        payload = engine.answer_to_json(answer)
+    return payload, trace.to_dict()
+
+
+async def _acquire():
+    """작업 자리 확보 (대기 시간 반환) / 시간 초과면 None"""
+    start = time.perf_counter()
+    _gauge("waiting", 1)
+    try:
+        await asyncio.wait_for(_get_slots().acquire(), API_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        _gauge("rejected", 1)
+        return None
+    finally:
+        _gauge("waiting", -1)
+    _gauge("in_flight", 1)
+    return time.perf_counter() - start
+
+
+def _release():
+    _gauge("in_flight", -1)
+    _get_slots().release()
+
+
+def _error(status, message, **headers):
+    return JSONResponse({"error": message}, status_code=status, headers=headers or None)
+
+
+async def answer_endpoint(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        return _error(400, "JSON 본문이 필요합니다.")
+    question = body.get("question") if isinstance(body, dict) else None
+    if not isinstance(question, str) or not question.strip():
+        return _error(400, "question 이 비어 있습니다.")
+    if len(question) > MAX_QUESTION_LENGTH:
+        return _error(400, f"question 은 {MAX_QUESTION_LENGTH}자 이하여야 합니다.")
+
+    started = time.perf_counter()
+    queued = await _acquire()
+    if queued is None:
+        return _error(503, "요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해 주세요.", **{"Retry-After": "1"})
+
+    loop = asyncio.get_running_loop()
+    if body.get("stream"):
+        return StreamingResponse(
+            _stream(_start_stream(loop, question.strip(), queued)),
+            media_type="application/x-ndjson",
+            headers={"Server-Timing": server_timing(queued, None)},
+        )
+
+    try:
+        payload, trace = await loop.run_in_executor(executor, _answer, question.strip())
+    except Exception as e:
+        return _error(500, f"{type(e).__name__}: {e}")
+    finally:
+        _release()
+    total = time.perf_counter() - started
+    return JSONResponse(payload, headers={
+        "Server-Timing": server_timing(queued, trace) + f", total;dur={total * 1000:.1f}",
+    })
+
+
+def _start_stream(loop, question, queued):
+    """
+    작업 스레드에서 답변을 만들기 시작하고 이벤트 asyncio.Queue 반환 (마지막은 answer 이벤트, 끝은 None)
+    작업 자리는 클라이언트가 중간에 끊어도 스레드 작업이 끝나는 시점에 반납
+    """
+    events = asyncio.Queue()
+
+    def emit(event):
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    def run():
+        try:
+            payload, trace = _answer(question, emit)
+            emit({"event": "answer", "answer": payload, "trace": trace,
+                  "timing": server_timing(queued, trace)})
+        except Exception as e:
+            emit({"event": "error", "error": f"{type(e).__name__}: {e}"})
+        finally:
+            emit(None)
+
+    loop.run_in_executor(executor, run).add_done_callback(lambda _: _release())
+    return events
+
+
+async def _stream(events):
+    while True:
+        event = await events.get()
+        if event is None:
+            break
+        yield json.dumps(event, ensure_ascii=False) + "\n"
+
+
+async def prefetch_endpoint(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        return _error(400, "JSON 본문이 필요합니다.")
+    if not isinstance(body, dict):
+        return _error(400, "JSON 객체가 필요합니다.")
+    player_ids, teams = body.get("player_ids") or [], body.get("teams") or []
+    if not isinstance(player_ids, list) or not isinstance(teams, list) or not (player_ids or teams):
+        return _error(400, "player_ids 또는 teams 목록이 필요합니다.")
+    unknown = [t for t in teams if t not in engine.store.player_index.teams()]
+    if unknown:
+        return _error(400, f"알 수 없는 팀입니다: {', '.join(map(str, unknown))}")
+    scheduler = get_prefetch_scheduler()
+    try:
+        count = scheduler.schedule(player_ids, teams, first_pitch=body.get("first_pitch"), until=body.get("until"))
+    except ValueError:
+        return _error(400, "first_pitch / until 은 HH:MM 또는 epoch 초여야 합니다.")
+    return JSONResponse({"scheduled": count, "prefetch": scheduler.summary()})
+
+
+async def stats_endpoint(request):
+    return JSONResponse(engine.engine_stats())
+
+
+async def health_endpoint(request):
+    return JSONResponse({"status": "ok", "data_version": engine.store.version})
+
+
+async def metrics_endpoint(request):
+    with _gauges_lock:
+        gauges = dict(_gauges)
+    lines = [
+        "# HELP kbo_api_in_flight Answer requests currently running.",
+        "# TYPE kbo_api_in_flight gauge",
+        f"kbo_api_in_flight {gauges['in_flight']}",
+        "# HELP kbo_api_waiting Answer requests waiting for a worker slot.",
+        "# TYPE kbo_api_waiting gauge",
+        f"kbo_api_waiting {gauges['waiting']}",
+        "# HELP kbo_api_rejected_total Answer requests rejected after the queue timeout.",
+        "# TYPE kbo_api_rejected_total counter",
+        f"kbo_api_rejected_total {gauges['rejected']}",
+    ]
+    return PlainTextResponse(span_metrics.to_prometheus() + "\n".join(lines) + "\n")
+
+
+async def spans_endpoint(request):
+    return PlainTextResponse(span_metrics.to_jsonl(), media_type="application/json")
+
+
+app = Starlette(routes=[
+    Route("/v1/answer", answer_endpoint, methods=["POST"]),
+    Route("/v1/prefetch", prefetch_endpoint, methods=["POST"]),
+    Route("/v1/stats", stats_endpoint),
+    Route("/healthz", health_endpoint),
+    Route("/metrics", metrics_endpoint),
+    Route("/metrics/spans.jsonl", spans_endpoint),
+])
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+선수 기록 크롤링용 headless Chrome 세션 풀
+
+질문마다 webdriver.Chrome 을 새로 띄우지 않고, 미리 띄워 둔 브라우저를
+빌려 쓰고(checkout) 돌려주는(checkin) 방식으로 재사용한다.
+- 풀 크기 / 세션당 최대 페이지 수 / 대기 시간은 환경변수로 설정
+- 반납 시 상태 점검, N 페이지 이상 사용했거나 오류가 난 세션은 폐기 후 재생성
+"""
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+
+from tracing import span
+
+# === 설정 ===
+POOL_SIZE = int(os.getenv("KBO_BROWSER_POOL_SIZE", "2"))
+MAX_PAGES_PER_SESSION = int(os.getenv("KBO_BROWSER_MAX_PAGES", "50"))
+CHECKOUT_TIMEOUT = float(os.getenv("KBO_BROWSER_CHECKOUT_TIMEOUT", "30"))
+PAGE_LOAD_TIMEOUT = float(os.getenv("KBO_BROWSER_PAGE_LOAD_TIMEOUT", "20"))
+
+
+@lru_cache(maxsize=1)
+def _driver_path():
+    # ChromeDriverManager().install() 는 프로세스당 한 번만 호출
+    return ChromeDriverManager().install()
+
+
+def _chrome_options():
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    return options
+
+
+class BrowserSession:
+    """풀에서 관리하는 브라우저 한 개 (driver + 사용 횟수)"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+
+    def is_healthy(self) -> bool:
+        try:
+            # 창 핸들 조회가 실패하면 브라우저가 죽은 것으로 판단
+            self.driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class BrowserPool:
+    """
+    크기가 제한된 headless Chrome 풀
+    - checkout(): 쉬고 있는 세션을 빌려줌 (없으면 최대 size 개까지 새로 생성, 초과 시 대기)
+    - checkin(session, broken): 반납. 고장났거나 max_pages 를 넘긴 세션은 폐기
+    """
+
+    def __init__(self, size=POOL_SIZE, max_pages=MAX_PAGES_PER_SESSION,
+                 checkout_timeout=CHECKOUT_TIMEOUT, driver_factory=None):
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self.checkout_timeout = checkout_timeout
+        self._driver_factory = driver_factory or self._new_driver
+        self._idle = []
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self.stats = {"created": 0, "reused": 0, "recycled": 0, "broken": 0}
+
+    def _new_driver(self):
+        driver = webdriver.Chrome(service=Service(_driver_path()), options=_chrome_options())
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        return driver
+
+    def _total(self):
+        return len(self._idle) + self._in_use
+
+    def checkout(self, timeout=None) -> BrowserSession:
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("브라우저 풀이 이미 종료되었습니다.")
+                while self._idle:
+                    session = self._idle.pop()
+                    if session.is_healthy():
+                        self._in_use += 1
+                        self.stats["reused"] += 1
+                        return session
+                    self.stats["broken"] += 1
+                    session.quit()
+                if self._total() < self.size:
+                    self._in_use += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("사용 가능한 브라우저가 없습니다. 잠시 후 다시 시도해주세요.")
+                self._cond.wait(remaining)
+
+        # 브라우저 생성은 락 밖에서 (수 초 걸릴 수 있음)
+        try:
+            with span("browser.start"):
+                session = BrowserSession(self._driver_factory())
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.stats["created"] += 1
+        return session
+
+    def checkin(self, session: BrowserSession, broken=False):
+        session.pages += 1
+        discard = broken or session.pages >= self.max_pages or not session.is_healthy()
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                self.stats["broken" if broken else "recycled"] += 1
+            elif not self._closed:
+                self._idle.append(session)
+            self._cond.notify()
+        if discard or self._closed:
+            session.quit()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """with pool.driver() as driver: ... 형태로 사용. 예외 발생 시 세션은 폐기"""
+        with span("browser.checkout"):
+            session = self.checkout(timeout)
+        broken = False
+        try:
+            yield session.driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.checkin(session, broken=broken)
+
+    def warm_up(self, count=None):
+        """첫 질문 전에 브라우저를 미리 띄워 둠"""
+        count = self.size if count is None else min(count, self.size)
+        sessions = [self.checkout() for _ in range(count)]
+        for s in sessions:
+            with self._cond:
+                self._in_use -= 1
+                self._idle.append(s)
+                self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for s in idle:
+            s.quit()
+
+
+# === 프로세스 전역 풀 ===
+# Streamlit 은 메인 스크립트만 다시 실행하므로, import 된 이 모듈의 풀은 rerun 사이에 유지된다.
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.close)
+        return _pool
+
+
+def set_browser_pool(pool):
+    """프로세스 전역 풀 교체 (벤치마크에서 가짜 driver 풀을 쓸 때 등). 이전 풀은 닫음"""
+    global _pool
+    with _pool_lock:
+        old, _pool = _pool, pool
+    if old is not None and old is not pool:
+        old.close()
@@ -0,0 +1,156 @@
+"""
+선수 기록 일괄 수집 (야간 배치)
+
+player_profiles_1.csv 의 모든 playerId 에 대해 기록 페이지를 받아 로컬 저장소(record_store)에
+경기별 기록 / 통산기록을 저장한다. 질문에 답할 때는 이 저장소를 먼저 읽는다.
+- 동시 수집 수 제한 (--workers) + 요청 간 지연 (--delay)
+- 선수 한 명이 끝날 때마다 저장 + 실행 진행 상황 기록 -> 중단돼도 다시 실행하면 남은 선수만 수집
+  (이전 실행에서 실패한 선수는 실패 수를 이어받고 다시 시도하지 않음, 다음 실행 / --restart 에서 재시도)
+- 진행 중 / 종료 시 처리량(players/min)과 새로 추가된 경기 / 정정된 경기 수 출력
+
+    python src/bulk_crawl.py --workers 4
+    python src/bulk_crawl.py --restart               # 끝나지 않은 실행을 버리고 처음부터
+    0 3 * * * cd /path/to/repo && python src/bulk_crawl.py >> crawl.log 2>&1
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+import record_snapshot
+from record_store import RECORD_DB, RecordStore
+
+PROFILES_CSV = Path(__file__).resolve().parent.parent / "data" / "player_profiles_1.csv"
+
+
+def load_player_ids(path=PROFILES_CSV):
+    ids = pd.read_csv(path, dtype=str)["playerId"].dropna().str.strip()
+    return list(dict.fromkeys(i for i in ids if i))
+
+
+class Progress:
+    """완료 / 실패 수와 처리량 (스레드 안전)"""
+
+    def __init__(self, total, done=0, failed=0):
+        self.total = total
+        self.done = done
+        self.failed = failed
+        self.crawled = 0        # 이번 실행에서 처리한 선수 수 (처리량 계산용)
+        self.new_games = 0
+        self.corrected = 0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, synced):
+        """synced: save_snapshot 결과 ({"new", "corrected"}) / 실패면 None"""
+        with self._lock:
+            self.crawled += 1
+            if synced is not None:
+                self.done += 1
+                self.new_games += synced["new"]
+                self.corrected += synced["corrected"]
+            else:
+                self.failed += 1
+            return self.done, self.failed
+
+    def per_minute(self):
+        elapsed = time.perf_counter() - self.started
+        return self.crawled / elapsed * 60 if elapsed > 0 else 0.0
+
+    def line(self):
+        rate = self.per_minute()
+        remaining = self.total - self.done - self.failed
+        text = (f"{self.done + self.failed}/{self.total} (실패 {self.failed}) {rate:.1f} players/min, "
+                f"새 경기 {self.new_games} / 정정 {self.corrected}")
+        if remaining and rate:
+            text += f", 남은 시간 약 {remaining / rate:.0f}분"
+        return text
+
+
+def crawl_one(store, player_id, retries=1, delay=0.0, run_id=None):
+    """선수 한 명 수집 후 저장. 저장 결과({"new", "corrected"}) 반환, 실패면 None"""
+    error = None
+    for attempt in range(retries + 1):
+        if delay:
+            time.sleep(delay)
+        try:
+            return store.save_snapshot(record_snapshot.fetch_snapshot(player_id))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    store.mark_failed(player_id, error, run_id=run_id)
+    return None
+
+
+def run(store, player_ids, workers=4, delay=0.2, retries=1, restart=False, report_every=25, log=print):
+    """
+    일괄 수집. 끝나지 않은 이전 실행이 있으면 그 실행 이후 저장된 선수 / 그 실행에서 실패한 선수는 건너뜀
+    반환: Progress
+    """
+    previous = None if restart else store.unfinished_run()
+    if previous:
+        run_id = previous["run_id"]
+        done_ids = store.fetched_since(previous["started_at"])
+        failed_ids = store.run_failures(run_id) - done_ids
+        log(f"이전 실행 #{run_id} 이어서 수집: 완료 {len(done_ids)}명 / 실패 {len(failed_ids)}명 건너뜀")
+    else:
+        done_ids, failed_ids = set(), set()
+        run_id = store.start_run(len(player_ids))
+    skip = done_ids | failed_ids
+    todo = [pid for pid in player_ids if pid not in skip]
+    progress = Progress(len(player_ids), done=len(done_ids), failed=len(failed_ids))
+    log(f"수집 시작 #{run_id}: {len(todo)}명, workers={workers}, delay={delay}s")
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kbo-crawl")
+    try:
+        futures = [executor.submit(crawl_one, store, pid, retries, delay, run_id) for pid in todo]
+        for future in as_completed(futures):
+            done, failed = progress.add(future.result())
+            store.update_run(run_id, done, failed)
+            if progress.crawled % report_every == 0:
+                log(progress.line())
+    except KeyboardInterrupt:
+        executor.shutdown(wait=True, cancel_futures=True)
+        log(f"중단됨: {progress.line()} (다시 실행하면 남은 선수부터 수집)")
+        raise
+    executor.shutdown(wait=True)
+    store.update_run(run_id, progress.done, progress.failed, finished=True)
+    log(f"완료: {progress.line()}")
+    return progress
+
+
+def main():
+    parser = argparse.ArgumentParser(description="선수 기록 일괄 수집")
+    parser.add_argument("--db", default=str(RECORD_DB))
+    parser.add_argument("--profiles", default=str(PROFILES_CSV))
+    parser.add_argument("--workers", type=int, default=4, help="동시에 수집할 선수 수")
+    parser.add_argument("--delay", type=float, default=0.2, help="요청 전 지연(초, 작업자별)")
+    parser.add_argument("--retries", type=int, default=1)
+    parser.add_argument("--backend", choices=record_snapshot.RECORD_BACKENDS, default=None,
+                        help="페이지 로드 백엔드 (기본: KBO_RECORD_BACKEND)")
+    parser.add_argument("--limit", type=int, default=None, help="앞에서부터 N명만 (시험용)")
+    parser.add_argument("--restart", action="store_true", help="끝나지 않은 실행을 이어 하지 않고 새로 시작")
+    parser.add_argument("--report-every", type=int, default=25)
+    args = parser.parse_args()
+
+    if args.backend:
+        record_snapshot.set_record_backend(args.backend)
+    if record_snapshot.RECORD_BACKEND != "http":
+        # Selenium 을 쓸 수 있으면 동시 수집 수만큼 브라우저를 띄움
+        from browser_pool import BrowserPool, set_browser_pool
+        set_browser_pool(BrowserPool(size=args.workers))
+
+    player_ids = load_player_ids(args.profiles)[:args.limit]
+    store = RecordStore(args.db)
+    try:
+        run(store, player_ids, workers=args.workers, delay=args.delay, retries=args.retries,
+            restart=args.restart, report_every=args.report_every)
+    except KeyboardInterrupt:
+        pass
+    print(f"저장소: {args.db} {store.summary()['players']}")
+
+
+if __name__ == "__main__":
+    main()
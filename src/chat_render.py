@@ -0,0 +1,146 @@
+"""
+채팅 기록 렌더 캐시 (Streamlit 화면용)
+
+st.rerun() 마다 대화 전체를 다시 그리므로, 답변을 기록에 넣을 때 한 번만 HTML 조각으로 바꿔 둔다.
+- 기록에는 DataFrame 대신 렌더된 문자열만 저장 (프로필 표 / 능력치 카드 / 기록 표 iframe 높이)
+- 표 / 카드 CSS 는 메시지마다 넣지 않고 CHAT_CSS 로 페이지당 한 번
+- 기록은 KBO_CHAT_HISTORY_MAX 개까지만 유지하고, 최근 KBO_CHAT_EXPANDED 개를 제외한 이전 대화는 말풍선만 모아 접어서 표시
+"""
+import os
+
+import pandas as pd
+
+HISTORY_MAX = int(os.getenv("KBO_CHAT_HISTORY_MAX", "60"))       # 보관할 최대 메시지 수 (질문 + 답변)
+EXPANDED_MESSAGES = int(os.getenv("KBO_CHAT_EXPANDED", "10"))    # 표까지 펼쳐서 그릴 최근 메시지 수
+
+CHAT_CSS = """
+<style>
+.stApp { background-color:#000000; }
+.block-container { background: rgba(0,0,0,0.85); border-radius: 18px; padding: 20px; }
+
+/* 채팅 말풍선 */
+.user-bubble {
+  background-color: #d1f0ff; color: #000;
+  padding: 10px 15px; border-radius: 15px 15px 0 15px;
+  margin: 5px; text-align: right; float: right; clear: both;
+  max-width: 80%;
+}
+.bot-bubble {
+  background-color: #fffacd; color: #000;
+  padding: 10px 15px; border-radius: 15px 15px 15px 0;
+  margin: 5px; text-align: left; float: left; clear: both;
+  max-width: 80%;
+}
+.collapsed-turns .user-bubble, .collapsed-turns .bot-bubble { font-size: 13px; opacity: 0.85; }
+
+/* 프로필 표 */
+.styled-profile {
+    border-collapse: collapse;
+    width: 100%;
+    background-color: rgba(20,20,20,0.9);
+    color: white;
+    font-weight: 400;
+    border-radius: 10px;
+}
+.styled-profile th {
+    background-color: #222;
+    color: #4682B4;
+    font-weight: 600;
+    text-align: center;
+    padding: 8px;
+    border-bottom: 2px solid #555;
+}
+.styled-profile td {
+    text-align: center;
+    padding: 6px;
+    border-bottom: 1px solid #444;
+}
+.styled-profile tr:hover {
+    background-color: #333;
+}
+
+/* 능력치 카드 */
+.ratings-card { background: rgba(20,20,20,0.9); color: white; border-radius: 10px; padding: 10px 14px; margin: 6px 0; }
+.ratings-card .row { display: flex; align-items: center; gap: 8px; margin: 4px 0; font-size: 14px; }
+.ratings-card .label { width: 72px; color: #4682B4; font-weight: 600; }
+.ratings-card .bar { flex: 1; height: 10px; background: #333; border-radius: 5px; overflow: hidden; }
+.ratings-card .fill { height: 100%; background: linear-gradient(90deg, #4682B4, #7fd1ff); }
+.ratings-card .score { width: 56px; text-align: right; }
+.ratings-card .note { color: #aaa; font-size: 12px; margin-top: 6px; }
+</style>
+"""
+
+
+def render_ratings_card(ratings):
+    """능력치 카드 (0~100 막대 + 등급, 스타일은 CHAT_CSS)"""
+    rows = ""
+    for label, score, grade in ratings["ratings"]:
+        rows += (
+            f"<div class='row'><span class='label'>{label}</span>"
+            f"<div class='bar'><div class='fill' style='width:{score}%'></div></div>"
+            f"<span class='score'>{score} {grade}</span></div>"
+        )
+    pool = "타자" if ratings["pool"] == "batter" else "투수"
+    note = f"2025 {pool} 중 백분위"
+    if not ratings["sample_ok"]:
+        note += " · 출전 기록이 적어 50 쪽으로 보정"
+    return f"<div class='ratings-card'>{rows}<div class='note'>{note}</div></div>"
+
+
+def bubble(role, content):
+    if role == "user":
+        return f"<div class='user-bubble'>🧢 {content}</div>"
+    return f"<div class='bot-bubble'>⚾ {content}</div>"
+
+
+def table_height(html_code):
+    # 표의 행 개수로 높이 계산 (기본 상하 여백 포함)
+    dynamic_height = (html_code.count("<tr>") * 38) + 60
+    return max(150, min(dynamic_height, 700))
+
+
+def compact_message(msg):
+    """
+    답변 dict -> 기록용 dict (문자열만)
+    {"role", "content", "bubble", "extra": 말풍선 아래 HTML, "table": 기록 표 HTML, "table_height"}
+    """
+    out = {"role": msg["role"], "content": msg["content"], "bubble": bubble(msg["role"], msg["content"])}
+    extra = ""
+    if isinstance(msg.get("profile"), pd.DataFrame):
+        extra += msg["profile"].to_html(index=False, classes="styled-profile", border=0)
+    if msg.get("ratings"):
+        extra += render_ratings_card(msg["ratings"])
+    if isinstance(msg.get("stats"), pd.DataFrame):
+        extra += msg["stats"].to_html(index=False, classes="styled-profile", border=0)
+    if extra:
+        out["extra"] = extra
+    if msg.get("html"):
+        out["table"] = msg["html"]
+        out["table_height"] = table_height(msg["html"])
+    return out
+
+
+def append_message(history, msg, max_messages=HISTORY_MAX):
+    """기록 끝에 추가하고 max_messages 를 넘는 오래된 메시지 제거 (이미 compact 된 dict 는 그대로)"""
+    history.append(msg if "bubble" in msg else compact_message(msg))
+    overflow = len(history) - max_messages
+    if overflow > 0:
+        del history[:overflow]
+    return history
+
+
+def split_history(history, expanded=EXPANDED_MESSAGES):
+    """(접어서 보여줄 이전 메시지, 펼쳐서 그릴 최근 메시지)"""
+    if len(history) <= expanded:
+        return [], history
+    return history[:-expanded], history[-expanded:]
+
+
+def collapsed_html(messages):
+    """이전 대화: 말풍선만 하나의 HTML 로 (표는 생략 표시)"""
+    parts = []
+    for msg in messages:
+        parts.append(msg["bubble"])
+        if "table" in msg or "extra" in msg:
+            parts.append("<div class='bot-bubble'>📋 (표 생략)</div>")
+    return "<div class='collapsed-turns'>" + "".join(parts) + "<div style='clear:both'></div></div>"
@@ -0,0 +1,901 @@
+"""
+챗봇 엔진 (질문 -> 답변)
+
+Streamlit 화면과 분리된 답변 로직. 데이터 저장소 / OpenAI client / 응답 캐시 / 뉴스 클라이언트는
+모듈 import 시 한 번만 만들어 프로세스 안의 모든 호출(Streamlit 세션, HTTP API 요청)이 공유한다.
+- chatbot_ui_chat.py : Streamlit 화면 (이 모듈을 직접 호출하거나 KBO_API_URL 로 API 서버 호출)
+- api_server.py      : HTTP JSON API (ASGI)
+"""
+import pandas as pd
+from openai import OpenAI
+from dotenv import load_dotenv
+import os
+import re
+from record_snapshot import get_record_snapshot, get_snapshot_cache, wait_timings
+from prefetch import prefetch_stats
+from llm_cache import cached_completion, get_llm_cache, stream_completion
+from streaming import StreamingAnswer, stream_metrics, with_prefix
+from fanout import run_sources
+from news_client import get_news_client
+from intent_model import INTENT_KEYWORDS, get_intent_model
+from data_store import get_data_store
+from profile_schema import profile_display_items
+from leaderboard import STATS_BY_KEY, parse_query as parse_leaderboard_query, qualification_note
+from tracing import span, traced
+
+load_dotenv()
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+llm_cache = get_llm_cache()
+intent_model = get_intent_model()
+
+# 로컬 의도 분류 확신도가 이 값보다 낮으면 (KBO_INTENT_LLM_FALLBACK=1 일 때만) LLM 분류 사용
+INTENT_MIN_CONFIDENCE = float(os.getenv("KBO_INTENT_MIN_CONFIDENCE", "0.6"))
+INTENT_LLM_FALLBACK = os.getenv("KBO_INTENT_LLM_FALLBACK", "0") == "1"
+
+def ask_llm(prompt, temperature=0.8, max_tokens=200, cache_inputs=None, model="gpt-4o-mini", stream=False):
+    """
+    OpenAI 호출 공통 함수 (응답 캐시 경유)
+    cache_inputs: 캐시 키로 쓸 정규화 대상 입력 (없으면 프롬프트 전체)
+    stream: True 면 문자열 대신 토큰 단위로 흘려보내는 StreamingAnswer 반환
+    """
+    if stream:
+        return StreamingAnswer(stream_completion(
+            client, llm_cache, prompt, model=model,
+            temperature=temperature, max_tokens=max_tokens, cache_inputs=cache_inputs
+        ))
+    return cached_completion(
+        client, llm_cache, prompt, model=model,
+        temperature=temperature, max_tokens=max_tokens, cache_inputs=cache_inputs
+    )
+
+# === 데이터 ===
+# CSV(프로필 / 2025 성적 / 구단 인스타 / 최근 경기)는 프로세스당 한 번만 읽고
+# Streamlit rerun / 세션 / API 요청 사이에 공유. 이름 매칭 오토마톤과 해시 인덱스도 함께 보관
+store = get_data_store()
+
+# === 유틸 ===
+BAD_TOKENS = {"", "-", "None", "none", "nan", "NaN", None}
+def clean_str(x): return "" if x in BAD_TOKENS or str(x).strip() in BAD_TOKENS else str(x).strip()
+def to_int_safe(x): 
+    try: return int(float(str(x).replace(",","")))
+    except: return None
+def to_float_safe(x): 
+    try: return float(str(x).replace(",",""))
+    except: return None
+
+def detect_role(row: dict) -> str:
+    # 타자 지표 먼저 확인
+    if to_float_safe(row.get("AVG")) is not None or to_int_safe(row.get("HR")) is not None:
+        return "타자"
+    # 투수 지표 확인
+    if to_float_safe(row.get("ERA")) is not None or to_float_safe(row.get("WHIP")) is not None:
+        return "투수"
+    return "선수"
+
+STYLED_TABLE_CSS = """
+    <style>
+    .styled-table {
+        color: white;
+        border-collapse: collapse;
+        font-size: 14px;
+        width: auto;
+        table-layout: auto;
+        white-space: nowrap;
+    }
+    .styled-table th {
+        background-color: #222;
+        color: #4682B4;
+        padding: 8px 10px;
+        text-align: center;
+    }
+    .styled-table td {
+        padding: 6px 10px;
+        text-align: center;
+        border-bottom: 1px solid #444;
+    }
+    .styled-table tr:hover {
+        background-color: #333;
+    }
+    </style>
+"""
+
+def render_styled_table(df):
+    html_table = df.to_html(index=False, classes="styled-table", border=0)
+    return f"{STYLED_TABLE_CSS}    <div>{html_table}</div>\n    "
+
+def get_player_realtime_stats(player_id):
+    """
+    네이버 선수 페이지에서 경기별 기록 (_gameLogArea) 조회 (최근 15경기)
+    페이지는 record_snapshot 에서 playerId 단위로 한 번만 로드/캐시됨
+    """
+    df = get_record_snapshot(player_id).game_log
+    if df is None or df.empty:
+        return None, "❌ 최근 경기 기록이 없습니다."
+
+    return render_styled_table(df), None
+
+def get_player_career_stats(player_id, snap=None):
+    """
+    네이버 KBO 선수 페이지에서 통산기록(_careerStatsArea) 조회
+    시즌(연도) 컬럼 포함 + 2025 시즌만 필터링
+    snap: 이미 읽어 둔 기록 스냅샷 (없으면 캐시에서 조회)
+    """
+    df = (snap or get_record_snapshot(player_id)).career
+    if df is None or df.empty:
+        return None, "❌ 통산기록 데이터가 없습니다."
+
+    # 2025 시즌만 필터링
+    df_2025 = df[df["시즌"].astype(str).str.contains("2025", case=False, na=False)]
+
+    if df_2025.empty:
+        return None, "❌ 2025 시즌 통산기록을 찾을 수 없습니다."
+
+    return render_styled_table(df_2025), df_2025
+
+def generate_ai_evaluation(player_name, stats_text, stream=False):
+    """
+    선수 이름과 주요 성적을 바탕으로 AI가 자연스럽고 풍부한 평가 문장 생성
+    """
+    prompt = f"""
+    당신은 한국 프로야구 해설위원입니다.
+    아래는 {player_name} 선수의 주요 성적 요약입니다.
+    이를 바탕으로 2~3문장 정도의 자연스러운 해설 문장을 작성해주세요.
+
+    - 첫 문장은 객관적인 시즌 평가
+    - 두 번째 문장은 장점 또는 주목할 점
+    - 세 번째 문장은 보완점 또는 향후 기대
+    - '~입니다.', '~로 평가됩니다.' 등의 자연스러운 말투
+
+    [성적 요약]
+    {stats_text}
+    """
+
+    return ask_llm(
+        prompt, temperature=0.8, max_tokens=200,
+        cache_inputs={"kind": "evaluation", "player": player_name, "stats_text": stats_text},
+        stream=stream
+    )
+
+def season_stats_text(df_2025):
+    """AI 성적 요약에 넣을 2025 시즌 주요 지표 문자열"""
+    row = df_2025.iloc[0]
+    cols = ["타율", "홈런", "타점", "OPS", "ERA", "삼진", "WHIP"]
+    return ", ".join([f"{c}: {row[c]}" for c in cols if c in df_2025.columns and str(row[c]).strip()])
+
+def warm_player(player_id, refresh=False, summary=True):
+    """
+    미리 가져오기 (prefetch 스케줄러에서 호출)
+    기록 스냅샷을 캐시에 넣고, summary=True 면 AI 성적 요약도 만들어 응답 캐시에 저장
+    - 선수 카드(build_player_card)가 쓰는 CSV 성적 요약
+    - 시즌 성적 질문이 쓰는 2025 통산기록 요약
+    반환: AI 요약을 하나라도 만들었으면 True
+    """
+    snap = get_snapshot_cache().warm(player_id, refresh=refresh)
+    if not summary:
+        return False
+    p = store.player_index.profile(player_id)
+    if p is None:
+        return False
+    name = p.get("name")
+    warmed = False
+    card_text = csv_stats_text(store.player_index.stats_row(p.get("playerId")))
+    if card_text:
+        generate_ai_evaluation(name, card_text)
+        warmed = True
+    _, df_2025 = get_player_career_stats(player_id, snap=snap)
+    if df_2025 is not None and not isinstance(df_2025, str):
+        generate_ai_evaluation(name, season_stats_text(df_2025))
+        warmed = True
+    return warmed
+
+def fetch_news(query, display=3):
+    """
+    네이버 뉴스 검색 (커넥션 재사용 / 재시도 / 검색어별 캐시 / 속도 제한은 news_client 에서 처리)
+    """
+    return get_news_client().search(query, display=display)
+
+def detect_intent_with_ai(user_input):
+    """
+    OpenAI를 이용해 사용자의 질문 의도를 자동 분류 (성적, 뉴스, 프로필, 기타 등)
+    """
+    prompt = f"""
+    사용자가 아래와 같이 질문했습니다:
+    "{user_input}"
+
+    질문의 의도를 아래 중 하나로 정확히 분류하세요:
+    - 'news' : 최근 소식, 근황, 인터뷰, 기사, 요즘 어때 등
+    - 'profile' : 선수에 대한 기본 정보, 소개, 누구야, 알려줘 등
+    - 'stats' : 성적, 기록, 타율, 홈런, 방어율, 삼진 등
+    - 'position' : 포지션, 투수, 타자, 외야수, 내야수, 역할 등
+    - 'unknown' : 위 4개 중 어디에도 속하지 않으면 unknown
+
+    오직 하나의 단어(news/profile/stats/position/unknown)만 출력하세요.
+    """
+
+    intent = ask_llm(
+        prompt, temperature=0, max_tokens=5,
+        cache_inputs={"kind": "intent", "user_input": user_input}
+    )
+    return intent.lower()
+
+def classify_intent(user_input):
+    """
+    로컬 n-gram 모델로 의도 분류 (네트워크 호출 없음)
+    확신도가 낮으면 LLM 보조가 켜져 있을 때만 detect_intent_with_ai, 아니면 unknown (기본 분기)
+    """
+    with span("intent.classify") as attrs:
+        intent, confidence = intent_model.predict(user_input)
+        attrs.update(intent=intent, confidence=round(confidence, 3))
+    if confidence < INTENT_MIN_CONFIDENCE:
+        return detect_intent_with_ai(user_input) if INTENT_LLM_FALLBACK else "unknown"
+    return intent
+
+# === 선수 카드 (뉴스 + 인스타 + 시즌 기록 + AI 요약 동시 조회) ===
+PLAYER_CARD_KEYWORDS = ["선수 카드", "카드", "한눈에", "종합 정보"]
+
+# 2025 성적 CSV 컬럼 -> 요약문 표기
+CSV_STAT_LABELS = {
+    "AVG": "타율", "HR": "홈런", "RBI": "타점", "OBP": "출루율", "SLG": "장타율", "SB": "도루",
+    "ERA": "ERA", "W": "승", "L": "패", "SV": "세이브", "HLD": "홀드", "IP": "이닝", "SO": "삼진",
+}
+
+def csv_stats_text(row):
+    """2025 성적 CSV 행 -> '타율: 0.289, 홈런: 1, ...' (값이 없는 지표는 제외)"""
+    if not row:
+        return ""
+    parts = []
+    for col, label in CSV_STAT_LABELS.items():
+        val = row.get(col)
+        if val is None or val != val:
+            continue
+        if col in ("AVG", "OBP", "SLG"):
+            parts.append(f"{label}: {val:.3f}")
+        elif col in ("ERA", "IP"):
+            parts.append(f"{label}: {val:.2f}")
+        else:
+            parts.append(f"{label}: {int(val)}")
+    return ", ".join(parts)
+
+def describe_partial(result):
+    """도착한 소스 하나를 진행 상황 문구로 (UI 부분 표시용)"""
+    label = {"news": "📰 뉴스", "record": "📊 시즌 기록", "summary": "🎯 AI 요약"}.get(result.name, result.name)
+    if not result.ok:
+        return f"{label}: 불러오지 못했습니다 ({result.elapsed:.1f}s)"
+    if result.name == "summary":
+        return f"{label}: {result.value}"
+    return f"{label}: 도착 ({result.elapsed:.1f}s)"
+
+def build_player_card(name, p, on_partial=None):
+    """
+    서로 독립적인 I/O (뉴스 검색 / 기록 페이지 / LLM 요약) 를 동시에 실행
+    → 응답 시간이 각 작업 시간의 합이 아니라 가장 느린 작업 시간
+    AI 요약은 실시간 크롤링을 기다리지 않도록 2025 성적 CSV 로 작성
+    """
+    pid = p.get("playerId")
+    team = clean_str(p.get("team"))
+    stats_text = csv_stats_text(store.player_index.stats_row(pid))
+
+    sources = {
+        "news": lambda: fetch_news(f"{name} 야구선수 KBO 프로야구 경기", display=3),
+        "record": lambda: get_player_career_stats(pid),
+    }
+    if stats_text:
+        sources["summary"] = lambda: generate_ai_evaluation(name, stats_text)
+
+    results = run_sources(sources, on_result=on_partial)
+
+    msg = f"🃏 {name} 선수 카드입니다. ({team} / {clean_str(p.get('포지션'))})\n\n"
+    summary = results.get("summary")
+    if summary and summary.ok:
+        msg += f"🎯 {summary.value}\n\n"
+
+    insta_url = store.player_index.instagram(team)
+    if insta_url:
+        msg += f"📸 구단 인스타그램: [바로가기]({insta_url})\n\n"
+
+    news = results["news"]
+    if news.ok and news.value:
+        msg += "📰 야구 관련 뉴스:\n"
+        for idx, item in enumerate(news.value, 1):
+            msg += f"[{idx}] [{item['title']}]({item['link']})\n"
+    else:
+        msg += "📰 관련 뉴스를 불러오지 못했습니다.\n"
+
+    answer = {"role": "bot", "content": msg}
+    record = results["record"]
+    if record.ok and record.value[0]:
+        answer["html"] = record.value[0]
+    return answer
+
+
+# 이름 오타 제안에서 제외할 단어 (질문 키워드가 선수 이름으로 오인되지 않도록)
+FUZZY_SKIP_WORDS = {w for kws in INTENT_KEYWORDS.values() for kw in kws for w in kw.split()}
+
+# 팀 이름 별칭(소문자) -> 표준 팀명 (팀+등번호 검색, 팀 질문 분기 공용)
+TEAM_ALIAS = {
+    "lg": "LG", "엘지": "LG",
+    "kt": "KT", "케이티": "KT",
+    "ssg": "SSG", "에스에스지": "SSG", "쓱": "SSG",
+    "kia": "KIA", "기아": "KIA",
+    "nc": "NC", "엔씨": "NC",
+    "롯데": "롯데", "두산": "두산",
+    "삼성": "삼성", "한화": "한화",
+    "키움": "키움"
+}
+
+
+def find_team(text):
+    """입력에 들어 있는 팀 이름(별칭 포함, 대소문자 무시) -> 표준 팀명 / 없으면 None"""
+    text = text.lower()
+    for alias, std in TEAM_ALIAS.items():
+        if alias in text:
+            return std
+    return None
+
+# 프로필 특정 항목 요청 (컬럼 -> 키워드)
+PROFILE_KEYWORDS = {
+    "생년월일": ["생년월일", "생일"],
+    "등번호": ["등번호", "번호"],
+    "신장/체중": ["키", "신장", "몸무게", "체중"],
+    "team": ["팀", "구단"],
+    "포지션": ["포지션"],
+    "입단년도": ["입단년도", "데뷔년도"],
+    "연봉": ["연봉"],
+    "지명순위": ["지명순위"],
+    "경력": ["경력", "학교", "출신학교"],
+    "입단 계약금": ["입단 계약금", "입단계약금", "계약금"],
+}
+
+# 이 중 하나라도 있으면 키워드 분기가 처리하고, 없을 때만 로컬 의도 분류기로 분기
+ROUTING_KEYWORDS = (
+    [kw for intent in ("news", "stats", "position") for kw in INTENT_KEYWORDS[intent]]
+    + [kw for kws in PROFILE_KEYWORDS.values() for kw in kws]
+)
+
+
+def format_name_suggestions(suggestions):
+    msg = "🔎 혹시 아래 선수를 찾으셨나요?\n\n"
+    for i, s in enumerate(suggestions, 1):
+        detail = " ".join(x for x in [s["team"], f"{s['number']}번" if s["number"] else "", s["position"]] if x)
+        msg += f"{i}. {s['name']} ({detail})\n" if detail else f"{i}. {s['name']}\n"
+    msg += "\n선수 이름을 정확히 입력해 다시 질문해주세요."
+    return msg
+
+
+def format_leaderboard(leaderboard, query):
+    stat = STATS_BY_KEY[query["stat"]]
+    team = f"{query['team']} " if query["team"] else ""
+    if query["mode"] == "top":
+        entries = leaderboard.top(stat.key, query["n"], query["team"])
+        title = f"🏆 2025 {team}{stat.label} TOP {query['n']}"
+    else:
+        entries = leaderboard.at_rank(stat.key, query["n"], query["team"])
+        title = f"🏆 2025 {team}{stat.label} {query['n']}위"
+    note = qualification_note(stat.key)
+    msg = title + (f" ({note})" if note else "") + "\n\n"
+    if not entries:
+        return msg + "조건에 맞는 선수가 없습니다."
+    for e in entries:
+        msg += f"{e['rank']}위 {e['name']} ({e['team']}) {stat.format(e['value'])}\n"
+    return msg
+
+
+def format_player_rank(leaderboard, query, name, pid):
+    stat = STATS_BY_KEY[query["stat"]]
+    rank, total, value = leaderboard.rank_of(stat.key, pid)
+    if value != value:      # NaN
+        return f"📊 {name} 선수는 2025 시즌 {stat.label} 기록이 없습니다."
+    note = qualification_note(stat.key)
+    if rank is None:
+        return f"📊 {name} 선수의 2025 {stat.label}: {stat.format(value)} ({note} 조건 미달로 순위 제외)"
+    scope = f"{note} {total}명 중" if note else f"{total}명 중"
+    return f"📊 {name} 선수의 2025 {stat.label}: {stat.format(value)} (리그 {rank}위, {scope})"
+
+
+@traced("generate_answer")
+def generate_answer(user_input, stream=False, on_partial=None):
+    """
+    stream=True 면 LLM 이 만드는 답변의 content 가 StreamingAnswer (토큰 단위 순회) 로 반환됨
+    on_partial: 여러 소스를 동시에 조회하는 답변(선수 카드)에서 소스가 도착할 때마다 호출
+    """
+
+    # 데이터 파일이 바뀐 경우에만 다시 읽음 (평소에는 mtime 확인만)
+    store.refresh()
+    name_matcher, player_index = store.name_matcher, store.player_index
+    fuzzy_names = store.fuzzy_names
+
+    # 입력 전처리
+    user_input = user_input.strip()
+    text = user_input.lower()   # 입력을 소문자로 변환
+
+    # 팀명 + 등번호 → 선수 찾기 기능
+    team_number_match = re.search(r"([a-zA-Z가-힣]+)\s*(\d{1,2})번", user_input)
+    if team_number_match:
+        team_query = team_number_match.group(1).strip()
+        number_query = team_number_match.group(2).strip()
+
+        # 팀 이름 매칭
+        team_std = TEAM_ALIAS.get(team_query.lower(), team_query)
+
+        # 팀 + 등번호로 선수 찾기
+        match_player = player_index.by_team_number(team_std, number_query)
+
+        if match_player:
+            p = match_player[0]
+            name = p.get("name")
+
+            df_profile = pd.DataFrame(profile_display_items(p), columns=["항목", "내용"])
+            df_profile["내용"] = df_profile["내용"].apply(lambda x: "" if str(x) in BAD_TOKENS else x)
+
+            return {
+                "role": "bot",
+                "content": f"📌 {team_std} {number_query}번은 {name} 선수입니다.",
+                "profile": df_profile,
+                "ratings": store.ratings.get(p.get("playerId"))
+            }
+        else:
+            return {"role": "bot", "content": f" {team_std} {number_query}번 선수 정보를 찾을 수 없습니다."}
+
+    # 팀 이름만 언급된 경우 처리
+    found_team = find_team(user_input)
+    user_input_lower = user_input.lower()
+
+    # 순위표 질문 (홈런 1위 / LG 타율 top 5) → 미리 정렬된 배열에서 바로 답변 (LLM 호출 없음)
+    board_query = parse_leaderboard_query(user_input, found_team)
+    if board_query and not name_matcher.candidates(user_input):
+        with span("leaderboard"):
+            return {"role": "bot", "content": format_leaderboard(store.leaderboard, board_query)}
+
+    # 팀 이름 포함 시 처리 (CSV 기반 우선)
+    if found_team:
+        # 뉴스 / 인스타만 예외로 우선 처리
+        if any(word in user_input_lower for word in ["뉴스", "소식", "인스타", "최근 소식", "최근 근황", "소식", "뉴스", "기사", "근황", "최근 이슈", "요즘 어때", "요즘 소식", "인터뷰", "최근 인터뷰", "요즘 근황", "요즘 뭐해"]):
+            insta_url = player_index.instagram(found_team)
+            query = f"{found_team} 야구 KBO 프로야구 경기"
+            news_items = fetch_news(query, display=3)
+            msg = f"📢 {found_team}의 최근 소식입니다.\n\n📸 구단 인스타그램: [바로가기]({insta_url})\n\n"
+            if news_items:
+                msg += "📰 야구 관련 뉴스:\n"
+                for idx, item in enumerate(news_items, 1):
+                    msg += f"[{idx}] [{item['title']}]({item['link']})\n"
+            else:
+                msg += "📰 관련 뉴스가 없습니다. 대신 구단 인스타그램을 확인해보세요!"
+            return {"role": "bot", "content": msg}
+
+        # 그 외의 팀 관련 질문은 CSV 기반 선수 데이터에서 우선 탐색
+        team_players = player_index.team_players(found_team)
+
+        if team_players:
+            prompt = f"""
+            사용자가 이렇게 물었습니다:
+            "{user_input}"
+
+            아래는 CSV 데이터베이스에서 찾은 '{found_team}' 구단 소속 선수 목록입니다:
+            {[row["name"] for row in team_players[:10]]}
+
+            위 선수 데이터를 바탕으로 질문에 맞게 대답하세요.
+            - 반드시 CSV에 포함된 선수 중에서만 언급하세요.
+            - 은퇴 선수나 CSV 외의 선수는 절대 언급하지 마세요.
+            - 문장은 2~3문장으로 자연스럽고 사실적인 톤으로 작성하세요.
+            - '~입니다.' 또는 '~하고 있습니다.'로 끝나게 하세요.
+            """
+
+            ai_answer = ask_llm(prompt, temperature=0.8, max_tokens=250, stream=stream)
+            return {"role": "bot", "content": ai_answer}
+
+        # CSV에 해당 팀이 없으면 KBO 전체 맥락으로 처리
+        prompt = f"""
+        사용자가 이렇게 물었습니다:
+        "{user_input}"
+
+        이 질문은 특정 팀({found_team})에 대한 질문입니다.
+        하지만 CSV 데이터베이스에서 해당 팀 소속 선수를 찾을 수 없습니다.
+        한국 프로야구(KBO)의 최근 흐름과 일반 팀 분위기를 기준으로
+        자연스럽고 사실적인 2~3문장으로 답변하세요.
+        """
+        ai_answer = ask_llm(prompt, temperature=0.8, max_tokens=200, stream=stream)
+        return {"role": "bot", "content": ai_answer}
+    
+    # 선수 이름 찾기
+    name = None
+    user_name = user_input.replace("선수", "").strip()
+
+    # 완전 일치 우선
+    if user_name in name_matcher.names:
+        name = user_name
+
+    # 이름 전체가 들어간 경우 (공백, 조사 포함)
+    # 오토마톤으로 입력을 한 번만 훑어 모든 후보를 찾고, 가장 긴 이름을 우선
+    with span("match.name"):
+        name_candidates = name_matcher.candidates(user_input)
+    if not name and name_candidates:
+        name = name_candidates[0]
+
+    # 이름 인식 실패 시 처리
+    if not name:
+        # 주요 키워드
+        typo_keywords = ["성적", "홈런", "타율", "ops", "방어율", "era", "삼진", "이닝", "경기", "요약", "평가"]
+        has_stat_word = any(k in text for k in typo_keywords)
+
+        found_team = find_team(text)
+
+        # 팀 이름이 포함된 경우 → AI로 넘김 (무조건 오타로 막지 않음)
+        if found_team:
+            prompt = f"""
+            사용자가 이렇게 물었습니다:
+            "{user_input}"
+
+            이 질문은 특정 팀({found_team})과 관련된 분석형 질문입니다.
+            당신은 한국 프로야구 전문가이자 해설자입니다.
+            팀의 최근 경기력, 주목받는 선수, 분위기, 팬 평가 등을 기반으로
+            사실적인 1~2문장으로 자연스럽게 답변하세요.
+            너무 딱딱하지 않게, 정중한 문체로, 문장은 '~입니다'로 끝나게.
+            """
+            ai_answer = ask_llm(prompt, temperature=0.9, max_tokens=200, stream=stream)
+            return {"role": "bot", "content": ai_answer}
+
+        # 이름 오타 → 자모 단위로 가까운 선수 이름 제안
+        with span("match.fuzzy"):
+            suggestions = fuzzy_names.suggest(user_input, skip_words=FUZZY_SKIP_WORDS)
+        if suggestions:
+            return {"role": "bot", "content": format_name_suggestions(suggestions)}
+
+        # 오타 감지
+        korean_chars = [ch for ch in user_input if "가" <= ch <= "힣"]
+        # 이름이 짧거나 공백, 또는 성적 단어 포함 → 오타로 간주
+        if len(korean_chars) <= 2 or any(ch.isspace() for ch in user_input) or has_stat_word:
+            return {"role": "bot", "content": "질문을 다시 입력해주세요. (선수 이름을 정확히 입력해주세요)"}
+
+        # 자유형 AI 처리
+        prompt = f"""
+        사용자가 이렇게 물었습니다:
+        "{user_input}"
+
+        특정 선수 이름이나 팀 이름이 명확하지 않은 일반적인 KBO 관련 질문입니다.
+        당신은 한국 프로야구 해설자입니다.
+        전문가답지만 자연스럽게 1~2문장으로 답변하세요.
+        """
+        ai_answer = ask_llm(prompt, temperature=0.9, max_tokens=200, stream=stream)
+        return {"role": "bot", "content": ai_answer}
+
+    # 키워드 분기에 걸리지 않는 질문('요즘 잘 지내?', '공 던지는 선수야' 등)만 의도 분류기로 분기
+    # 선수 이름은 분류에 방해가 되므로 제거 후 분류
+    intent = None
+    if not any(k in text for k in ROUTING_KEYWORDS + PLAYER_CARD_KEYWORDS):
+        intent = classify_intent(user_input.replace(name, " "))
+
+    # 선수 데이터
+    p = player_index.by_name(name)[0]
+    pid = p.get("playerId")
+
+    # 특정 선수의 순위 (양의지 타율 몇 위)
+    if board_query:
+        return {"role": "bot", "content": format_player_rank(store.leaderboard, board_query, name, pid)}
+
+    # 선수 카드 (여러 소스 동시 조회)
+    if any(k in user_input for k in PLAYER_CARD_KEYWORDS):
+        return build_player_card(name, p, on_partial=on_partial)
+
+    # 네이버 실시간 최근 경기 기록(10경기까지만)
+    if any(k in user_input for k in ["최근 경기", "최근 성적", "최근 기록", "최근 10경기"]):
+        result_html, err = get_player_realtime_stats(pid)
+
+        if err:
+            return {
+                "role": "bot",
+                "content": f"❌ {name} 선수의 최근 경기 기록을 불러올 수 없습니다."
+            }
+
+        return {
+            "role": "bot",
+            "content": f"📊 {name} 선수의 최근 경기 기록입니다.",
+            "html": result_html
+        }
+    
+    # AI 요약 요청 (성적 요약, 평가 등)
+    if any(k in user_input for k in ["성적 요약", "성적 평가", "2025 성적 요약", "올해 성적 평가", "올해 성적 요약"]):
+        result_html, df_2025 = get_player_career_stats(pid)
+
+        if df_2025 is None or isinstance(df_2025, str):
+            return {"role": "bot", "content": f"❌ {name} 선수의 2025 시즌 성적 데이터를 불러올 수 없습니다."}
+
+        stats_text = season_stats_text(df_2025)
+
+        ai_summary = generate_ai_evaluation(name, stats_text, stream=stream)
+
+        return {
+            "role": "bot",
+            "content": with_prefix(f"📊 {name} 선수의 2025 시즌 AI 성적 요약입니다.\n\n🎯 ", ai_summary)
+        }
+
+    # 네이버 실시간 통산기록 (2025 시즌)
+    # "요약"이나 "평가"가 포함된 질문은 제외
+    elif (any(k in user_input for k in ["2025 성적", "2025 통산기록", "시즌 성적", "올해 성적", "시즌 기록", "성적"])
+          and not any(k in user_input for k in ["요약", "평가"])) or intent == "stats":
+        try:
+            result_html, df_2025 = get_player_career_stats(pid)
+        except Exception as e:
+            return {"role": "bot", "content": f"❌ 통산기록을 불러오는 중 오류 발생: {e}"}
+
+        if "df_2025" not in locals() or df_2025 is None or isinstance(df_2025, str) or df_2025.empty:
+            return {"role": "bot", "content": f"❌ {name} 선수의 2025 통산기록을 불러올 수 없습니다."}
+
+        return {"role": "bot", "content": f"📊 {name} 선수의 2025 시즌 기록입니다.", "html": result_html}
+    
+    # 최근 소식 기능 (야구 관련 뉴스 + 인스타)
+    if any(k in user_input for k in [
+        "최근 소식", "소식", "뉴스", "기사", "근황", "최근 이슈", "요즘 어때",
+        "요즘 뭐해", "요즘 소식", "최근 근황", "인터뷰", "최근 인터뷰", "요즘 근황",
+    ]) or intent == "news":
+        team = clean_str(p.get("team")) if "p" in locals() else ""
+        insta_url = ""
+        query = ""
+
+        # 팀 이름만 언급된 경우 처리
+        found_team = find_team(user_input)
+
+        # 검색어 구성
+        if name:  # 선수 중심 검색
+            query = f"{name} 야구선수 KBO 프로야구 경기"
+        elif found_team:  # 팀 중심 검색
+            query = f"{found_team} 야구 KBO 프로야구 경기"
+        else:
+            return {"role": "bot", "content": "어느 팀 또는 선수를 말씀하시는지 조금 더 구체적으로 알려주세요."}
+
+        # 인스타그램 링크
+        if found_team:
+            insta_url = player_index.instagram(found_team)
+        if not insta_url and team:
+            insta_url = player_index.instagram(team)
+
+        # 뉴스 검색
+        news_items = fetch_news(query, display=3)
+
+        if name:
+            msg = f"📢 {name} 선수의 최근 소식입니다.\n\n"
+        elif found_team:
+            msg = f"📢 {found_team}의 최근 소식입니다.\n\n"
+        else:
+            msg = "📢 최근 소식입니다.\n\n"
+
+        if insta_url:
+            msg += f"📸 구단 인스타그램: [바로가기]({insta_url})\n\n"
+
+        if news_items:
+            msg += "📰 야구 관련 뉴스:\n"
+            for idx, item in enumerate(news_items, 1):
+                msg += f"[{idx}] [{item['title']}]({item['link']})\n"
+        else:
+            msg += "📰 관련 뉴스가 없습니다. 대신 구단 인스타그램을 확인해보세요!"
+
+        return {"role": "bot", "content": msg}
+    
+    # '포지션'이라고 질문
+    if "포지션" in user_input:
+        pos = clean_str(p.get("포지션"))
+        if pos:
+            return {"role": "bot", "content": f"{name} 선수의 포지션은 {pos}입니다."}
+        else:
+            return {"role": "bot", "content": f"{name} 선수의 포지션 정보는 없습니다."}
+
+    # 포지션 구분/역할 관리 질문 (AI 자유형 문장 생성)
+    if any(kw in user_input for kw in [
+        "루수", "포수", "외야수", "내야수", "지명타자", "유격수",
+        "1루", "2루", "3루", "야수", "투수", "타자",
+        "포지션", "역할", "수야", "야?", "뭐하는", "하는 선수", "무슨", "수비"
+    ]) or intent == "position":
+        pos = clean_str(p.get("포지션"))
+        team = clean_str(p.get("team"))
+
+        prompt = f"""
+        너는 야구 전문가야.
+        사용자가 "{user_input}" 라고 물었어.
+
+        아래 정보를 참고해서 자연스럽고 사람처럼 한 문장으로 대답해줘:
+        - 선수 이름: {name}
+        - 소속 팀: {team}
+        - 실제 포지션: {pos if pos else "정보 없음"}
+
+        제약사항:
+        - 문장 구조를 고정하지 말고 자유롭게 표현해.(존댓말은 필수)
+        - '역할'을 물어보면 '네'나 '아니요'는 앞에 붙이면 안돼. 
+        - 질문이 맞으면 '네,' 또는 '맞아요,'로 자연스럽게 시작할 수도 있어.
+        - 다르면 '아니요,' 또는 부드럽게 교정하는 문장으로 시작해도 돼.
+        - 어색한 형식적 표현 없이 일상적인 말투로 한 문장만 생성해.
+        - 사용자가 000 ~야? 이렇게 물어봐도 생성할 때는 선수 이름 뒤에 '선수'를 붙여.
+        """
+
+        ai_sentence = ask_llm(prompt, temperature=1.0, max_tokens=80, stream=stream)
+        return {"role": "bot", "content": ai_sentence}
+
+    # 프로필 특정 항목 요청
+    for col, keywords in PROFILE_KEYWORDS.items():
+        if any(k in user_input for k in keywords):   # 여러 키워드 중 하나라도 포함
+            val = clean_str(p.get(col))
+            if val:
+                return {"role": "bot", "content": f"{name} 선수의 {col}은 {val}입니다."}
+            else:
+                return {"role": "bot", "content": f"{name} 선수의 {col} 정보는 없습니다."}  
+            
+    # 특정 지표 자동 인식 (투수/타자 통합 + 역할별 자연응답)
+    if any(k in text for k in ["성적", "기록", "타율", "홈런", "평균자책", "ops", "이닝", "세이브", "홀드", "승", "패", "삼진", "출루율", "타점", "득점", "볼넷", "피홈런"]):
+        try:
+            result_html, df_2025 = get_player_career_stats(pid)
+        except Exception as e:
+            return {"role": "bot", "content": f"❌ 성적 데이터를 불러오는 중 오류 발생: {e}"}
+
+        if df_2025 is None or isinstance(df_2025, str) or df_2025.empty:
+            return {"role": "bot", "content": f"❌ {name} 선수의 2025 시즌 성적 데이터를 불러올 수 없습니다."}
+
+        row = df_2025.iloc[0]
+        available_cols = [c.strip() for c in df_2025.columns if c.strip()]
+
+        # 사용자 입력에서 컬럼명 자동 탐색
+        found_col = None
+        for col in available_cols:
+            if col in user_input or col.lower() in user_input.lower():
+                found_col = col
+                break
+
+        # 컬럼을 못 찾았을 때
+        if not found_col:
+            role = detect_role(row)
+            if role == "타자":
+                msg = f"⚾ {name} 선수는 타자이기 때문에 해당 기록은 존재하지 않습니다."
+            elif role == "투수":
+                msg = f"⚾ {name} 선수는 투수이기 때문에 해당 기록은 존재하지 않습니다."
+            else:
+                msg = f"⚾ {name} 선수의 해당 지표는 현재 데이터에 없습니다."
+            return {"role": "bot", "content": msg}
+
+        val = str(row[found_col]).strip()
+        role = detect_role(row)
+
+        # 값이 없거나 '-'인 경우
+        if not val or val in ["-", ""]:
+            if role == "타자":
+                prompt = f"{name} 선수는 타자이기 때문에 '{found_col}' 기록은 제공되지 않습니다. 자연스럽게 한 문장으로 표현해주세요."
+            elif role == "투수":
+                prompt = f"{name} 선수는 투수이기 때문에 '{found_col}' 기록은 제공되지 않습니다. 자연스럽게 한 문장으로 표현해주세요."
+            else:
+                prompt = f"{name} 선수의 '{found_col}' 데이터가 현재 제공되지 않습니다. 자연스럽게 한 문장으로 표현해주세요."
+        else:
+            prompt = f"{name} 선수의 2025 시즌 {found_col}은 {val}입니다. 자연스럽게 한 문장으로 표현해주세요."
+
+        # OpenAI로 문장 생성
+        ai_sentence = ask_llm(prompt, temperature=0.8, max_tokens=100, stream=stream)
+        return {"role": "bot", "content": ai_sentence}
+     
+    # 프로필 출력 조건 (동명이인 처리 포함)
+    profile_triggers = ["선수에 대해 알려줘", "선수 알려줘", "알려줘", "누구야", "정보", "소개"]
+
+    if (
+        (len(user_input) <= len(name) + 3 and name in user_input)
+        or any(k in user_input for k in profile_triggers)
+    ) and not any(k in user_input for k in ["성적", "홈런", "요약", "평가", "뉴스", "근황", "방어율", "통산기록"]):
+
+        # 동명이인 처리
+        same_name_players = player_index.by_name(name)
+        if len(same_name_players) > 1:
+            options_text = ""
+            for idx, row in enumerate(same_name_players, 1):
+                team = row.get("team", "팀 정보 없음")
+                number = str(row.get("등번호", "")).replace("No.", "").strip()
+                position = row.get("포지션", "포지션 정보 없음")
+                options_text += f"{idx}. {team} {number}번 ({position})\n"
+
+            return {
+                "role": "bot",
+                "content": (
+                    f" '{name}' 이름을 가진 선수가 여러 명 있습니다.\n\n"
+                    f"아래 중에서 찾으시는 선수를 선택해주세요 👇\n\n{options_text}"
+                    f"\n예: '키움 2번 {name}' 처럼 팀명과 등번호를 함께 입력해주세요."
+                )
+            }
+
+        # 동명이인에 해당 없는 경우 바로 프로필 출력
+        p = same_name_players[0]
+        df_profile = pd.DataFrame(profile_display_items(p), columns=["항목", "내용"])
+        df_profile["내용"] = df_profile["내용"].apply(lambda x: "" if str(x) in BAD_TOKENS else x)
+
+        return {
+            "role": "bot",
+            "content": f"📌 {name} 선수의 기본 프로필입니다.",
+            "profile": df_profile,
+            "ratings": store.ratings.get(p.get("playerId"))
+        }
+
+    # 자유형 AI 응답 (CSV 기반 우선 + KBO 백업 응답)
+    if not any(k in text for k in [
+        "성적", "기록", "타율", "홈런", "평균자책", "ops", "이닝", "세이브", "홀드",
+        "승", "패", "삼진", "출루율", "타점", "득점", "볼넷", "피홈런",
+        "뉴스", "근황", "인터뷰", "포지션", "팀", "번호", "등번호", "프로필"
+    ]):
+        # 입력문에 등장한 실제 선수 이름 (CSV 기반)
+        valid_names = name_candidates
+
+        if valid_names:
+            # CSV에 존재하는 선수만 사용
+            name = valid_names[0]
+            player_row = player_index.by_name(name)[0]
+            team = player_row.get("team", "정보 없음")
+            pos = player_row.get("포지션", "정보 없음")
+
+            prompt = f"""
+            사용자가 이렇게 물었습니다:
+            "{user_input}"
+
+            아래는 실제 CSV 데이터베이스에 존재하는 선수입니다.
+            [선수명: {name}, 소속팀: {team}, 포지션: {pos}]
+
+            오직 이 선수의 데이터만 참고해 대답하세요.
+            - CSV 파일 외의 선수는 절대 언급하지 않습니다.
+            - 은퇴 선수나 과거 선수, 외국인 선수는 언급하지 않습니다.
+            - 자연스럽고 사실적인 톤으로 2~3문장 작성하세요.
+            - 문장은 '~입니다.' 또는 '~하고 있습니다.'로 끝내세요.
+            """
+
+            ai_answer = ask_llm(prompt, temperature=0.7, max_tokens=250, stream=stream)
+            return {"role": "bot", "content": ai_answer}
+
+        else:
+            # CSV에 없는 경우 KBO 일반 맥락 기반으로 답변
+            prompt = f"""
+            사용자가 이렇게 물었습니다:
+            "{user_input}"
+
+            질문에 포함된 이름은 현재 CSV 선수 데이터베이스에 없습니다.
+            대신 한국 프로야구(KBO) 전체 흐름, 구단 분위기, 경기력 등을 기준으로
+            사실적인 범위 안에서 2~3문장으로 답변하세요.
+            특정 선수 이름은 언급하지 않습니다.
+            자연스럽고 전문가다운 문체로 '~입니다.'로 끝내세요.
+            """
+
+            ai_answer = ask_llm(prompt, temperature=0.8, max_tokens=250, stream=stream)
+            return {"role": "bot", "content": ai_answer}
+        
+    # 선수만 언급했을 경우
+    df_profile = pd.DataFrame(profile_display_items(p), columns=["항목", "내용"])
+    df_profile["내용"] = df_profile["내용"].apply(lambda x: "" if str(x) in BAD_TOKENS else x)
+    return {
+        "role": "bot",
+        "content": f"📌 {name} 선수의 기본 프로필입니다.",
+        "profile": df_profile,
+        "ratings": store.ratings.get(pid)
+    }
+
+
+# === API / 원격 UI 용 ===
+def answer_to_json(answer):
+    """
+    generate_answer 결과 -> JSON 으로 보낼 수 있는 dict
+    스트리밍 답변은 끝까지 받아 문자열로, DataFrame(프로필)은 행 목록(records)으로 바꾼다.
+    """
+    out = {}
+    for key, value in answer.items():
+        if isinstance(value, StreamingAnswer):
+            for _ in value:
+                pass
+            value = value.text.strip()
+        elif isinstance(value, pd.DataFrame):
+            value = value.astype(object).where(value.notna(), None).to_dict(orient="records")
+        out[key] = value
+    return out
+
+def engine_stats():
+    """사이드바 / API 상태 표시용 (응답 캐시, 기록 캐시, 페이지 준비 대기, 데이터 저장소, 스트리밍 지연, 미리 가져오기)"""
+    record_cache = get_snapshot_cache()
+    return {
+        "llm_cache": {**llm_cache.stats, "hit_ratio": llm_cache.hit_ratio()},
+        "record_cache": {**record_cache.stats, "hit_ratio": record_cache.hit_ratio()},
+        "page_wait": wait_timings.summary(),
+        "data": {
+            "source": store.source,
+            "backend": store.backend,
+            "load_ms": round(store.load_seconds * 1000),
+            "memory_mb": round(store.memory_usage()["total"] / 1024 / 1024, 1),
+            "version": store.version,
+        },
+        "stream": stream_metrics.summary(),
+        "prefetch": prefetch_stats(),
+    }
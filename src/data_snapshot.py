@@ -0,0 +1,116 @@
+"""
+선수 데이터 바이너리 스냅샷 (Feather / Arrow)
+
+CSV 3종을 타입이 정해진 컬럼형 파일로 미리 변환해 두고, 앱 시작 시 그대로 읽는다.
+- 2025 성적의 수치 컬럼(AVG, HR, ERA, IP ...)은 float 로 변환해 저장
+  (IP 의 '12 1/3' 같은 표기도 12.333 으로 변환)
+- 프로필의 category / 파싱된 수치 컬럼과 구단 인스타그램 차원 테이블도 타입 그대로 저장
+- manifest.json 에 원본 CSV 의 크기/mtime 을 기록해 두고, 원본이 바뀌면 스냅샷은 무시(CSV 로 대체)
+- pyarrow 가 없으면 스냅샷 없이 CSV 만 사용
+
+    python src/data_snapshot.py          # 스냅샷 생성
+"""
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (pandas feather 입출력에 필요)
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+SNAPSHOT_DIR = Path(os.getenv(
+    "KBO_SNAPSHOT_DIR", Path(__file__).resolve().parent.parent / "data" / "snapshot"
+))
+MANIFEST = "manifest.json"
+SNAPSHOT_VERSION = 2      # 2: 프로필 압축 스키마 (profile_schema)
+
+# 문자열로 남겨 둘 성적 컬럼 (나머지는 수치)
+STATS_TEXT_COLUMNS = ("playerId", "season", "팀명")
+
+
+def innings_to_float(x):
+    """'12 1/3' -> 12.333, '2/3' -> 0.667, '57' -> 57.0"""
+    if x is None or x != x:
+        return float("nan")
+    s = str(x).replace(",", "").strip()
+    if not s or s == "-":
+        return float("nan")
+    total = 0.0
+    try:
+        for part in s.split():
+            if "/" in part:
+                num, den = part.split("/")
+                total += float(num) / float(den)
+            else:
+                total += float(part)
+    except ValueError:
+        return float("nan")
+    return total
+
+
+def coerce_stats(stats):
+    """성적 DataFrame 의 수치 컬럼을 float 로 변환 (CSV / 스냅샷 공용)"""
+    stats = stats.copy()
+    for col in stats.columns:
+        if col in STATS_TEXT_COLUMNS:
+            continue
+        if col == "IP":
+            stats[col] = stats[col].map(innings_to_float).astype("float64")
+        else:
+            stats[col] = pd.to_numeric(
+                stats[col].astype(str).str.replace(",", "", regex=False), errors="coerce"
+            ).astype("float64")
+    return stats
+
+
+def _source_info(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def build_snapshot(sources, frames, snapshot_dir=SNAPSHOT_DIR):
+    """frames: {"profiles": df, ...} 를 feather 로 저장하고 manifest 기록"""
+    if not HAS_ARROW:
+        raise RuntimeError("스냅샷 생성에는 pyarrow 가 필요합니다. (pip install pyarrow)")
+    snapshot_dir = Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    for key, df in frames.items():
+        df.reset_index(drop=True).to_feather(snapshot_dir / f"{key}.feather")
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "sources": {k: {"path": str(p), **_source_info(p)} for k, p in sources.items()},
+        "frames": sorted(frames),
+    }
+    (snapshot_dir / MANIFEST).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def load_snapshot(sources, snapshot_dir=SNAPSHOT_DIR):
+    """원본 CSV 와 일치하는 스냅샷이 있으면 {key: df}, 없거나 오래됐으면 None"""
+    if not HAS_ARROW:
+        return None
+    snapshot_dir = Path(snapshot_dir)
+    try:
+        manifest = json.loads((snapshot_dir / MANIFEST).read_text(encoding="utf-8"))
+        if manifest.get("version") != SNAPSHOT_VERSION:
+            return None
+        for key, path in sources.items():
+            saved = manifest["sources"].get(key, {})
+            info = _source_info(path)
+            if saved.get("size") != info["size"] or saved.get("mtime_ns") != info["mtime_ns"]:
+                return None
+        return {key: pd.read_feather(snapshot_dir / f"{key}.feather") for key in manifest["frames"]}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+if __name__ == "__main__":
+    import time
+    from data_store import SNAPSHOT_SOURCES, read_csv_frames
+
+    start = time.perf_counter()
+    build_snapshot(SNAPSHOT_SOURCES, read_csv_frames(SNAPSHOT_SOURCES))
+    print(f"snapshot: {SNAPSHOT_DIR} ({(time.perf_counter() - start) * 1000:.0f}ms)")
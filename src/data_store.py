@@ -0,0 +1,167 @@
+"""
+프로세스 전역 데이터 저장소 (CSV 1회 로드 + 파일 변경 시에만 재로드)
+
+선수 프로필 / 2025 성적 / 구단 인스타그램 / (있으면) 최근 경기 CSV 를 한 번만 읽고,
+이름 매칭 오토마톤 / 오타 보정용 퍼지 인덱스 / 해시 인덱스 / 순위표 / 능력치도 함께 만들어 둔다.
+refresh() 는 파일 mtime 만 확인하므로 매 질문마다 불러도 비용이 거의 없다.
+원본과 일치하는 바이너리 스냅샷(data_snapshot)이 있으면 CSV 대신 스냅샷을 읽는다.
+프로필은 category 컬럼 + 파싱된 수치 컬럼, 구단 인스타그램은 팀당 한 행으로 들고 있다 (profile_schema).
+
+선수 조회 백엔드 (KBO_PLAYER_BACKEND)
+- "memory" : 프로세스마다 dict 해시 인덱스(PlayerIndex) (기본값)
+- "sqlite" : 읽기 전용 SQLite 파일(player_db)로 조회. 원본 DataFrame 은 파생 인덱스를 만든 뒤 버리므로
+             여러 워커 프로세스가 파일 하나를 공유하고 프로세스마다 행 데이터를 들고 있지 않는다.
+"""
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from data_snapshot import coerce_stats, load_snapshot
+from fuzzy_names import FuzzyNameIndex
+from leaderboard import Leaderboard
+from name_matcher import NameMatcher
+from player_db import PLAYER_DB, SqlitePlayerIndex, build_player_db, player_db_is_current
+from player_index import PlayerIndex
+from profile_schema import compact_profiles, team_dimension
+from ratings import PlayerRatings
+from tracing import span, traced
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+PROFILES_CSV = DATA_DIR / "player_profiles_1.csv"
+STATS_CSV = DATA_DIR / "KBO_2025_player_stats_type.csv"
+TEAM_INSTA_CSV = DATA_DIR / "team_instagram_1.csv"
+RECENT_CSV = DATA_DIR / "KBO_10.csv"      # 선택 (없으면 빈 DataFrame)
+
+# 바이너리 스냅샷으로 변환하는 원본
+SNAPSHOT_SOURCES = {"profiles": PROFILES_CSV, "stats": STATS_CSV, "team_instagram": TEAM_INSTA_CSV}
+
+PLAYER_BACKEND = os.getenv("KBO_PLAYER_BACKEND", "memory")     # memory / sqlite
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _read_recent(path):
+    if not path.exists():
+        return pd.DataFrame(columns=["playerId"])
+    recent = pd.read_csv(path, dtype=str)
+    recent["playerId"] = recent["playerId"].ffill()
+    return recent
+
+
+def read_csv_frames(sources):
+    """CSV 원본 읽기 (성적 수치 컬럼은 float, 프로필 / 구단 인스타그램은 압축 스키마로 변환)"""
+    return {
+        "profiles": compact_profiles(pd.read_csv(sources["profiles"], dtype=str)),
+        "stats": coerce_stats(pd.read_csv(sources["stats"], dtype=str)),
+        "team_instagram": team_dimension(pd.read_csv(sources["team_instagram"], dtype=str)),
+    }
+
+
+class DataStore:
+    def __init__(self, profiles_csv=PROFILES_CSV, stats_csv=STATS_CSV,
+                 team_insta_csv=TEAM_INSTA_CSV, recent_csv=RECENT_CSV, use_snapshot=True,
+                 backend=PLAYER_BACKEND, player_db=PLAYER_DB):
+        self.paths = {
+            "profiles": Path(profiles_csv),
+            "stats": Path(stats_csv),
+            "team_instagram": Path(team_insta_csv),
+            "recent": Path(recent_csv),
+        }
+        self.use_snapshot = use_snapshot
+        self.backend = backend
+        self.player_db = Path(player_db)
+        self.source = None          # "snapshot" / "csv"
+        self._mtimes = {}
+        self._lock = threading.Lock()
+        self.version = 0
+        self.load_seconds = 0.0
+        self.loaded_at = None
+        self.load()
+
+    def _changed(self):
+        return any(_mtime(p) != self._mtimes.get(k) for k, p in self.paths.items())
+
+    @traced("data.load")
+    def load(self):
+        start = time.perf_counter()
+        mtimes = {k: _mtime(p) for k, p in self.paths.items()}
+
+        sources = {k: self.paths[k] for k in SNAPSHOT_SOURCES}
+        frames = load_snapshot(sources) if self.use_snapshot else None
+        source = "snapshot" if frames is not None else "csv"
+        if frames is None:
+            frames = read_csv_frames(sources)
+
+        profiles, stats, team_instagram = frames["profiles"], frames["stats"], frames["team_instagram"]
+        recent = _read_recent(self.paths["recent"])
+
+        name_matcher = NameMatcher(profiles["name"].dropna().unique())
+        if self.backend == "sqlite":
+            if not player_db_is_current(sources, self.player_db):
+                with span("data.build_player_db"):
+                    build_player_db(frames, sources, self.player_db)
+            player_index = SqlitePlayerIndex(self.player_db)
+        else:
+            player_index = PlayerIndex(profiles, stats, team_instagram)
+        fuzzy_names = FuzzyNameIndex(profiles.to_dict("records"))
+        leaderboard = Leaderboard(stats, profiles)
+        # 능력치는 직전 결과와 입력값이 같은 풀(타자/투수)은 재사용
+        ratings = PlayerRatings(stats, previous=getattr(self, "ratings", None))
+
+        if self.backend == "sqlite":
+            # 조회는 SQLite 파일이 맡으므로 원본 DataFrame 은 들고 있지 않음
+            profiles = stats = team_instagram = None
+
+        # 다 만든 뒤 한 번에 교체 (읽는 쪽이 반쯤 바뀐 상태를 보지 않도록)
+        self.profiles, self.stats = profiles, stats
+        self.team_instagram, self.recent = team_instagram, recent
+        self.name_matcher, self.player_index = name_matcher, player_index
+        self.fuzzy_names, self.leaderboard, self.ratings = fuzzy_names, leaderboard, ratings
+        self._mtimes = mtimes
+        self.source = source
+        self.version += 1
+        self.load_seconds = time.perf_counter() - start
+        self.loaded_at = time.time()
+
+    def refresh(self) -> bool:
+        """파일이 바뀐 경우에만 다시 읽음. 다시 읽었으면 True"""
+        with span("data.refresh") as attrs:
+            if not self._changed():
+                return False
+            with self._lock:
+                if not self._changed():
+                    return False
+                self.load()
+                attrs["reloaded"] = True
+                return True
+
+    def memory_usage(self):
+        """DataFrame 별 메모리 사용량(byte). sqlite 백엔드는 들고 있지 않은 DataFrame 제외"""
+        frames = {
+            "profiles": self.profiles, "stats": self.stats,
+            "team_instagram": self.team_instagram, "recent": self.recent,
+        }
+        usage = {k: int(df.memory_usage(deep=True).sum()) for k, df in frames.items() if df is not None}
+        usage["total"] = sum(usage.values())
+        return usage
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_data_store() -> DataStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DataStore()
+        return _store
@@ -0,0 +1,90 @@
+"""
+독립적인 I/O 를 asyncio 로 동시에 실행 (소스별 제한 시간 + 도착 순서대로 부분 결과 전달)
+
+뉴스 검색 / 기록 페이지 / LLM 요약처럼 서로 기다릴 필요가 없는 작업을 한꺼번에 시작해서
+전체 시간이 각 작업 시간의 합이 아니라 가장 느린 작업 시간이 되도록 한다.
+기존 함수들이 동기(blocking) 함수이므로 모듈 전역 스레드 풀(run_in_executor)에서 실행.
+asyncio.to_thread(기본 executor)를 쓰면 asyncio.run 이 끝날 때 제한 시간을 넘긴 스레드까지 기다리므로
+호출마다 닫지 않는 풀을 따로 두고, 시간을 넘긴 작업은 기다리지 않고 버린다.
+"""
+import asyncio
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tracing import span
+
+# 소스별 제한 시간(초). 시간을 넘긴 소스는 결과 없이 나머지만으로 답변
+FANOUT_TIMEOUTS = {
+    "news": float(os.getenv("KBO_FANOUT_TIMEOUT_NEWS", "4")),
+    "record": float(os.getenv("KBO_FANOUT_TIMEOUT_RECORD", "12")),
+    "summary": float(os.getenv("KBO_FANOUT_TIMEOUT_LLM", "10")),
+}
+DEFAULT_TIMEOUT = 10.0
+FANOUT_WORKERS = int(os.getenv("KBO_FANOUT_WORKERS", "16"))     # 소스 실행 스레드 수 (프로세스 전체 공유)
+
+# 호출마다 만들고 닫지 않음 (닫으면 시간을 넘긴 소스가 끝날 때까지 기다리게 됨)
+_executor = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="kbo-fanout")
+
+
+class SourceResult:
+    def __init__(self, name, value=None, error=None, elapsed=0.0):
+        self.name = name
+        self.value = value
+        self.error = error          # 예외 또는 "timeout"
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+async def _run_source(name, fn, timeout):
+    def run():
+        with span(f"fanout.{name}"):
+            return fn()
+
+    # contextvars 를 복사해 넘기므로 스레드 안의 span 도 같은 trace 에 붙음
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    start = time.perf_counter()
+    try:
+        value = await asyncio.wait_for(loop.run_in_executor(_executor, ctx.run, run), timeout)
+        return SourceResult(name, value=value, elapsed=time.perf_counter() - start)
+    except asyncio.TimeoutError:
+        # 스레드 자체는 멈출 수 없으므로 결과만 버림
+        return SourceResult(name, error="timeout", elapsed=time.perf_counter() - start)
+    except Exception as e:
+        return SourceResult(name, error=e, elapsed=time.perf_counter() - start)
+
+
+async def gather_sources(sources, timeouts=None, on_result=None):
+    """
+    sources: {이름: 인자 없는 함수}
+    on_result(SourceResult): 각 소스가 끝나는 즉시 호출 (부분 결과 표시용)
+    반환: {이름: SourceResult}
+    """
+    timeouts = {**FANOUT_TIMEOUTS, **(timeouts or {})}
+    tasks = [
+        asyncio.create_task(_run_source(name, fn, timeouts.get(name, DEFAULT_TIMEOUT)))
+        for name, fn in sources.items()
+    ]
+    results = {}
+    for finished in asyncio.as_completed(tasks):
+        result = await finished
+        results[result.name] = result
+        if on_result is not None:
+            on_result(result)
+    return results
+
+
+def run_sources(sources, timeouts=None, on_result=None):
+    """동기 코드(Streamlit 스크립트 등)에서 호출하는 진입점"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(gather_sources(sources, timeouts, on_result))
+    # 이미 이벤트 루프 안이면 별도 스레드의 루프에서 실행
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, gather_sources(sources, timeouts, on_result)).result()
@@ -0,0 +1,88 @@
+"""
+오프라인 개발/벤치마크용 로컬 HTTP 서버 (네이버 선수 기록 페이지 / 뉴스 검색 API 대역)
+
+- /player/index?playerId=...   -> data/fixtures/naver_record/{playerId}.html
+- /v1/search/news.json?query=  -> data/fixtures/naver_news.json (display 개수만큼)
+
+    python src/fixture_server.py --port 8765 --delay 0.05
+    KBO_NAVER_SPORTS_BASE=http://127.0.0.1:8765 KBO_NAVER_OPENAPI_BASE=http://127.0.0.1:8765 \
+        KBO_RECORD_BACKEND=http streamlit run src/chatbot_ui_chat.py
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent / "data" / "fixtures"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    delay = 0.0          # 응답 전 인위적 지연(초)
+    request_count = 0
+    fail_next = 0        # 이 횟수만큼 다음 요청에 500 응답 (재시도 확인용)
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        type(self).request_count += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail_next > 0:
+            type(self).fail_next -= 1
+            return self._send(500, "fixture failure", "text/plain; charset=utf-8")
+
+        parsed = urllib.parse.urlparse(self.path)
+        params = urllib.parse.parse_qs(parsed.query)
+
+        if parsed.path == "/player/index":
+            player_id = params.get("playerId", [""])[0]
+            path = FIXTURE_DIR / "naver_record" / f"{player_id}.html"
+            if player_id.isdigit() and path.exists():
+                return self._send(200, path.read_text(encoding="utf-8"))
+            return self._send(404, "<html><body>선수 정보가 없습니다.</body></html>")
+
+        if parsed.path == "/v1/search/news.json":
+            data = json.loads((FIXTURE_DIR / "naver_news.json").read_text(encoding="utf-8"))
+            display = int(params.get("display", ["10"])[0])
+            data["items"] = data["items"][:display]
+            data["display"] = len(data["items"])
+            return self._send(200, json.dumps(data, ensure_ascii=False), "application/json; charset=utf-8")
+
+        return self._send(404, "not found", "text/plain; charset=utf-8")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(port=0, delay=0.0):
+    """백그라운드 스레드로 서버 실행 후 (server, base_url) 반환. 종료는 server.shutdown()"""
+    handler = type("Handler", (FixtureHandler,), {"delay": delay, "request_count": 0, "fail_next": 0})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="네이버 기록 페이지 로컬 대역 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="응답 지연(초)")
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server(args.port, args.delay)
+    print(f"fixture server: {base_url}  (Ctrl+C 로 종료)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,131 @@
+"""
+자모 단위 퍼지 이름 인덱스 (오타 보정 / "혹시 ○○○ 선수를 찾으셨나요?")
+
+한글 이름을 초성/중성/종성 자모로 분해한 뒤
+1) 자모 bigram 역색인으로 후보를 빠르게 좁히고 (q-gram 필터)
+2) 상한이 있는 편집 거리로 최종 확인한다.
+전체 역대 로스터(수만 명)에서도 질의당 1ms 이내로 동작하도록 설계.
+"""
+import re
+
+from player_index import normalize_number
+
+CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+_HANGUL_WORD = re.compile(r"[가-힣]+")
+
+
+def to_jamo(text) -> str:
+    """'양의지' -> 'ㅇㅑㅇㅇㅢㅈㅣ'"""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(CHO[code // 588])
+            out.append(JUNG[(code % 588) // 28])
+            if code % 28:
+                out.append(JONG[code % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _bigrams(s):
+    s = f"^{s}$"
+    return {s[i:i + 2] for i in range(len(s) - 1)}
+
+
+def bounded_edit_distance(a, b, max_dist):
+    """편집 거리가 max_dist 를 넘으면 max_dist + 1 반환 (조기 종료)"""
+    if abs(len(a) - len(b)) > max_dist:
+        return max_dist + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            row_min = min(row_min, cur[j])
+        if row_min > max_dist:
+            return max_dist + 1
+        prev = cur
+    return prev[-1]
+
+
+def max_distance_for(jamo_len):
+    # 두 글자 이름(자모 4~6개)은 1개, 그보다 길면 2개까지 오타 허용
+    return 1 if jamo_len <= 6 else 2
+
+
+class FuzzyNameIndex:
+    def __init__(self, players):
+        """players: 프로필 dict 목록 (name / team / 등번호 / 포지션)"""
+        self._players = {}      # 이름 -> [선수 정보]
+        self._jamo = []         # 이름 번호 -> 자모열
+        self._names = []
+        self._postings = {}     # 자모 bigram -> 이름 번호 목록
+        for row in players:
+            name = row.get("name")
+            if not isinstance(name, str) or len(name) < 2:
+                continue
+            info = {
+                "name": name,
+                "team": row.get("team") or "",
+                "number": normalize_number(row.get("등번호")),
+                "position": str(row.get("포지션") or "").split("(")[0],
+                "playerId": row.get("playerId"),
+            }
+            if name not in self._players:
+                self._players[name] = []
+                idx = len(self._names)
+                self._names.append(name)
+                jamo = to_jamo(name)
+                self._jamo.append(jamo)
+                for g in _bigrams(jamo):
+                    self._postings.setdefault(g, []).append(idx)
+            self._players[name].append(info)
+
+    def lookup(self, word, limit=5):
+        """단어와 가까운 이름 [(이름, 거리), ...] (거리 오름차순)"""
+        jamo = to_jamo(word)
+        max_dist = max_distance_for(len(jamo))
+        grams = _bigrams(jamo)
+        # 편집 1회는 bigram 을 최대 2개 깨뜨리므로, 공유 bigram 이 이보다 적으면 후보가 아님
+        need = len(grams) - 2 * max_dist
+        counts = {}
+        for g in grams:
+            for idx in self._postings.get(g, ()):
+                counts[idx] = counts.get(idx, 0) + 1
+
+        found = []
+        for idx, shared in counts.items():
+            if shared < need:
+                continue
+            dist = bounded_edit_distance(jamo, self._jamo[idx], max_dist)
+            if dist <= max_dist:
+                found.append((dist, -shared, self._names[idx]))
+        found.sort()
+        return [(name, dist) for dist, _, name in found[:limit]]
+
+    def suggest(self, text, limit=5, skip_words=()):
+        """
+        질문 문장에서 이름일 만한 부분(한글 단어의 앞 2~4글자)을 뽑아 가까운 선수 목록 반환
+        [{"name", "distance", "team", "number", "position", "playerId"}, ...]
+        """
+        best = {}
+        for word in _HANGUL_WORD.findall(text):
+            for n in range(2, min(4, len(word)) + 1):
+                token = word[:n]
+                if token in skip_words:
+                    continue
+                for name, dist in self.lookup(token, limit):
+                    if name not in best or dist < best[name]:
+                        best[name] = dist
+        ranked = sorted(best.items(), key=lambda x: (x[1], x[0]))[:limit]
+        result = []
+        for name, dist in ranked:
+            for info in self._players[name]:
+                result.append({**info, "distance": dist})
+        return result[:limit]
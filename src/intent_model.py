@@ -0,0 +1,155 @@
+"""
+로컬 의도 분류기 (news / profile / stats / position / unknown)
+
+generate_answer 에 하드코딩된 분기 키워드로 학습 문장을 만들어
+문자 n-gram 나이브 베이즈 모델을 학습한다. 네트워크 없이 수십 마이크로초 안에 분류.
+확신도가 낮을 때만 (선택적으로) LLM 분류로 넘긴다.
+
+    python src/intent_model.py            # data/intent_queries.csv 정확도 평가
+"""
+import csv
+import math
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+INTENTS = ("news", "profile", "stats", "position", "unknown")
+
+# generate_answer 분기 키워드 (학습 씨앗)
+INTENT_KEYWORDS = {
+    "news": [
+        "최근 소식", "소식", "뉴스", "기사", "근황", "최근 이슈", "요즘 어때",
+        "요즘 뭐해", "요즘 소식", "최근 근황", "인터뷰", "최근 인터뷰", "요즘 근황", "인스타",
+    ],
+    "stats": [
+        "성적", "기록", "타율", "홈런", "평균자책", "ops", "이닝", "세이브", "홀드",
+        "승", "패", "삼진", "출루율", "타점", "득점", "볼넷", "피홈런", "방어율", "era",
+        "최근 경기", "최근 성적", "최근 기록", "최근 10경기", "성적 요약", "성적 평가",
+        "2025 성적", "시즌 성적", "올해 성적", "시즌 기록", "통산기록",
+    ],
+    "position": [
+        "루수", "포수", "외야수", "내야수", "지명타자", "유격수", "1루", "2루", "3루",
+        "야수", "투수", "타자", "포지션", "역할", "뭐하는", "하는 선수", "수비",
+    ],
+    "profile": [
+        "선수에 대해 알려줘", "선수 알려줘", "알려줘", "누구야", "정보", "소개",
+        "생년월일", "생일", "등번호", "번호", "키", "신장", "몸무게", "체중", "팀", "구단", "소속",
+        "입단년도", "데뷔년도", "연봉", "지명순위", "경력", "학교", "출신학교", "계약금", "프로필",
+    ],
+    "unknown": [
+        "안녕", "고마워", "날씨 어때", "오늘 뭐 먹지", "너는 누구니", "심심해",
+        "야구 규칙 알려줄래", "경기장 가는 법", "주차장 어디", "티켓 예매", "응원가", "치킨 추천",
+    ],
+}
+
+# 키워드를 문장으로 확장하는 템플릿 ({name} 은 학습용 가명으로 치환)
+TEMPLATES = [
+    "{kw}", "{name} {kw}", "{name} 선수 {kw}", "{name} {kw} 알려줘",
+    "{name} {kw} 어때?", "{name} 선수 {kw} 궁금해", "{kw} 좀 알려줘",
+]
+TRAIN_NAMES = ["홍길동", "김철수", "이영희", "박민수", "최지훈", "정우성"]
+
+NGRAM_RANGE = (1, 3)
+_SPACES = re.compile(r"\s+")
+
+
+def _ngrams(text):
+    text = " " + _SPACES.sub(" ", text.lower()).strip() + " "
+    grams = []
+    for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+        grams.extend(text[i:i + n] for i in range(len(text) - n + 1))
+    return grams
+
+
+def build_training_set():
+    examples = []
+    for intent, keywords in INTENT_KEYWORDS.items():
+        for kw in keywords:
+            for i, tpl in enumerate(TEMPLATES):
+                name = TRAIN_NAMES[i % len(TRAIN_NAMES)]
+                examples.append((tpl.format(kw=kw, name=name), intent))
+    return examples
+
+
+class IntentModel:
+    """문자 n-gram 다항 나이브 베이즈"""
+
+    def __init__(self, alpha=0.5):
+        self.alpha = alpha
+        self.log_prior = {}
+        self.log_prob = {}
+        self.log_unseen = {}
+
+    def fit(self, examples):
+        counts = {c: Counter() for c in INTENTS}
+        docs = Counter()
+        for text, intent in examples:
+            counts[intent].update(_ngrams(text))
+            docs[intent] += 1
+
+        vocab = set()
+        for c in counts.values():
+            vocab.update(c)
+        v = len(vocab)
+        total_docs = sum(docs.values())
+
+        for intent in INTENTS:
+            total = sum(counts[intent].values())
+            denom = total + self.alpha * v
+            self.log_prior[intent] = math.log((docs[intent] + 1) / (total_docs + len(INTENTS)))
+            self.log_prob[intent] = {g: math.log((n + self.alpha) / denom) for g, n in counts[intent].items()}
+            self.log_unseen[intent] = math.log(self.alpha / denom)
+        return self
+
+    def predict_proba(self, text):
+        grams = _ngrams(text)
+        scores = {}
+        for intent in INTENTS:
+            table, unseen = self.log_prob[intent], self.log_unseen[intent]
+            scores[intent] = self.log_prior[intent] + sum(table.get(g, unseen) for g in grams)
+        top = max(scores.values())
+        exp = {k: math.exp(s - top) for k, s in scores.items()}
+        z = sum(exp.values())
+        return {k: e / z for k, e in exp.items()}
+
+    def predict(self, text):
+        """(intent, confidence)"""
+        proba = self.predict_proba(text)
+        intent = max(proba, key=proba.get)
+        return intent, proba[intent]
+
+
+_model = None
+
+
+def get_intent_model() -> IntentModel:
+    global _model
+    if _model is None:
+        _model = IntentModel().fit(build_training_set())
+    return _model
+
+
+# === 평가 ===
+LABELED_QUERIES = Path(__file__).resolve().parent.parent / "data" / "intent_queries.csv"
+
+
+def evaluate(path=LABELED_QUERIES, model=None):
+    """라벨링된 질의 세트 정확도 + 틀린 예시 반환"""
+    model = model or get_intent_model()
+    with open(path, encoding="utf-8-sig") as f:
+        rows = list(csv.DictReader(f))
+    wrong = []
+    for row in rows:
+        pred, conf = model.predict(row["query"])
+        if pred != row["intent"]:
+            wrong.append((row["query"], row["intent"], pred, round(conf, 2)))
+    accuracy = 1 - len(wrong) / len(rows) if rows else 0.0
+    return accuracy, wrong
+
+
+if __name__ == "__main__":
+    acc, wrong = evaluate(sys.argv[1] if len(sys.argv) > 1 else LABELED_QUERIES)
+    print(f"accuracy: {acc:.1%}")
+    for q, label, pred, conf in wrong:
+        print(f"  {q!r}: 정답 {label} / 예측 {pred} ({conf})")
@@ -0,0 +1,212 @@
+"""
+리그 순위표 (홈런 1위 / LG 타율 top 5 / 양의지 타율 몇 위 ...)
+
+2025 성적을 로드할 때 한 번만 NumPy 배열로 바꾸고, 지표별 정렬 순서와 순위를 미리 계산해 둔다.
+질문마다 pandas 정렬이나 LLM 호출 없이 배열 인덱싱만으로 답한다.
+- 비율 지표(타율, 출루율, 평균자책 ...)는 규정타석 / 규정이닝을 채운 선수만 순위에 포함
+- 팀 필터는 팀별 정렬 순서를 미리 나눠 두고 그대로 사용
+"""
+import os
+import re
+
+import numpy as np
+
+SEASON_GAMES = int(os.getenv("KBO_LEADER_GAMES", "144"))   # 팀당 경기 수 (규정타석/이닝 기준)
+QUALIFIED_PA = 3.1 * SEASON_GAMES
+QUALIFIED_IP = 1.0 * SEASON_GAMES
+
+
+class Stat:
+    def __init__(self, key, label, pool, keywords, ascending=False, rate=False, fmt="{:.0f}", unit=""):
+        self.key = key
+        self.label = label
+        self.pool = pool            # "batter" / "pitcher"
+        self.keywords = keywords
+        self.ascending = ascending  # 낮을수록 좋은 지표 (평균자책)
+        self.rate = rate            # 규정타석/이닝 적용
+        self.fmt = fmt
+        self.unit = unit
+
+    def format(self, value):
+        return self.fmt.format(value) + self.unit
+
+
+STATS = [
+    Stat("AVG", "타율", "batter", ["타율"], rate=True, fmt="{:.3f}"),
+    Stat("HR", "홈런", "batter", ["홈런"], unit="개"),
+    Stat("RBI", "타점", "batter", ["타점"]),
+    Stat("H", "안타", "batter", ["안타", "최다안타"], unit="개"),
+    Stat("R", "득점", "batter", ["득점"]),
+    Stat("SB", "도루", "batter", ["도루"], unit="개"),
+    Stat("OBP", "출루율", "batter", ["출루율"], rate=True, fmt="{:.3f}"),
+    Stat("SLG", "장타율", "batter", ["장타율"], rate=True, fmt="{:.3f}"),
+    Stat("OPS", "OPS", "batter", ["ops"], rate=True, fmt="{:.3f}"),
+    # 투수 볼넷/탈삼진은 규정이닝 투수 대부분이 비어 있어 WHIP / 탈삼진 순위는 제외
+    Stat("ERA", "평균자책", "pitcher", ["평균자책", "방어율", "era"], ascending=True, rate=True, fmt="{:.2f}"),
+    Stat("W", "다승", "pitcher", ["다승", "승리"], unit="승"),
+    Stat("SV", "세이브", "pitcher", ["세이브"]),
+    Stat("HLD", "홀드", "pitcher", ["홀드"]),
+    Stat("IP", "이닝", "pitcher", ["이닝", "최다이닝"], fmt="{:.1f}"),
+]
+STATS_BY_KEY = {s.key: s for s in STATS}
+
+# 키워드가 겹칠 때(예: 최다안타 ⊃ 안타) 긴 쪽 우선
+_KEYWORDS = sorted(((kw, s) for s in STATS for kw in s.keywords), key=lambda x: -len(x[0]))
+# 투수가 허용한 기록은 순위표 대상이 아님 (피홈런이 홈런으로 잡히지 않도록 제거)
+_EXCLUDE = ("피홈런", "피안타")
+
+RANK_WORDS = ["순위", "랭킹", "몇 위", "몇위", "등수", "top", "탑", "상위", "최다", "최고", "가장", "리더", "선두"]
+_RANK_AT = re.compile(r"(\d{1,2})\s*(?:위|등)")
+_TOP_N = re.compile(r"(?:top|탑|상위)\s*(\d{1,2})|(\d{1,2})\s*명")
+
+
+def _col(stats, name):
+    return stats[name].to_numpy(dtype=float) if name in stats.columns else np.full(len(stats), np.nan)
+
+
+def _sum_nan0(*arrays):
+    return np.sum([np.nan_to_num(a) for a in arrays], axis=0)
+
+
+def plate_appearances(stats):
+    """타석 (기록이 없는 행은 타수 + 볼넷 + 사구 + 희생타로 추정)"""
+    pa = _col(stats, "PA")
+    estimate = _sum_nan0(*(_col(stats, c) for c in ("AB", "BB", "HBP", "SAC", "SF")))
+    return np.where(np.isnan(pa), estimate, pa)
+
+
+def player_pools(stats):
+    """
+    타자 / 투수 행 구분 (bool 배열)
+    투수 행에도 피안타율(AVG) / 피홈런(HR) 이 들어 있으므로 타수(AB) / 이닝(IP) 유무로 나눈다.
+    """
+    return {"batter": ~np.isnan(_col(stats, "AB")), "pitcher": ~np.isnan(_col(stats, "IP"))}
+
+
+def _ranks(sorted_values):
+    """정렬된 값 -> 공동 순위 (1, 2, 2, 4 ...)"""
+    n = len(sorted_values)
+    if n == 0:
+        return np.array([], dtype=int)
+    new_value = np.ones(n, dtype=bool)
+    new_value[1:] = sorted_values[1:] != sorted_values[:-1]
+    first_pos = np.where(new_value, np.arange(n), 0)
+    return np.maximum.accumulate(first_pos) + 1
+
+
+class _Board:
+    """한 지표의 미리 정렬된 순위표 (리그 전체 + 팀별)"""
+
+    def __init__(self, stat, values, eligible, teams):
+        self.stat = stat
+        idx = np.flatnonzero(eligible & ~np.isnan(values))
+        keys = values[idx] if stat.ascending else -values[idx]
+        self.order = idx[np.argsort(keys, kind="stable")]      # 선수 행 번호 (1위부터)
+        self.ranks = _ranks(values[self.order])
+        self.rank_of_row = {int(r): int(k) for r, k in zip(self.order, self.ranks)}
+        self.by_team = {}
+        for team in np.unique(teams[self.order]):
+            pos = np.flatnonzero(teams[self.order] == team)
+            self.by_team[team] = (self.order[pos], _ranks(values[self.order[pos]]))
+
+
+class Leaderboard:
+    def __init__(self, stats, profiles):
+        names = {}
+        profile_teams = {}
+        for pid, name, team in zip(profiles["playerId"], profiles["name"], profiles["team"]):
+            if isinstance(pid, str):
+                names.setdefault(pid, name if isinstance(name, str) else pid)
+                profile_teams.setdefault(pid, team if isinstance(team, str) else "")
+
+        pids = stats["playerId"].astype(str).to_numpy()
+        teams = np.array([
+            t if isinstance(t, str) and t else profile_teams.get(pid, "")
+            for pid, t in zip(pids, stats["팀명"])
+        ], dtype=object)
+
+        pa, ip = plate_appearances(stats), _col(stats, "IP")
+        ops = _col(stats, "OBP") + _col(stats, "SLG")
+
+        self.pids = pids
+        self.names = np.array([names.get(pid, pid) for pid in pids], dtype=object)
+        self.teams = teams
+        self.values = {"PA": pa, "OPS": ops}
+        for s in STATS:
+            if s.key not in self.values:
+                self.values[s.key] = _col(stats, s.key)
+
+        pools = player_pools(stats)
+        qualified = {"batter": pa >= QUALIFIED_PA, "pitcher": np.nan_to_num(ip) >= QUALIFIED_IP}
+        self._row_of = {pid: i for i, pid in enumerate(pids)}
+        self._boards = {}
+        for s in STATS:
+            eligible = pools[s.pool] & (qualified[s.pool] if s.rate else True)
+            self._boards[s.key] = _Board(s, self.values[s.key], eligible, teams)
+
+    def _entries(self, stat_key, rows, ranks):
+        values = self.values[stat_key]
+        return [
+            {"rank": int(k), "playerId": self.pids[r], "name": self.names[r],
+             "team": self.teams[r], "value": float(values[r])}
+            for r, k in zip(rows, ranks)
+        ]
+
+    def _rows(self, stat_key, team):
+        board = self._boards[stat_key]
+        if team:
+            return board.by_team.get(team, (board.order[:0], board.ranks[:0]))
+        return board.order, board.ranks
+
+    def top(self, stat_key, n=5, team=None):
+        rows, ranks = self._rows(stat_key, team)
+        return self._entries(stat_key, rows[:n], ranks[:n])
+
+    def at_rank(self, stat_key, rank, team=None):
+        rows, ranks = self._rows(stat_key, team)
+        pos = np.flatnonzero(ranks == rank)
+        return self._entries(stat_key, rows[pos], ranks[pos])
+
+    def rank_of(self, stat_key, player_id):
+        """(순위, 순위표 인원, 기록) / 순위표에 없으면 (None, 인원, 기록)"""
+        board = self._boards[stat_key]
+        row = self._row_of.get(str(player_id))
+        value = float(self.values[stat_key][row]) if row is not None else float("nan")
+        rank = board.rank_of_row.get(row) if row is not None else None
+        return rank, len(board.order), value
+
+
+def parse_query(text, found_team=None):
+    """
+    순위표 질문이면 {"stat", "mode", "n", "team"} 반환, 아니면 None
+    mode: "top" (상위 n명) / "at" (n위 선수)
+    특정 선수의 순위(양의지 타율 몇 위)는 호출하는 쪽에서 rank_of 로 처리
+    """
+    text = text.lower()
+    if not (any(w in text for w in RANK_WORDS) or _RANK_AT.search(text)):
+        return None
+    for ex in _EXCLUDE:
+        text = text.replace(ex, " ")
+    stat = next((s for kw, s in _KEYWORDS if kw in text), None)
+    if stat is None:
+        return None
+
+    query = {"stat": stat.key, "mode": "top", "n": 5, "team": found_team}
+    m = _TOP_N.search(text)
+    at = _RANK_AT.search(text)
+    if m:
+        query["n"] = max(1, min(int(m.group(1) or m.group(2)), 30))
+    elif at:
+        query.update(mode="at", n=int(at.group(1)))
+    elif any(w in text for w in ("최다", "최고", "가장", "리더", "선두")):
+        query.update(mode="at", n=1)
+    return query
+
+
+def qualification_note(stat_key):
+    stat = STATS_BY_KEY[stat_key]
+    if not stat.rate:
+        return ""
+    if stat.pool == "batter":
+        return f"규정타석 {QUALIFIED_PA:.0f} 이상"
+    return f"규정이닝 {QUALIFIED_IP:.0f} 이상"
@@ -0,0 +1,243 @@
+"""
+OpenAI 응답 캐시
+
+같은 모델 + 같은 프롬프트 틀 + 같은 입력(선수, 성적 요약문, 질문 등 정규화) + 같은 temperature 구간이면
+API 를 다시 부르지 않고 저장된 답변을 재사용한다.
+프롬프트 틀(입력 값을 자리표시자로 바꾼 프롬프트)의 해시도 키에 넣으므로 프롬프트 문구를 고치면 이전 답변은 쓰지 않는다.
+- TTL / 최대 개수(LRU) 제한
+- KBO_LLM_CACHE_PATH 를 지정하면 디스크(JSON)에 저장해 재시작 후에도 유지
+  저장은 put 마다 하지 않고 KBO_LLM_CACHE_SAVE_DELAY 초 동안 모아 백그라운드에서 한 번 (종료 시 flush)
+  파일 쓰기는 캐시 락 밖에서 하므로 저장 중에도 get / put 이 막히지 않음
+- hits / misses / 절약한 토큰 수 집계
+"""
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from tracing import record, span
+
+LLM_CACHE_TTL = float(os.getenv("KBO_LLM_CACHE_TTL", "3600"))
+LLM_CACHE_SIZE = int(os.getenv("KBO_LLM_CACHE_SIZE", "2000"))
+LLM_CACHE_PATH = os.getenv("KBO_LLM_CACHE_PATH", "")
+LLM_CACHE_SAVE_DELAY = float(os.getenv("KBO_LLM_CACHE_SAVE_DELAY", "2"))
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_text(x) -> str:
+    """공백 정리 + 소문자 (키 비교용)"""
+    return _SPACES.sub(" ", str(x)).strip().lower()
+
+
+def temperature_bucket(temperature) -> str:
+    # 0 은 결정적 응답이므로 따로 두고, 나머지는 0.1 단위로 묶음
+    if not temperature:
+        return "0"
+    return f"{round(float(temperature), 1):.1f}"
+
+
+def prompt_template(prompt, inputs) -> str:
+    """프롬프트에서 입력 값을 {이름} 자리표시자로 바꾼 틀 (긴 값부터 바꿔 겹치는 값이 서로 깨지지 않게)"""
+    values = inputs.items() if isinstance(inputs, dict) else [("input", inputs)]
+    for name, value in sorted(values, key=lambda kv: -len(str(kv[1]))):
+        if str(value):
+            prompt = prompt.replace(str(value), "{" + name + "}")
+    return prompt
+
+
+def make_cache_key(model, inputs, temperature, max_tokens, template=None) -> str:
+    """template: 프롬프트 틀 (cache_inputs 를 쓸 때 프롬프트 문구가 바뀌면 키도 바뀌도록)"""
+    if isinstance(inputs, dict):
+        norm = {k: normalize_text(v) for k, v in sorted(inputs.items())}
+    else:
+        norm = normalize_text(inputs)
+    parts = [model, norm, temperature_bucket(temperature), max_tokens]
+    if template is not None:
+        parts.append(hashlib.sha1(normalize_text(template).encode("utf-8")).hexdigest())
+    raw = json.dumps(parts, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def completion_key(prompt, model, temperature, max_tokens, cache_inputs=None) -> str:
+    """cache_inputs 가 없으면 프롬프트 전체(정규화), 있으면 입력 + 프롬프트 틀 해시를 키로 사용"""
+    if cache_inputs is None:
+        return make_cache_key(model, prompt, temperature, max_tokens)
+    return make_cache_key(model, cache_inputs, temperature, max_tokens,
+                          template=prompt_template(prompt, cache_inputs))
+
+
+class LLMCache:
+    def __init__(self, ttl=LLM_CACHE_TTL, max_size=LLM_CACHE_SIZE, path=LLM_CACHE_PATH,
+                 save_delay=LLM_CACHE_SAVE_DELAY):
+        self.ttl = ttl
+        self.max_size = max(1, max_size)
+        self.path = Path(path) if path else None
+        self.save_delay = save_delay
+        self._data = OrderedDict()     # key -> (text, saved_at, tokens)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()     # 파일 쓰기 순서 보장 (캐시 락과 별개)
+        self._dirty = False
+        self._save_timer = None
+        self.stats = {"hits": 0, "misses": 0, "tokens_saved": 0, "saves": 0}
+        if self.path and self.path.exists():
+            self._load()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and time.time() - item[1] < self.ttl:
+                self._data.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["tokens_saved"] += item[2]
+                return item[0]
+            if item is not None:
+                del self._data[key]
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key, text, tokens=0):
+        with self._lock:
+            self._data[key] = (text, time.time(), tokens)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+            self._mark_dirty()
+
+    def hit_ratio(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._mark_dirty()
+        self.flush()
+
+    # === 디스크 저장 ===
+    def _load(self):
+        try:
+            items = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(items, list):
+            return
+        now = time.time()
+        for item in items:
+            # 형식이 다른 항목(개수 / 타입)은 건너뜀
+            try:
+                key, text, saved_at, tokens = item
+                saved_at, tokens = float(saved_at), int(tokens or 0)
+            except (TypeError, ValueError):
+                continue
+            if isinstance(key, str) and isinstance(text, str) and now - saved_at < self.ttl:
+                self._data[key] = (text, saved_at, tokens)
+
+    def _mark_dirty(self):
+        # self._lock 을 잡은 상태에서 호출. 예약된 저장이 없을 때만 타이머를 하나 띄움
+        if not self.path:
+            return
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.save_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """바뀐 내용이 있으면 지금 디스크에 저장 (목록 복사만 락 안에서, 직렬화 / 쓰기는 락 밖에서)"""
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                timer, self._save_timer = self._save_timer, None
+                if not self._dirty:
+                    return
+                self._dirty = False
+                items = [[k, t, s, n] for k, (t, s, n) in self._data.items()]
+            if timer is not None:
+                timer.cancel()
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(items, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self.stats["saves"] += 1
+
+
+def cached_completion(client, cache, prompt, model="gpt-4o-mini", temperature=0.8,
+                      max_tokens=200, cache_inputs=None) -> str:
+    """
+    chat.completions.create 를 캐시를 거쳐 호출하고 답변 문자열을 반환
+    cache_inputs 가 없으면 프롬프트 전체(정규화)를, 있으면 입력 + 프롬프트 틀을 키로 사용
+    """
+    key = completion_key(prompt, model, temperature, max_tokens, cache_inputs)
+    with span("llm.completion", model=model) as attrs:
+        text = cache.get(key)
+        if text is not None:
+            attrs["cache"] = "hit"
+            return text
+
+        attrs["cache"] = "miss"
+        response = client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        text = response.choices[0].message.content.strip()
+        usage = getattr(response, "usage", None)
+        cache.put(key, text, getattr(usage, "total_tokens", 0) or 0)
+        return text
+
+
+def stream_completion(client, cache, prompt, model="gpt-4o-mini", temperature=0.8,
+                      max_tokens=200, cache_inputs=None):
+    """
+    cached_completion 의 스트리밍 버전 (응답 조각을 yield)
+    캐시에 있으면 저장된 답변을 한 번에 내보내고, 없으면 받은 조각을 모아 끝난 뒤 캐시에 저장
+    """
+    key = completion_key(prompt, model, temperature, max_tokens, cache_inputs)
+    text = cache.get(key)
+    if text is not None:
+        yield text
+        return
+
+    # 제너레이터는 with span 으로 감싸면 소비하는 쪽 컨텍스트와 엇갈리므로 끝난 뒤 구간만 기록
+    start = time.perf_counter()
+    first = None
+    stream = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True
+    )
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            if first is None:
+                first = time.perf_counter() - start
+            parts.append(delta)
+            yield delta
+    cache.put(key, "".join(parts).strip())
+    record("llm.stream", start, time.perf_counter() - start, model=model, cache="miss",
+           ttft=round(first, 3) if first is not None else None)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+            atexit.register(_cache.flush)
+        return _cache
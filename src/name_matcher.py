@@ -0,0 +1,80 @@
+"""
+선수 이름 다중 패턴 매칭 (Aho–Corasick 오토마톤)
+
+시작 시 전체 선수 이름으로 한 번만 오토마톤을 만들고,
+질문 문자열을 한 번 훑어서 등장하는 모든 이름을 찾는다.
+로스터 크기와 무관하게 입력 길이에 비례하는 시간으로 동작.
+"""
+from collections import deque
+
+
+class NameMatcher:
+    def __init__(self, names, min_len=2):
+        self.min_len = min_len
+        self._goto = [{}]        # 상태별 다음 글자 -> 상태
+        self._fail = [0]
+        self._out = [()]         # 상태에서 끝나는 이름들
+        self.names = set()
+        for name in names:
+            self._add(name)
+        self._build()
+
+    def _add(self, name):
+        if not isinstance(name, str):
+            return
+        name = name.strip()
+        if len(name) < self.min_len or name in self.names:
+            return
+        self.names.add(name)
+        state = 0
+        for ch in name:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = self._out[state] + (name,)
+
+    def _build(self):
+        # BFS 로 실패 링크 연결, 실패 상태의 출력도 합쳐 둠
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text):
+        """[(start, end, name), ...] 등장 순서대로 (겹치는 매칭 포함)"""
+        matches = []
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for name in out[state]:
+                matches.append((i + 1 - len(name), i + 1, name))
+        matches.sort()
+        return matches
+
+    def candidates(self, text):
+        """등장한 이름 목록 (긴 이름 우선, 같은 길이면 앞쪽 우선, 중복 제거)"""
+        seen = []
+        for start, end, name in sorted(self.find_all(text), key=lambda m: (-(m[1] - m[0]), m[0])):
+            if name not in seen:
+                seen.append(name)
+        return seen
+
+    def longest(self, text):
+        """가장 긴 매칭 이름 하나 (없으면 None)"""
+        found = self.candidates(text)
+        return found[0] if found else None
@@ -0,0 +1,221 @@
+"""
+네이버 뉴스 검색 API 클라이언트
+
+- requests 세션 재사용 (keep-alive 커넥션 풀) + 요청 제한 시간
+- 429 / 5xx / 연결 오류는 지수 백오프로 재시도 (재시도도 요청마다 토큰을 하나씩 사용)
+- 검색어별 TTL 캐시 + stale-while-revalidate
+  (TTL 이 지난 뒤 일정 시간까지는 이전 결과를 바로 돌려주고 뒤에서 새로 받아 둠)
+  캐시는 검색어 KBO_NEWS_CACHE_SIZE 개까지 (LRU 제거)
+- 토큰 버킷 속도 제한 + 일일 호출 한도 (한도 초과 시 캐시 결과만 사용)
+"""
+import os
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tracing import span
+
+NAVER_OPENAPI_BASE = os.getenv("KBO_NAVER_OPENAPI_BASE", "https://openapi.naver.com").rstrip("/")
+NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID", "pMjEOOg4fs1CEoYxx5cE")
+NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET", "WUPjhqdWHe")
+
+NEWS_TIMEOUT = float(os.getenv("KBO_NEWS_TIMEOUT", "3"))
+NEWS_RETRIES = int(os.getenv("KBO_NEWS_RETRIES", "2"))
+NEWS_CACHE_TTL = float(os.getenv("KBO_NEWS_CACHE_TTL", "300"))
+NEWS_STALE_TTL = float(os.getenv("KBO_NEWS_STALE_TTL", "1800"))
+NEWS_RATE = float(os.getenv("KBO_NEWS_RATE", "10"))                   # 초당 요청 수
+NEWS_DAILY_QUOTA = int(os.getenv("KBO_NEWS_DAILY_QUOTA", "25000"))
+NEWS_CACHE_SIZE = int(os.getenv("KBO_NEWS_CACHE_SIZE", "512"))        # 검색어 수
+RETRY_STATUS = (429, 500, 502, 503, 504)
+RETRY_BACKOFF = 0.3     # 초, 재시도마다 두 배
+
+
+class RateLimiter:
+    """토큰 버킷 (초당 rate 개, 최대 burst 개까지 몰아서 사용) + 일일 한도"""
+
+    def __init__(self, rate=NEWS_RATE, burst=None, daily_quota=NEWS_DAILY_QUOTA):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.daily_quota = daily_quota
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._day = time.strftime("%Y-%m-%d")
+        self.used_today = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=1.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                today = time.strftime("%Y-%m-%d")
+                if today != self._day:
+                    self._day, self.used_today = today, 0
+                if self.used_today >= self.daily_quota:
+                    return False
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.used_today += 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class NewsClient:
+    def __init__(self, base_url=NAVER_OPENAPI_BASE, client_id=NAVER_CLIENT_ID,
+                 client_secret=NAVER_CLIENT_SECRET, timeout=NEWS_TIMEOUT, retries=NEWS_RETRIES,
+                 cache_ttl=NEWS_CACHE_TTL, stale_ttl=NEWS_STALE_TTL, rate_limiter=None,
+                 max_size=NEWS_CACHE_SIZE, retry_backoff=RETRY_BACKOFF):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.cache_ttl = cache_ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max(1, max_size)
+        self.rate_limiter = rate_limiter or RateLimiter()
+
+        # 재시도는 _request 에서 직접 (어댑터가 재시도하면 속도 제한 토큰 없이 요청이 나감)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(max_retries=0, pool_connections=4, pool_maxsize=10)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "X-Naver-Client-Id": client_id,
+            "X-Naver-Client-Secret": client_secret,
+        })
+
+        self._cache = OrderedDict()     # (query, display) -> (items, fetched_at), LRU 순서
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "requests": 0, "retries": 0,
+                      "errors": 0, "throttled": 0, "evictions": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    # === API 호출 ===
+    def _get(self, url):
+        """토큰을 받아 한 번 요청. 재시도할 만한 실패면 None, 속도 제한에 걸리면 False"""
+        if not self.rate_limiter.acquire():
+            self._count("throttled")
+            return False
+        self._count("requests")
+        try:
+            res = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException:
+            return None
+        return None if res.status_code in RETRY_STATUS else res
+
+    def _request(self, query, display):
+        url = (f"{self.base_url}/v1/search/news.json"
+               f"?query={urllib.parse.quote(query)}&display={display}&sort=date")
+        res = self._get(url)
+        for attempt in range(self.retries):
+            if res is not None:
+                break
+            time.sleep(self.retry_backoff * (2 ** attempt))
+            self._count("retries")
+            res = self._get(url)
+        if res is False:
+            return None
+        if res is None or res.status_code != 200:
+            self._count("errors")
+            return None
+
+        try:
+            data = res.json().get("items", [])
+        except ValueError:
+            self._count("errors")
+            return None
+
+        news_list = []
+        for d in data:
+            news_list.append({
+                "title": d.get("title", "").replace("<b>", "").replace("</b>", ""),
+                "link": d.get("link", "")
+            })
+        return news_list
+
+    def _fetch_and_store(self, key):
+        items = self._request(*key)
+        if items is not None:
+            with self._lock:
+                self._cache[key] = (items, time.time())
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+                    self.stats["evictions"] += 1
+        return items
+
+    def _refresh_in_background(self, key):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self._fetch_and_store(key)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    # === 검색 ===
+    def search(self, query, display=3):
+        with span("news.search") as attrs:
+            return self._search(query, display, attrs)
+
+    def _search(self, query, display, attrs):
+        key = (query, display)
+        with self._lock:
+            cached = self._cache.get(key)
+            age = time.time() - cached[1] if cached else None
+            if cached:
+                self._cache.move_to_end(key)
+            if cached and age < self.cache_ttl:
+                state = "hit"
+                self.stats["hits"] += 1
+            elif cached and age < self.cache_ttl + self.stale_ttl:
+                state = "stale"
+                self.stats["stale_hits"] += 1
+            else:
+                state = "miss"
+                self.stats["misses"] += 1
+        attrs["cache"] = state
+
+        if state == "hit":
+            return cached[0]
+        if state == "stale":
+            # 오래된 결과를 바로 주고, 새 결과는 뒤에서 받아 둠
+            self._refresh_in_background(key)
+            return cached[0]
+
+        items = self._fetch_and_store(key)
+        if items is None:
+            # 실패 / 한도 초과 → 아주 오래된 캐시라도 있으면 사용
+            return cached[0] if cached else []
+        return items
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_news_client() -> NewsClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = NewsClient()
+        return _client
@@ -0,0 +1,163 @@
+"""
+선수 데이터 SQLite 조회 계층 (PlayerIndex 대체 백엔드, KBO_PLAYER_BACKEND=sqlite)
+
+CSV 3종(프로필 / 2025 성적 / 구단 인스타그램)을 타입이 정해진 SQLite 파일 하나로 만들고
+playerId / 이름 / (팀, 등번호) / 시즌 인덱스로 조회한다.
+- 조회 함수마다 SQL 문이 고정되어 있어 연결별 statement 캐시로 한 번만 컴파일 (prepared statement)
+- 파일은 읽기 전용(mode=ro)으로 열어 여러 워커 프로세스(uvicorn --workers 등)가 같은 파일을 공유
+  (행 데이터는 프로세스마다 dict 로 복사하지 않고 OS 페이지 캐시를 같이 씀)
+- 원본 CSV 의 크기/mtime 을 meta 테이블에 기록해 두고, 원본이 바뀌면 임시 파일에 다시 만든 뒤 교체
+
+    python src/player_db.py          # data/players.sqlite3 생성
+"""
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from player_index import normalize_number
+from tracing import span
+
+PLAYER_DB = Path(os.getenv(
+    "KBO_PLAYER_DB", Path(__file__).resolve().parent.parent / "data" / "players.sqlite3"
+))
+SCHEMA_VERSION = 2       # 2: 프로필 파싱 컬럼 추가, team_instagram 은 팀당 한 행
+
+INDEXES = [
+    "CREATE INDEX idx_profiles_pid ON profiles (playerId)",
+    "CREATE INDEX idx_profiles_name ON profiles (name)",
+    "CREATE INDEX idx_profiles_team_number ON profiles (team, number)",
+    "CREATE INDEX idx_stats_pid ON stats (playerId)",
+    "CREATE INDEX idx_stats_season ON stats (season, playerId)",
+    "CREATE INDEX idx_instagram_team ON team_instagram (team)",
+]
+
+# 조회 함수별 고정 SQL (row_order = CSV 행 순서, 동명이인 / 같은 팀 선수 순서 유지)
+SQL_BY_TEAM_NUMBER = "SELECT * FROM profiles WHERE team = ? AND number = ? ORDER BY row_order"
+SQL_BY_NAME = "SELECT * FROM profiles WHERE name = ? ORDER BY row_order"
+SQL_PROFILE = "SELECT * FROM profiles WHERE playerId = ? ORDER BY row_order LIMIT 1"
+SQL_STATS_ROW = "SELECT * FROM stats WHERE playerId = ? ORDER BY row_order LIMIT 1"
+SQL_TEAM_PLAYERS = "SELECT * FROM profiles WHERE team = ? ORDER BY row_order"
+SQL_INSTAGRAM = "SELECT instagram FROM team_instagram WHERE team = ? AND instagram IS NOT NULL ORDER BY row_order LIMIT 1"
+SQL_TEAMS = "SELECT team FROM team_instagram WHERE team IS NOT NULL AND instagram IS NOT NULL GROUP BY team ORDER BY MIN(row_order)"
+
+# 조회 결과에서 빼는 내부 컬럼
+_INTERNAL = ("row_order", "number")
+
+
+def _source_meta(sources):
+    meta = {}
+    for key, path in sources.items():
+        st = os.stat(path)
+        meta[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    return {"schema": SCHEMA_VERSION, "sources": meta}
+
+
+def _with_order(df):
+    df = df.copy()
+    df.insert(0, "row_order", range(len(df)))
+    return df
+
+
+def build_player_db(frames, sources, path=PLAYER_DB):
+    """frames(DataFrame 3종)로 SQLite 파일 생성. 임시 파일에 만든 뒤 교체하므로 읽는 쪽은 이전 파일을 계속 사용"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    if tmp.exists():
+        tmp.unlink()
+
+    profiles = _with_order(frames["profiles"])
+    profiles["number"] = [normalize_number(x) for x in profiles["등번호"]]
+    conn = sqlite3.connect(tmp)
+    try:
+        # 성적 수치 컬럼은 float -> REAL, 나머지는 TEXT
+        profiles.to_sql("profiles", conn, index=False)
+        _with_order(frames["stats"]).to_sql("stats", conn, index=False)
+        _with_order(frames["team_instagram"]).to_sql("team_instagram", conn, index=False)
+        for sql in INDEXES:
+            conn.execute(sql)
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("INSERT INTO meta VALUES ('manifest', ?)", (json.dumps(_source_meta(sources)),))
+        conn.commit()
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, path)
+    return path
+
+
+def player_db_is_current(sources, path=PLAYER_DB):
+    """파일이 있고 원본 CSV 와 일치하면 True"""
+    if not Path(path).exists():
+        return False
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'manifest'").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+    return row is not None and json.loads(row[0]) == _source_meta(sources)
+
+
+class SqlitePlayerIndex:
+    """PlayerIndex 와 같은 조회 함수를 SQLite 파일로 제공 (연결은 스레드마다, 읽기 전용)"""
+
+    def __init__(self, path=PLAYER_DB):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _all(self, sql, params):
+        with span("player_db.query"):
+            rows = self._conn().execute(sql, params).fetchall()
+        return [{k: r[k] for k in r.keys() if k not in _INTERNAL} for r in rows]
+
+    def _one(self, sql, params):
+        rows = self._all(sql, params)
+        return rows[0] if rows else None
+
+    def by_team_number(self, team, number):
+        return self._all(SQL_BY_TEAM_NUMBER, (team, normalize_number(number)))
+
+    def by_name(self, name):
+        return self._all(SQL_BY_NAME, (name,))
+
+    def profile(self, player_id):
+        return self._one(SQL_PROFILE, (str(player_id),))
+
+    def stats_row(self, player_id):
+        return self._one(SQL_STATS_ROW, (str(player_id),))
+
+    def team_players(self, team):
+        return self._all(SQL_TEAM_PLAYERS, (team,))
+
+    def instagram(self, team):
+        row = self._conn().execute(SQL_INSTAGRAM, (team,)).fetchone()
+        return row[0] if row else ""
+
+    def teams(self):
+        return [r[0] for r in self._conn().execute(SQL_TEAMS).fetchall()]
+
+
+if __name__ == "__main__":
+    import time
+    from data_store import SNAPSHOT_SOURCES, read_csv_frames
+
+    start = time.perf_counter()
+    build_player_db(read_csv_frames(SNAPSHOT_SOURCES), SNAPSHOT_SOURCES)
+    print(f"player db: {PLAYER_DB} ({(time.perf_counter() - start) * 1000:.0f}ms)")
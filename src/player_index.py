@@ -0,0 +1,72 @@
+"""
+선수 데이터 조회용 해시 인덱스 (로드 시 1회 생성)
+
+DataFrame 전체를 boolean mask 로 훑지 않고 dict 로 바로 찾는다.
+- (팀, 등번호) -> 선수 목록
+- playerId   -> 프로필 / 2025 성적 행
+- 이름       -> 선수 목록 (동명이인 포함, CSV 순서 유지)
+- 팀         -> 선수 목록 / 구단 인스타그램
+"""
+
+
+def normalize_number(x) -> str:
+    """'No. 6' / '6.0' / ' 6 ' -> '6'"""
+    if x is None or x != x:     # None / NaN
+        return ""
+    s = str(x).strip()
+    if s[:3].lower() == "no.":
+        s = s[3:].strip()
+    if s.endswith(".0"):
+        s = s[:-2]
+    return s
+
+
+class PlayerIndex:
+    def __init__(self, profiles, stats, team_instagram):
+        self._by_team_number = {}
+        self._by_pid = {}
+        self._by_name = {}
+        self._by_team = {}
+        self._stats_by_pid = {}
+        self._instagram = {}
+
+        for row in profiles.to_dict("records"):
+            team = row.get("team")
+            pid = row.get("playerId")
+            name = row.get("name")
+            self._by_team_number.setdefault((team, normalize_number(row.get("등번호"))), []).append(row)
+            self._by_team.setdefault(team, []).append(row)
+            if isinstance(name, str):
+                self._by_name.setdefault(name, []).append(row)
+            if isinstance(pid, str):
+                self._by_pid.setdefault(pid, row)
+
+        for row in stats.to_dict("records"):
+            pid = row.get("playerId")
+            if isinstance(pid, str):
+                self._stats_by_pid.setdefault(pid, row)
+
+        for team, url in zip(team_instagram["team"], team_instagram["instagram"]):
+            if isinstance(team, str) and isinstance(url, str):
+                self._instagram.setdefault(team, url)
+
+    def by_team_number(self, team, number):
+        return self._by_team_number.get((team, normalize_number(number)), [])
+
+    def by_name(self, name):
+        return self._by_name.get(name, [])
+
+    def profile(self, player_id):
+        return self._by_pid.get(str(player_id))
+
+    def stats_row(self, player_id):
+        return self._stats_by_pid.get(str(player_id))
+
+    def team_players(self, team):
+        return self._by_team.get(team, [])
+
+    def instagram(self, team):
+        return self._instagram.get(team, "")
+
+    def teams(self):
+        return list(self._instagram)
@@ -0,0 +1,273 @@
+"""
+오늘 경기 출전 선수 미리 가져오기 (백그라운드 스케줄러)
+
+경기 중에는 질문이 그라운드 위 선발 18명에게 몰리므로, 첫 질문이 페이지 크롤링을 기다리지 않도록
+경기 시작 전에 기록 스냅샷 + AI 성적 요약을 캐시에 넣어 두고 경기 중에는 주기적으로 다시 크롤링한다.
+- 대상: playerId 목록(선발 라인업, 우선순위 높음) / 팀 이름(로스터 전체, 우선순위 낮음)
+- 경기 시작 KBO_PREFETCH_LEAD 초 전부터 로드, 이후 KBO_PREFETCH_INTERVAL 초마다 갱신,
+  경기 시작 후 KBO_PREFETCH_GAME_HOURS 시간이 지나면 갱신 중단
+- 작업자 KBO_PREFETCH_WORKERS 개 (동시 크롤링 수 제한), 같은 시각이면 우선순위가 높은 선수부터
+- 질문이 prefetch 로 넣은 기록을 처음 읽은 횟수(prefetch_saved)와 기록 캐시 적중률을 함께 집계
+
+    python src/prefetch.py --players 69100 77263 --teams LG 두산 --first-pitch 18:30
+    curl -X POST localhost:8000/v1/prefetch -d '{"teams": ["LG", "두산"], "first_pitch": "18:30"}'
+
+CLI 로 실행하면 그 프로세스의 캐시가 아니라 로컬 기록 저장소(record_store)와
+디스크 응답 캐시(KBO_LLM_CACHE_PATH)를 채우는 용도이고, 앱 / API 프로세스 안에서는 /v1/prefetch 를 쓴다.
+"""
+import argparse
+import heapq
+import itertools
+import os
+import threading
+import time
+from datetime import datetime
+
+from record_snapshot import get_snapshot_cache
+from tracing import span
+
+PREFETCH_WORKERS = int(os.getenv("KBO_PREFETCH_WORKERS", "4"))              # 동시에 크롤링할 선수 수
+PREFETCH_INTERVAL = float(os.getenv("KBO_PREFETCH_INTERVAL", "300"))        # 초, 경기 중 갱신 주기
+PREFETCH_LEAD = float(os.getenv("KBO_PREFETCH_LEAD", "1800"))               # 초, 경기 시작 몇 초 전부터 로드
+PREFETCH_GAME_HOURS = float(os.getenv("KBO_PREFETCH_GAME_HOURS", "4"))      # 경기 시작 후 갱신을 유지할 시간
+PREFETCH_SUMMARY = os.getenv("KBO_PREFETCH_SUMMARY", "1") == "1"            # AI 성적 요약도 미리 생성
+
+# 우선순위 (작을수록 먼저)
+PRIORITY_LINEUP = 0
+PRIORITY_ROSTER = 1
+
+
+def parse_first_pitch(value, now=None):
+    """'18:30' (오늘) / epoch 초 / None(지금) -> epoch 초"""
+    now = time.time() if now is None else now
+    if value is None or value == "":
+        return now
+    if isinstance(value, (int, float)):
+        return float(value)
+    hour, minute = (int(x) for x in str(value).strip().split(":"))
+    day = datetime.fromtimestamp(now)
+    return day.replace(hour=hour, minute=minute, second=0, microsecond=0).timestamp()
+
+
+def team_roster(team):
+    """팀 이름 -> playerId 목록 (데이터 저장소의 선수 조회 인덱스)"""
+    from data_store import get_data_store
+    return [p.get("playerId") for p in get_data_store().player_index.team_players(team) if p.get("playerId")]
+
+
+def _engine_warm(player_id, refresh):
+    # chatbot_engine 은 OpenAI 클라이언트 / 데이터 저장소를 만들므로 처음 쓸 때 import
+    import chatbot_engine
+    return chatbot_engine.warm_player(player_id, refresh=refresh, summary=PREFETCH_SUMMARY)
+
+
+class PrefetchScheduler:
+    """
+    선수별 미리 가져오기 작업을 시각(due) 순 타이머 힙 + 우선순위 준비 힙으로 관리
+    warm(player_id, refresh) 는 기록 / 요약을 캐시에 넣는 함수 (처음엔 refresh=False, 갱신 때 True)
+    """
+
+    def __init__(self, warm=_engine_warm, workers=PREFETCH_WORKERS, interval=PREFETCH_INTERVAL,
+                 lead=PREFETCH_LEAD, game_hours=PREFETCH_GAME_HOURS, roster=team_roster, cache=None):
+        self.warm = warm
+        self.workers = max(1, workers)
+        self.interval = interval
+        self.lead = lead
+        self.game_hours = game_hours
+        self.roster = roster
+        self.cache = cache
+        self._timers = []       # (due, seq, player_id) - 아직 시각이 안 된 작업
+        self._ready = []        # (priority, seq, player_id) - 바로 실행할 작업
+        self._jobs = {}         # player_id -> {"priority", "until", "seq", "runs", "running"}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._threads = []
+        self._stopped = False
+        self.stats = {"scheduled": 0, "runs": 0, "refreshes": 0, "summaries": 0, "failed": 0}
+
+    # --- 등록 ---
+    def schedule(self, player_ids=(), teams=(), first_pitch=None, until=None):
+        """
+        player_ids(선발 라인업) / teams(로스터 전체)를 등록. 이미 등록된 선수는 우선순위 / 종료 시각만 갱신
+        반환: 등록된 선수 수
+        """
+        start = parse_first_pitch(first_pitch)
+        due = max(time.time(), start - self.lead)
+        until = parse_first_pitch(until) if until is not None else start + self.game_hours * 3600
+        targets = [(str(pid), PRIORITY_LINEUP) for pid in player_ids]
+        for team in teams:
+            targets += [(str(pid), PRIORITY_ROSTER) for pid in self.roster(team)]
+
+        with self._cond:
+            for pid, priority in targets:
+                job = self._jobs.get(pid)
+                if job is None:
+                    job = self._jobs[pid] = {"priority": priority, "until": until, "seq": None,
+                                             "runs": 0, "running": False}
+                    self.stats["scheduled"] += 1
+                else:
+                    job["priority"] = min(job["priority"], priority)
+                    job["until"] = max(job["until"], until)
+                    if job["running"] or job["runs"]:
+                        continue    # 실행 중이거나 갱신 주기로 이미 다시 등록됨
+                self._push(pid, job, due)
+            self._cond.notify_all()
+        self.start()
+        return len({pid for pid, _ in targets})
+
+    def _push(self, pid, job, due):
+        # 이전에 넣은 항목은 seq 가 달라져 꺼낼 때 버려짐
+        job["seq"] = seq = next(self._seq)
+        heapq.heappush(self._timers, (due, seq, pid))
+
+    # --- 실행 ---
+    def start(self):
+        with self._cond:
+            self._stopped = False
+            alive = [t for t in self._threads if t.is_alive()]
+            for i in range(len(alive), self.workers):
+                t = threading.Thread(target=self._work, name=f"kbo-prefetch-{i}", daemon=True)
+                t.start()
+                alive.append(t)
+            self._threads = alive
+
+    def stop(self, wait=True):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if wait:
+            for t in self._threads:
+                t.join()
+
+    def _next(self):
+        """실행할 (player_id, job) 하나를 꺼냄. stop() 이면 None"""
+        with self._cond:
+            while not self._stopped:
+                now = time.time()
+                while self._timers and self._timers[0][0] <= now:
+                    _, seq, pid = heapq.heappop(self._timers)
+                    job = self._jobs.get(pid)
+                    if job is not None and job["seq"] == seq:
+                        heapq.heappush(self._ready, (job["priority"], seq, pid))
+                while self._ready:
+                    _, seq, pid = heapq.heappop(self._ready)
+                    job = self._jobs.get(pid)
+                    if job is not None and job["seq"] == seq and not job["running"]:
+                        job["running"] = True
+                        return pid, job
+                timeout = self._timers[0][0] - now if self._timers else None
+                self._cond.wait(timeout)
+            return None
+
+    def _work(self):
+        while True:
+            item = self._next()
+            if item is None:
+                return
+            pid, job = item
+            refresh = job["runs"] > 0
+            with span("prefetch.run", player_id=pid, refresh=refresh) as attrs:
+                try:
+                    summarized = self.warm(pid, refresh)
+                except Exception as e:
+                    summarized = False
+                    attrs["error"] = type(e).__name__
+                    failed = True
+                else:
+                    failed = False
+            with self._cond:
+                job["running"] = False
+                job["runs"] += 1
+                self.stats["runs"] += 1
+                self.stats["refreshes"] += int(refresh)
+                self.stats["summaries"] += int(bool(summarized))
+                self.stats["failed"] += int(failed)
+                due = time.time() + self.interval
+                if due <= job["until"]:
+                    self._push(pid, job, due)
+                    self._cond.notify()
+                else:
+                    del self._jobs[pid]
+
+    # --- 현황 ---
+    def summary(self):
+        """실행 수 / 대기 작업 / 기록 캐시 적중률 / prefetch 가 아낀 크롤링 수"""
+        cache = self.cache or get_snapshot_cache()
+        with self._cond:
+            out = {
+                **self.stats,
+                "players": len(self._jobs),
+                "running": sum(job["running"] for job in self._jobs.values()),
+                "next_due_s": round(max(0.0, self._timers[0][0] - time.time()), 1) if self._timers else None,
+            }
+        prefetched = cache.stats["prefetched"]
+        out["record_cache_hit_ratio"] = cache.hit_ratio()
+        out["prefetched"] = prefetched
+        out["prefetch_saved"] = cache.stats["prefetch_saved"]
+        # prefetch 로 넣은 기록 중 실제로 질문이 읽은 비율
+        out["prefetch_used_ratio"] = round(cache.stats["prefetch_saved"] / prefetched, 3) if prefetched else 0.0
+        return out
+
+
+# === 프로세스 전역 스케줄러 ===
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_prefetch_scheduler() -> PrefetchScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PrefetchScheduler()
+        return _scheduler
+
+
+def set_prefetch_scheduler(scheduler):
+    """테스트 / 벤치마크용 교체 (None 이면 다음 호출 때 새로 생성)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None and _scheduler is not scheduler:
+            _scheduler.stop(wait=False)
+        _scheduler = scheduler
+
+
+def prefetch_stats():
+    """스케줄러를 쓰지 않았으면 None"""
+    return _scheduler.summary() if _scheduler is not None else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오늘 경기 출전 선수 기록 / AI 요약 미리 가져오기")
+    parser.add_argument("--players", nargs="*", default=[], help="선발 라인업 playerId (먼저 로드)")
+    parser.add_argument("--teams", nargs="*", default=[], help="오늘 경기하는 팀 (로스터 전체)")
+    parser.add_argument("--first-pitch", default=None, help="경기 시작 시각 HH:MM (기본: 지금)")
+    parser.add_argument("--until", default=None, help="갱신 종료 시각 HH:MM (기본: 시작 + KBO_PREFETCH_GAME_HOURS)")
+    parser.add_argument("--workers", type=int, default=PREFETCH_WORKERS)
+    parser.add_argument("--interval", type=float, default=PREFETCH_INTERVAL, help="경기 중 갱신 주기(초)")
+    parser.add_argument("--once", action="store_true", help="한 번만 로드하고 종료 (갱신 없음)")
+    parser.add_argument("--report-every", type=float, default=60, help="현황 출력 주기(초)")
+    args = parser.parse_args()
+    if not args.players and not args.teams:
+        parser.error("--players 또는 --teams 가 필요합니다.")
+
+    scheduler = PrefetchScheduler(workers=args.workers, interval=args.interval)
+    set_prefetch_scheduler(scheduler)
+    until = 0 if args.once else args.until      # --once: 첫 로드 뒤 바로 종료 시각을 넘김
+    count = scheduler.schedule(args.players, args.teams, first_pitch=args.first_pitch, until=until)
+    print(f"미리 가져오기 등록: {count}명, workers={scheduler.workers}, interval={scheduler.interval:.0f}s")
+    last_report = time.monotonic()
+    try:
+        while scheduler.summary()["players"]:
+            time.sleep(1)
+            if time.monotonic() - last_report >= args.report_every:
+                last_report = time.monotonic()
+                stats = scheduler.summary()
+                print(f"실행 {stats['runs']} (갱신 {stats['refreshes']}, 실패 {stats['failed']}, "
+                      f"AI 요약 {stats['summaries']}) / 남은 선수 {stats['players']}명")
+    except KeyboardInterrupt:
+        pass
+    scheduler.stop(wait=False)
+    print(f"완료: {scheduler.summary()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+선수 프로필 / 구단 인스타그램 압축 스키마 (CSV / 스냅샷 / SQLite 공용)
+
+CSV 는 모든 컬럼을 문자열로 읽으므로 같은 값이 행마다 따로 저장된다.
+- 구단 인스타그램: 선수 행마다 반복되던 URL 을 팀당 한 행짜리 차원 테이블(team_dimension)로
+- 팀 / 포지션 / 등번호 / 입단년도 / 연봉 / 입단 계약금: category (값 목록 + 정수 코드)
+- 신장/체중, 연봉, 입단 계약금: 로드할 때 한 번 파싱해 정수 컬럼으로 추가 (원래 문자열 컬럼은 화면 표시용으로 유지)
+  금액은 단위별로 따로 (국내 선수 '만원', 외국인 선수 '달러')
+- '투수(우투우타)' 같은 포지션 표기도 포지션 / 투구 / 타석 으로 나눠 category 로 추가
+추가 컬럼 이름은 PROFILE_FIELDS 에 모아 두고, 프로필 표에는 원래 CSV 컬럼만 보여준다.
+
+    python src/profile_schema.py     # 변환 전 / 후 메모리 사용량 비교
+"""
+import re
+
+import pandas as pd
+
+# category 로 바꿀 프로필 컬럼 (선수 수에 비해 값 종류가 적은 것)
+CATEGORY_COLUMNS = ("team", "포지션", "등번호", "입단년도", "연봉", "입단 계약금")
+
+# 파싱해서 추가하는 컬럼 (프로필 표에는 표시하지 않음)
+PROFILE_FIELDS = {
+    "height_cm": "Int16",
+    "weight_kg": "Int16",
+    "salary_manwon": "Int32",
+    "salary_usd": "Int32",
+    "signing_bonus_manwon": "Int32",
+    "signing_bonus_usd": "Int32",
+    "position": "category",
+    "throws": "category",
+    "bats": "category",
+}
+
+_BODY = re.compile(r"(\d+)\s*cm\s*/\s*(\d+)\s*kg")
+_POSITION = re.compile(r"^([^(]+)\((.[투언])(.타)\)$")
+
+
+def parse_body(x):
+    """'187cm/95kg' -> (187, 95), 형식이 다르면 (None, None)"""
+    m = _BODY.search(str(x)) if isinstance(x, str) else None
+    return (int(m.group(1)), int(m.group(2))) if m else (None, None)
+
+
+def parse_money(x):
+    """'13500만원' -> (13500, '만원'), '800000달러' -> (800000, '달러'), 비어 있거나 형식이 다르면 (None, None)"""
+    if not isinstance(x, str):
+        return None, None
+    s = x.replace(",", "").strip()
+    for unit in ("만원", "달러"):
+        if s.endswith(unit) and s[:-len(unit)].strip().isdigit():
+            return int(s[:-len(unit)]), unit
+    return None, None
+
+
+def _amount(money, unit):
+    return [amount if u == unit else None for amount, u in money]
+
+
+def parse_position(x):
+    """'투수(우투우타)' -> ('투수', '우투', '우타'), '투수(우언좌타)' -> ('투수', '우언', '좌타')"""
+    if not isinstance(x, str):
+        return None, None, None
+    s = x.strip()
+    m = _POSITION.match(s)
+    if m:
+        return m.group(1).strip(), m.group(2), m.group(3)
+    return s or None, None, None
+
+
+def compact_profiles(profiles):
+    """문자열 프로필 DataFrame -> category 컬럼 + 파싱된 PROFILE_FIELDS 컬럼 (이미 변환된 경우 그대로)"""
+    if all(col in profiles.columns for col in PROFILE_FIELDS):
+        return profiles
+    profiles = profiles.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in profiles.columns:
+            profiles[col] = profiles[col].astype("category")
+
+    body = [parse_body(x) for x in profiles["신장/체중"]]
+    position = [parse_position(x) for x in profiles["포지션"]]
+    salary = [parse_money(x) for x in profiles["연봉"]]
+    bonus = [parse_money(x) for x in profiles["입단 계약금"]]
+    parsed = {
+        "height_cm": [h for h, _ in body],
+        "weight_kg": [w for _, w in body],
+        "salary_manwon": _amount(salary, "만원"),
+        "salary_usd": _amount(salary, "달러"),
+        "signing_bonus_manwon": _amount(bonus, "만원"),
+        "signing_bonus_usd": _amount(bonus, "달러"),
+        "position": [p for p, _, _ in position],
+        "throws": [t for _, t, _ in position],
+        "bats": [b for _, _, b in position],
+    }
+    for col, dtype in PROFILE_FIELDS.items():
+        profiles[col] = pd.Series(parsed[col], index=profiles.index, dtype=dtype)
+    return profiles
+
+
+def team_dimension(team_instagram):
+    """선수별 (team, instagram) 행 -> 팀당 한 행 (CSV 에 처음 나온 순서, 이미 팀당 한 행이면 그대로)"""
+    teams = team_instagram.dropna(subset=["team", "instagram"])
+    teams = teams.drop_duplicates("team")
+    if len(teams) == len(team_instagram):
+        return team_instagram
+    return teams[["team", "instagram"]].reset_index(drop=True)
+
+
+def profile_display_items(row):
+    """프로필 dict -> 표에 보여줄 (항목, 내용) 목록 (파싱해서 추가한 컬럼 제외)"""
+    return [(k, v) for k, v in row.items() if k not in PROFILE_FIELDS]
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+if __name__ == "__main__":
+    from data_store import SNAPSHOT_SOURCES
+
+    raw_profiles = pd.read_csv(SNAPSHOT_SOURCES["profiles"], dtype=str)
+    raw_instagram = pd.read_csv(SNAPSHOT_SOURCES["team_instagram"], dtype=str)
+    profiles = compact_profiles(raw_profiles)
+    teams = team_dimension(raw_instagram)
+
+    rows = [
+        ("profiles", raw_profiles, profiles),
+        ("team_instagram", raw_instagram, teams),
+    ]
+    print(f"{'frame':<16}{'rows':>12}{'before KB':>12}{'after KB':>12}")
+    for label, before, after in rows:
+        print(f"{label:<16}{len(before):>5} -> {len(after):<4}"
+              f"{frame_bytes(before) / 1024:>12.1f}{frame_bytes(after) / 1024:>12.1f}")
+    total_before = sum(frame_bytes(b) for _, b, _ in rows)
+    total_after = sum(frame_bytes(a) for _, _, a in rows)
+    print(f"{'total':<16}{'':>12}{total_before / 1024:>12.1f}{total_after / 1024:>12.1f}")
+    failed = {
+        "신장/체중": profiles["height_cm"].isna(),
+        "연봉": profiles["salary_manwon"].isna() & profiles["salary_usd"].isna(),
+        "입단 계약금": profiles["signing_bonus_manwon"].isna() & profiles["signing_bonus_usd"].isna(),
+        "포지션": profiles["throws"].isna(),
+    }
+    print("파싱 실패(값 있음): " + ", ".join(
+        f"{col} {int((mask & raw_profiles[col].notna()).sum())}" for col, mask in failed.items()
+    ))
@@ -0,0 +1,154 @@
+"""
+선수 능력치 (게임 캐릭터 스탯처럼 0~100 백분위 점수)
+
+2025 성적을 타자 / 투수로 나눠 각 능력치를 리그 내 백분위로 환산한다.
+- 타자: 컨택(AVG) / 파워(HR, SLG) / 선구안(BB/SO) / 스피드(SB)
+- 투수: 제구(WHIP) / 피안타 억제(H/9) / 실점 억제(ERA) / 이닝 소화(IP)
+기준 분포는 충분히 뛴 선수(타석 / 이닝 하한)로만 만들고, 나머지 선수는 그 분포에 대입한다.
+- 기준 분포에서 입력값이 있는 선수가 KBO_RATING_MIN_COVERAGE 비율보다 적은 지표는 쓰지 않음
+  (예: 투수 BB 는 일부 선수에게만 있어 WHIP 기반 제구는 남은 소수끼리의 치우친 순위가 되므로 제외)
+- 하한에 못 미친 선수의 비율 지표는 출전량 비율만큼 점수를 50 쪽으로 당김 (이닝 몇 개로 S 등급이 나오지 않도록)
+  누적 지표(HR, SB, IP)는 출전량이 이미 반영되어 있으므로 그대로
+데이터 저장소가 다시 로드될 때 능력치 입력값이 바뀐 쪽(타자/투수)만 다시 계산한다.
+"""
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from leaderboard import plate_appearances, player_pools
+
+MIN_PA = float(os.getenv("KBO_RATING_MIN_PA", "100"))     # 기준 분포에 넣을 최소 타석
+MIN_IP = float(os.getenv("KBO_RATING_MIN_IP", "30"))      # 기준 분포에 넣을 최소 이닝
+MIN_COVERAGE = float(os.getenv("KBO_RATING_MIN_COVERAGE", "0.8"))   # 기준 분포에서 입력값이 있어야 하는 비율
+
+# 능력치: (키, 이름, [(입력 컬럼, 낮을수록 좋은지)])
+RATING_SPECS = {
+    "batter": [
+        ("contact", "컨택", [("AVG", False)]),
+        ("power", "파워", [("HR", False), ("SLG", False)]),
+        ("eye", "선구안", [("BB_SO", False)]),
+        ("speed", "스피드", [("SB", False)]),
+    ],
+    "pitcher": [
+        ("control", "제구", [("WHIP", True)]),
+        ("hits", "피안타 억제", [("H9", True)]),
+        ("prevention", "실점 억제", [("ERA", True)]),
+        ("stamina", "이닝 소화", [("IP", False)]),
+    ],
+}
+COUNTING_INPUTS = ("HR", "SB", "IP")      # 누적 지표 (표본 보정 안 함)
+SAMPLE_COLUMN = {"batter": "PA", "pitcher": "IP"}
+MIN_SAMPLE = {"batter": MIN_PA, "pitcher": MIN_IP}
+
+
+def _num(stats, name):
+    return stats[name].to_numpy(dtype=float) if name in stats.columns else np.full(len(stats), np.nan)
+
+
+def rating_inputs(stats):
+    """능력치 계산에 쓰는 입력값 (playerId 인덱스, 파생 지표 포함)"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bb, so, ip, h = _num(stats, "BB"), _num(stats, "SO"), _num(stats, "IP"), _num(stats, "H")
+        inputs = pd.DataFrame({
+            "AVG": _num(stats, "AVG"), "HR": _num(stats, "HR"), "SLG": _num(stats, "SLG"),
+            "BB_SO": np.where(so > 0, bb / so, np.nan), "SB": _num(stats, "SB"),
+            "PA": plate_appearances(stats),
+            "WHIP": (bb + h) / ip, "H9": np.where(ip > 0, h * 9 / ip, np.nan),
+            "ERA": _num(stats, "ERA"), "IP": ip,
+        }, index=stats["playerId"].astype(str))
+    pools = player_pools(stats)
+    inputs["pool"] = np.where(pools["pitcher"], "pitcher", np.where(pools["batter"], "batter", ""))
+    return inputs
+
+
+def percentile(values, reference, lower_is_better=False):
+    """values 각각의 reference 분포 내 백분위 (0~100, 동점은 중간 순위). 값이 없으면 NaN"""
+    ref = np.sort(reference[~np.isnan(reference)])
+    if ref.size == 0:
+        return np.full(len(values), np.nan)
+    left = np.searchsorted(ref, values, side="left")
+    right = np.searchsorted(ref, values, side="right")
+    pct = (left + right) / 2 / ref.size * 100
+    if lower_is_better:
+        pct = 100 - pct
+    return np.where(np.isnan(values), np.nan, pct)
+
+
+def grade(score):
+    if score >= 90:
+        return "S"
+    if score >= 75:
+        return "A"
+    if score >= 50:
+        return "B"
+    if score >= 25:
+        return "C"
+    return "D"
+
+
+def shrink(scores, sample, min_sample):
+    """하한에 못 미친 출전량은 그 비율만큼만 반영 (0 이면 50, 하한 이상이면 그대로)"""
+    weight = np.clip(np.nan_to_num(sample) / min_sample, 0, 1) if min_sample > 0 else 1.0
+    return 50 + (scores - 50) * weight
+
+
+def _compute_pool(inputs, pool):
+    """한 풀(타자/투수)의 능력치 DataFrame (playerId 인덱스, 능력치 키 컬럼)"""
+    rows = inputs[inputs["pool"] == pool]
+    sample = rows[SAMPLE_COLUMN[pool]].to_numpy(dtype=float)
+    reference = np.nan_to_num(sample) >= MIN_SAMPLE[pool]
+    scores = {}
+    for key, _, components in RATING_SPECS[pool]:
+        parts = []
+        for col, lower_is_better in components:
+            values = rows[col].to_numpy(dtype=float)
+            ref_values = values[reference]
+            if ref_values.size == 0 or np.mean(~np.isnan(ref_values)) < MIN_COVERAGE:
+                parts.append(np.full(len(values), np.nan))     # 기준 분포가 치우친 지표는 제외
+                continue
+            pct = percentile(values, ref_values, lower_is_better)
+            parts.append(pct if col in COUNTING_INPUTS else shrink(pct, sample, MIN_SAMPLE[pool]))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)     # 입력이 모두 비어 있는 선수는 NaN
+            scores[key] = np.nanmean(np.vstack(parts), axis=0)
+    result = pd.DataFrame(scores, index=rows.index).round()
+    result["sample_ok"] = reference
+    return result[~result.index.duplicated()]
+
+
+class PlayerRatings:
+    def __init__(self, stats, previous=None):
+        """previous: 직전 PlayerRatings. 입력값이 그대로인 풀은 계산하지 않고 재사용"""
+        inputs = rating_inputs(stats)
+        self.fingerprints = {}
+        self.frames = {}
+        self.recomputed = []
+        for pool, specs in RATING_SPECS.items():
+            columns = sorted({col for _, _, comps in specs for col, _ in comps} | {SAMPLE_COLUMN[pool]})
+            rows = inputs.loc[inputs["pool"] == pool, columns]
+            fingerprint = int(pd.util.hash_pandas_object(rows, index=True).sum())
+            if previous is not None and previous.fingerprints.get(pool) == fingerprint:
+                self.frames[pool] = previous.frames[pool]
+            else:
+                self.frames[pool] = _compute_pool(inputs, pool)
+                self.recomputed.append(pool)
+            self.fingerprints[pool] = fingerprint
+
+    def get(self, player_id):
+        """{"pool", "sample_ok", "ratings": [(이름, 점수, 등급), ...]} / 성적이 없으면 None"""
+        pid = str(player_id)
+        for pool, frame in self.frames.items():
+            if pid not in frame.index:
+                continue
+            row = frame.loc[pid]
+            ratings = []
+            for key, label, _ in RATING_SPECS[pool]:
+                score = row[key]
+                if score == score:      # NaN 제외
+                    ratings.append((label, int(score), grade(score)))
+            if not ratings:
+                return None
+            return {"pool": pool, "sample_ok": bool(row["sample_ok"]), "ratings": ratings}
+        return None
@@ -0,0 +1,80 @@
+"""
+브라우저 없이 선수 기록을 가져오는 HTTP 백엔드
+
+기록 페이지 HTML 을 requests 세션(커넥션 풀 재사용)으로 받아 Selenium 경로와 같은
+파서(record_parse)로 경기별 기록 / 통산기록 표를 만든다.
+서버가 표를 HTML 에 담아 주지 않으면 RecordUnavailable 을 던져 Selenium 으로 넘긴다.
+실제 네이버 기록 페이지는 클라이언트 렌더링이라 표가 HTML 에 없으므로, 지금은 로컬 대역 서버
+(fixture_server, KBO_NAVER_SPORTS_BASE) 로 개발 / 벤치마크할 때만 쓴다 (기본 백엔드는 selenium).
+기록 영역 자체가 없는 페이지(브라우저에서 그리는 빈 껍데기)는 ClientRenderedPage 로 구분해,
+auto 모드가 한동안 HTTP 를 건너뛰고 바로 Selenium 을 쓰도록 한다 (record_snapshot).
+"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from record_parse import RecordSnapshot, parse_career, parse_game_log, record_url
+from tracing import span
+
+HTTP_TIMEOUT = float(os.getenv("KBO_RECORD_HTTP_TIMEOUT", "5"))
+HTTP_POOL_SIZE = int(os.getenv("KBO_RECORD_HTTP_POOL_SIZE", "10"))
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) "
+        "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1"
+    ),
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+
+
+class RecordUnavailable(Exception):
+    """HTTP 응답에서 기록 표를 찾지 못함 (브라우저 렌더링이 필요한 경우)"""
+
+
+class ClientRenderedPage(RecordUnavailable):
+    """기록 영역 컨테이너가 하나도 없는 클라이언트 렌더링 페이지 (HTTP 로는 다시 받아도 같음)"""
+
+
+def is_client_rendered(html) -> bool:
+    """경기별 기록 / 통산기록 영역이 둘 다 없으면 스크립트가 그리는 빈 페이지로 판단"""
+    return "_careerStatsArea" not in html and "_gameLogArea" not in html
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """프로세스 전역 requests 세션 (keep-alive 커넥션 재사용)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(HEADERS)
+            _session = session
+        return _session
+
+
+def fetch_snapshot_http(player_id) -> RecordSnapshot:
+    with span("record.page_load", backend="http") as attrs:
+        res = get_http_session().get(record_url(player_id), timeout=HTTP_TIMEOUT)
+        attrs["status"] = res.status_code
+    if res.status_code != 200:
+        raise RecordUnavailable(f"HTTP {res.status_code}")
+
+    html = res.text
+    if is_client_rendered(html):
+        raise ClientRenderedPage("기록 영역이 없는 클라이언트 렌더링 페이지입니다.")
+    with span("record.parse"):
+        career = parse_career(html)
+        if career is None:
+            # 통산기록 표가 없으면 클라이언트 렌더링 페이지로 보고 브라우저 경로에 맡김
+            raise RecordUnavailable("통산기록 표가 HTML 에 없습니다.")
+
+        return RecordSnapshot(player_id, parse_game_log(html), career)
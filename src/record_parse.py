@@ -0,0 +1,97 @@
+"""
+네이버 선수 기록 페이지 파싱 (Selenium / HTTP 백엔드 공용)
+
+페이지 소스(HTML)에서 경기별 기록 / 통산기록 표를 DataFrame 으로 변환한다.
+"""
+import os
+import time
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+NAVER_SPORTS_BASE = os.getenv("KBO_NAVER_SPORTS_BASE", "https://m.sports.naver.com").rstrip("/")
+GAME_LOG_LIMIT = 15
+
+
+def record_url(player_id):
+    return f"{NAVER_SPORTS_BASE}/player/index?playerId={player_id}&category=kbo&tab=record"
+
+
+# === 파싱 ===
+def parse_game_log(page_source):
+    """
+    경기별 기록 (_gameLogArea) 파싱 (최근 15경기)
+    날짜 컬럼 포함 (ul#_gameLogTitleList 의 <a> 태그에서 가져옴)
+    """
+    soup = BeautifulSoup(page_source, "html.parser")
+
+    # 날짜 목록 추출
+    date_list = [a.get_text(strip=True) for a in soup.select("#_gameLogTitleList a")]
+    if not date_list:
+        date_list = ["" for _ in range(GAME_LOG_LIMIT)]
+
+    game_log_div = soup.find("div", id="_gameLogArea")
+    if not game_log_div:
+        return None
+    table = game_log_div.find("table")
+    if not table:
+        return None
+
+    headers = [th.get_text(strip=True) for th in table.select("thead th")]
+    headers.insert(0, "일자")
+
+    rows = []
+    for i, tr in enumerate(table.select("tbody tr")[:GAME_LOG_LIMIT]):
+        cols = [td.get_text(strip=True) for td in tr.select("td")]
+        date_value = date_list[i] if i < len(date_list) else ""
+        rows.append([date_value] + cols)
+
+    if not rows:
+        return None
+
+    return pd.DataFrame(rows, columns=headers[:len(rows[0])]).fillna("")
+
+
+def parse_career(page_source):
+    """
+    통산기록 (_careerStatsArea) 파싱
+    시즌(연도) 컬럼 포함, 전체 시즌 반환
+    """
+    soup = BeautifulSoup(page_source, "html.parser")
+
+    season_list = [
+        li.get_text(strip=True)
+        for li in soup.select("#_careerStatsTitleList li")
+        if li.get_text(strip=True)
+    ]
+
+    career_div = soup.find("div", id="_careerStatsArea")
+    if not career_div:
+        return None
+    table = career_div.find("table")
+    if not table:
+        return None
+
+    headers = [th.get_text(strip=True) for th in table.select("thead th")]
+    headers.insert(0, "시즌")
+
+    rows = []
+    for i, tr in enumerate(table.select("tbody tr")):
+        cols = [td.get_text(strip=True) for td in tr.select("td")]
+        season_value = season_list[i] if i < len(season_list) else ""
+        rows.append([season_value] + cols)
+
+    if not rows:
+        return None
+
+    return pd.DataFrame(rows, columns=headers[:len(rows[0])]).fillna("")
+
+
+class RecordSnapshot:
+    """선수 한 명의 기록 페이지 스냅샷"""
+
+    def __init__(self, player_id, game_log, career, fetched_at=None):
+        self.player_id = str(player_id)
+        self.game_log = game_log    # DataFrame 또는 None
+        self.career = career        # DataFrame 또는 None
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
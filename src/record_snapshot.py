@@ -0,0 +1,336 @@
+"""
+네이버 선수 기록 페이지 스냅샷 (playerId 단위 1회 로드 + TTL/LRU 캐시)
+
+m.sports.naver.com/player/index?playerId=...&tab=record 페이지를 한 번만 열어
+- 경기별 기록(_gameLogArea) 표
+- careerStats 탭을 펼친 통산기록(_careerStatsArea) 표
+를 함께 파싱해 DataFrame 으로 보관한다.
+최근 경기 / 시즌 성적 / AI 요약 등 모든 성적 질문이 같은 스냅샷을 읽는다.
+
+페이지 로드 백엔드 (KBO_RECORD_BACKEND 또는 set_record_backend 로 선택)
+- "selenium" : 브라우저 풀의 headless Chrome 사용 (기본값)
+- "http"     : requests 로 HTML 만 받아 파싱 (브라우저 없음)
+               실제 네이버 기록 페이지는 브라우저에서 표를 그리므로 로컬 대역 서버(fixture_server) 전용
+- "auto"     : http 먼저 시도, 실패하면 selenium
+               http 응답이 브라우저에서 그리는 빈 페이지면 KBO_RECORD_HTTP_BACKOFF 초 동안 http 를 건너뜀
+
+로컬 기록 저장소(record_store, 야간 일괄 수집)가 있으면 저장된 기록을 먼저 쓰고,
+없거나 오래된 선수만 위 백엔드로 실시간 크롤링한다.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from browser_pool import get_browser_pool
+from record_http import ClientRenderedPage, fetch_snapshot_http
+from record_parse import RecordSnapshot, parse_career, parse_game_log, record_url
+from record_store import STORE_MAX_AGE, get_record_store
+from tracing import span
+
+# === 설정 ===
+RECORD_TTL = float(os.getenv("KBO_RECORD_TTL", "600"))            # 초
+RECORD_CACHE_SIZE = int(os.getenv("KBO_RECORD_CACHE_SIZE", "256"))  # 선수 수
+READY_TIMEOUT = float(os.getenv("KBO_READY_TIMEOUT", "8"))       # 초, 준비 대기 상한
+READY_POLL = float(os.getenv("KBO_READY_POLL", "0.1"))           # 초, 폴링 간격
+RECORD_BACKEND = os.getenv("KBO_RECORD_BACKEND", "selenium")
+HTTP_BACKOFF = float(os.getenv("KBO_RECORD_HTTP_BACKOFF", "3600"))   # 초, 빈 페이지를 받은 뒤 http 를 건너뛸 시간
+
+# 페이지 준비 조건 (고정 sleep 대신 이 요소가 나타날 때까지만 대기)
+GAME_LOG_READY = "#_gameLogArea table tbody tr"
+CAREER_READY = "#_careerStatsArea table"
+
+
+# === 준비 대기 시간 기록 ===
+class WaitTimings:
+    """단계별 실제 대기 시간(초)을 최근 N개까지 보관하고 분포를 요약"""
+
+    def __init__(self, max_samples=1000):
+        self._samples = {}
+        self._timeouts = {}
+        self._max_samples = max_samples
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, timed_out=False):
+        with self._lock:
+            self._samples.setdefault(stage, deque(maxlen=self._max_samples)).append(seconds)
+            if timed_out:
+                self._timeouts[stage] = self._timeouts.get(stage, 0) + 1
+
+    def summary(self):
+        """{stage: {count, timeouts, p50, p90, p99, max}}"""
+        with self._lock:
+            items = {k: np.array(v) for k, v in self._samples.items()}
+            timeouts = dict(self._timeouts)
+        result = {}
+        for stage, arr in items.items():
+            p50, p90, p99 = np.percentile(arr, [50, 90, 99])
+            result[stage] = {
+                "count": int(arr.size),
+                "timeouts": timeouts.get(stage, 0),
+                "p50": round(float(p50), 3),
+                "p90": round(float(p90), 3),
+                "p99": round(float(p99), 3),
+                "max": round(float(arr.max()), 3),
+            }
+        return result
+
+
+wait_timings = WaitTimings()
+
+
+def wait_for_css(driver, css, stage, timeout=READY_TIMEOUT, poll=READY_POLL) -> bool:
+    """css 요소가 나타날 때까지 최대 timeout 초 대기. 걸린 시간은 wait_timings 에 기록"""
+    start = time.perf_counter()
+    with span(f"record.wait.{stage}") as attrs:
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=poll).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, css))
+            )
+            ready = True
+        except TimeoutException:
+            ready = False
+        attrs["ready"] = ready
+    wait_timings.record(stage, time.perf_counter() - start, timed_out=not ready)
+    return ready
+
+
+# === 페이지 로드 (Selenium) ===
+def fetch_snapshot_selenium(player_id) -> RecordSnapshot:
+    """브라우저 풀에서 세션을 빌려 기록 페이지를 한 번만 열고 두 표를 모두 읽음"""
+    with get_browser_pool().driver() as driver:
+        with span("record.page_load", backend="selenium"):
+            driver.get(record_url(player_id))
+        # 경기 기록이 없는 선수도 있으므로 통산기록 표가 먼저 보여도 준비 완료로 간주
+        wait_for_css(driver, f"{GAME_LOG_READY}, {CAREER_READY}", "game_log")
+        game_log_source = driver.page_source
+
+        try:
+            tab_btn = driver.find_element("css selector", '[data-tab="careerStats"]')
+            tab_btn.click()
+            wait_for_css(driver, f"{CAREER_READY} tbody tr", "career")
+            career_source = driver.page_source
+        except Exception:
+            career_source = game_log_source
+
+    with span("record.parse"):
+        return RecordSnapshot(player_id, parse_game_log(game_log_source), parse_career(career_source))
+
+
+# === 백엔드 선택 ===
+RECORD_BACKENDS = ("auto", "http", "selenium")
+backend_stats = {"http": 0, "selenium": 0, "fallback": 0, "http_skipped": 0, "store": 0, "stale": 0}
+_http_skip_until = 0.0      # auto 모드: 이 시각 전까지는 http 를 시도하지 않음
+
+
+def set_record_backend(name):
+    """실행 중에 페이지 로드 백엔드 변경 (auto / http / selenium)"""
+    global RECORD_BACKEND
+    if name not in RECORD_BACKENDS:
+        raise ValueError(f"지원하지 않는 백엔드입니다: {name} ({', '.join(RECORD_BACKENDS)})")
+    RECORD_BACKEND = name
+
+
+def auto_tries_http(now=None) -> bool:
+    """auto 모드에서 이번 요청에 http 를 먼저 시도할지 (빈 페이지를 받은 뒤 HTTP_BACKOFF 동안은 False)"""
+    return (time.time() if now is None else now) >= _http_skip_until
+
+
+def fetch_snapshot(player_id) -> RecordSnapshot:
+    global _http_skip_until
+    if RECORD_BACKEND == "selenium":
+        backend_stats["selenium"] += 1
+        return fetch_snapshot_selenium(player_id)
+    if RECORD_BACKEND == "http":
+        backend_stats["http"] += 1
+        return fetch_snapshot_http(player_id)
+
+    # auto: 브라우저 없는 경로 우선, 안 되면 Selenium 으로 대체
+    if not auto_tries_http():
+        backend_stats["http_skipped"] += 1
+        backend_stats["selenium"] += 1
+        return fetch_snapshot_selenium(player_id)
+    try:
+        snap = fetch_snapshot_http(player_id)
+        backend_stats["http"] += 1
+        return snap
+    except ClientRenderedPage:
+        # 다시 받아도 같은 빈 페이지이므로 한동안 왕복 없이 바로 Selenium
+        _http_skip_until = time.time() + HTTP_BACKOFF
+    except Exception:
+        pass
+    backend_stats["fallback"] += 1
+    backend_stats["selenium"] += 1
+    return fetch_snapshot_selenium(player_id)
+
+
+def fetch_snapshot_stored(player_id) -> RecordSnapshot:
+    """
+    로컬 저장소 우선. 저장된 기록이 없거나 오래됐으면 실시간 크롤링 후 저장소에도 반영
+    실시간 크롤링이 실패하면 오래된 기록이라도 반환
+    """
+    store = get_record_store()
+    if store is None:
+        return fetch_snapshot(player_id)
+    stored = store.load_snapshot(player_id)
+    if stored is not None and time.time() - stored.fetched_at < STORE_MAX_AGE:
+        backend_stats["store"] += 1
+        return stored
+    try:
+        snap = fetch_snapshot(player_id)
+    except Exception:
+        if stored is None:
+            raise
+        backend_stats["stale"] += 1
+        return stored
+    store.save_snapshot(snap)
+    return snap
+
+
+def fetch_snapshot_refresh(player_id) -> RecordSnapshot:
+    """경기 중 갱신용: 저장소가 최신이어도 실시간 크롤링하고 저장소에도 반영"""
+    snap = fetch_snapshot(player_id)
+    store = get_record_store()
+    if store is not None:
+        store.save_snapshot(snap)
+    return snap
+
+
+# === 캐시 ===
+class SnapshotCache:
+    """
+    playerId -> RecordSnapshot 캐시 (TTL 만료 + LRU 제거)
+    같은 선수를 동시에 요청하면 페이지 로드는 한 번만 수행 (나머지는 결과를 기다림)
+    미리 가져오기(prefetch)로 넣은 항목을 질문이 처음 읽으면 prefetch_saved 로 집계 (크롤링 한 번을 아낀 것)
+    """
+
+    def __init__(self, fetcher=fetch_snapshot_stored, ttl=RECORD_TTL, max_size=RECORD_CACHE_SIZE,
+                 refresher=fetch_snapshot_refresh):
+        self.fetcher = fetcher
+        self.refresher = refresher
+        self.ttl = ttl
+        self.max_size = max(1, max_size)
+        self._data = OrderedDict()
+        self._cached_at = {}    # 캐시에 넣은 시각 (저장소에서 읽은 기록은 fetched_at 이 수집 시각이므로 따로 보관)
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._prefetched = set()    # prefetch 로 넣은 뒤 아직 질문이 읽지 않은 선수
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "prefetched": 0, "prefetch_saved": 0}
+
+    def _fresh(self, key):
+        return time.time() - self._cached_at.get(key, 0) < self.ttl
+
+    def get(self, player_id) -> RecordSnapshot:
+        with span("record.snapshot", player_id=str(player_id)) as attrs:
+            return self._get(str(player_id), attrs)
+
+    def _get(self, key, attrs) -> RecordSnapshot:
+        with self._lock:
+            snap = self._data.get(key)
+            if snap is not None and self._fresh(key):
+                self._data.move_to_end(key)
+                self.stats["hits"] += 1
+                attrs["cache"] = "hit"
+                if key in self._prefetched:
+                    self._prefetched.discard(key)
+                    self.stats["prefetch_saved"] += 1
+                    attrs["prefetched"] = True
+                return snap
+            self.stats["misses"] += 1
+            event = self._inflight.get(key)
+            owner = event is None
+            if owner:
+                event = self._inflight[key] = threading.Event()
+
+        if not owner:
+            # 같은 선수를 먼저 요청한 쪽의 로드를 기다림
+            attrs["cache"] = "wait"
+            event.wait()
+            with self._lock:
+                snap = self._data.get(key)
+            if snap is not None:
+                return snap
+            return self._get(key, attrs)
+
+        attrs["cache"] = "miss"
+        try:
+            snap = self.fetcher(key)
+            self.put(snap)
+            return snap
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def warm(self, player_id, refresh=False) -> RecordSnapshot:
+        """
+        미리 가져오기. 캐시에 유효한 항목이 있으면 그대로, 없으면 fetcher 로 로드
+        refresh=True 면 항상 refresher 로 다시 크롤링해 교체 (교체 전까지 질문은 이전 항목을 읽음)
+        hits / misses 에는 세지 않음
+        """
+        key = str(player_id)
+        with span("record.prefetch", player_id=key, refresh=refresh) as attrs:
+            if not refresh:
+                with self._lock:
+                    snap = self._data.get(key)
+                    if snap is not None and self._fresh(key):
+                        attrs["cache"] = "hit"
+                        return snap
+            attrs["cache"] = "load"
+            snap = (self.refresher if refresh else self.fetcher)(key)
+            self.put(snap, prefetched=True)
+            return snap
+
+    def put(self, snap: RecordSnapshot, prefetched=False):
+        with self._lock:
+            self._data[snap.player_id] = snap
+            self._data.move_to_end(snap.player_id)
+            self._cached_at[snap.player_id] = time.time()
+            if prefetched:
+                self._prefetched.add(snap.player_id)
+                self.stats["prefetched"] += 1
+            else:
+                self._prefetched.discard(snap.player_id)
+            while len(self._data) > self.max_size:
+                evicted, _ = self._data.popitem(last=False)
+                self._cached_at.pop(evicted, None)
+                self._prefetched.discard(evicted)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, player_id=None):
+        with self._lock:
+            if player_id is None:
+                self._data.clear()
+                self._cached_at.clear()
+                self._prefetched.clear()
+            else:
+                self._data.pop(str(player_id), None)
+                self._cached_at.pop(str(player_id), None)
+                self._prefetched.discard(str(player_id))
+
+    def hit_ratio(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return round(self.stats["hits"] / total, 3) if total else 0.0
+
+
+# === 프로세스 전역 캐시 ===
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_snapshot_cache() -> SnapshotCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SnapshotCache()
+        return _cache
+
+
+def get_record_snapshot(player_id) -> RecordSnapshot:
+    return get_snapshot_cache().get(player_id)
@@ -0,0 +1,381 @@
+"""
+선수 기록 로컬 저장소 (SQLite)
+
+야간 일괄 수집(bulk_crawl.py)이 모든 선수의 경기별 기록 / 통산기록 표를 이 파일에 저장하고,
+질문에 답할 때는 저장된 기록을 먼저 읽는다. 저장된 기록이 없거나 KBO_RECORD_STORE_MAX_AGE 보다
+오래됐을 때만 실시간으로 크롤링하고, 그 결과도 다시 저장한다 (실시간 크롤링이 실패하면 오래된 기록이라도 사용).
+
+- players   : 선수별 마지막 수집 시각 / 상태 (ok / empty / error)
+- game_log  : 경기별 기록 행 (선수, 순번, 일자, 행 JSON)
+- career    : 통산기록 행 (선수, 순번, 시즌, 행 JSON)
+- crawl_runs: 일괄 수집 실행 기록 (중단된 실행 이어서 하기용)
+- crawl_run_failures: 실행별 수집 실패 선수 (이어서 할 때 실패 수를 이어받고 다시 시도하지 않음)
+- game_log_history / game_log_sync: 경기별 기록 누적 이력 (추가만 하는 테이블)
+
+경기별 기록 페이지는 항상 최근 15경기를 보여 주지만, 이력에는 마지막으로 저장한 일자보다 새로운 경기만 추가한다.
+이미 저장한 경기 중 최근 KBO_GAMELOG_CORRECTION_WINDOW 경기는 다시 비교해 기록이 정정됐으면
+새 revision 으로 추가한다 (기존 행은 고치지 않음). 그보다 오래된 행은 비교하지 않으므로
+갱신 비용은 시즌 누적 경기 수가 아니라 새 경기 수에 비례한다.
+
+파일(KBO_RECORD_DB)이 없으면 저장소를 쓰지 않고 기존처럼 실시간 크롤링만 한다.
+연결은 스레드마다 따로 열고 WAL 모드로 읽기 / 쓰기를 동시에 허용한다.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from record_parse import RecordSnapshot
+from tracing import span
+
+RECORD_DB = Path(os.getenv(
+    "KBO_RECORD_DB", Path(__file__).resolve().parent.parent / "data" / "records.sqlite3"
+))
+STORE_MAX_AGE = float(os.getenv("KBO_RECORD_STORE_MAX_AGE", str(36 * 3600)))   # 초, 이보다 오래되면 실시간 크롤링
+STORE_RECHECK = float(os.getenv("KBO_RECORD_STORE_RECHECK", "60"))   # 초, 파일이 없을 때 다시 확인할 간격
+CORRECTION_WINDOW = int(os.getenv("KBO_GAMELOG_CORRECTION_WINDOW", "3"))        # 정정 여부를 다시 비교할 최근 경기 수
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    player_id  TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    status     TEXT NOT NULL,
+    error      TEXT
+);
+CREATE TABLE IF NOT EXISTS game_log (
+    player_id TEXT NOT NULL,
+    seq       INTEGER NOT NULL,
+    game_date TEXT,
+    row_json  TEXT NOT NULL,
+    PRIMARY KEY (player_id, seq)
+);
+CREATE TABLE IF NOT EXISTS career (
+    player_id TEXT NOT NULL,
+    seq       INTEGER NOT NULL,
+    season    TEXT,
+    row_json  TEXT NOT NULL,
+    PRIMARY KEY (player_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_game_log_date ON game_log (game_date, player_id);
+CREATE INDEX IF NOT EXISTS idx_career_season ON career (season, player_id);
+CREATE TABLE IF NOT EXISTS game_log_history (
+    player_id TEXT NOT NULL,
+    game_key  TEXT NOT NULL,
+    game_date TEXT NOT NULL,
+    revision  INTEGER NOT NULL,
+    row_json  TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (player_id, game_key, revision)
+);
+CREATE TABLE IF NOT EXISTS game_log_sync (
+    player_id   TEXT PRIMARY KEY,
+    last_date   TEXT,
+    recent_json TEXT NOT NULL,
+    games       INTEGER NOT NULL,
+    corrections INTEGER NOT NULL,
+    synced_at   REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS crawl_runs (
+    run_id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at  REAL NOT NULL,
+    finished_at REAL,
+    total       INTEGER NOT NULL,
+    done        INTEGER NOT NULL DEFAULT 0,
+    failed      INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS crawl_run_failures (
+    run_id    INTEGER NOT NULL,
+    player_id TEXT NOT NULL,
+    PRIMARY KEY (run_id, player_id)
+);
+"""
+
+
+def _rows(df, key_column):
+    if df is None or df.empty:
+        return []
+    return [
+        (i, str(row.get(key_column, "")), json.dumps(row, ensure_ascii=False))
+        for i, row in enumerate(df.to_dict(orient="records"))
+    ]
+
+
+def _frame(rows):
+    if not rows:
+        return None
+    return pd.DataFrame([json.loads(r[0]) for r in rows]).fillna("")
+
+
+def game_date_key(day, now):
+    """
+    페이지의 '09.28' -> '2025.09.28' (연도 없는 날짜에 시즌 연도 부여)
+    오늘보다 뒤의 월/일이면 작년 경기 (비시즌에 지난 시즌 기록을 받는 경우)
+    """
+    try:
+        month, date = (int(x) for x in str(day).split(".")[:2])
+    except ValueError:
+        return ""
+    year = now.tm_year if (month, date) <= (now.tm_mon, now.tm_mday) else now.tm_year - 1
+    return f"{year:04d}.{month:02d}.{date:02d}"
+
+
+def game_rows(game_log, synced_at):
+    """경기별 기록 DataFrame -> [(game_key, 날짜 키, 행 dict)] (더블헤더는 같은 날 같은 상대에 #2)"""
+    if game_log is None or game_log.empty:
+        return []
+    now = time.localtime(synced_at)
+    seen = {}
+    rows = []
+    # 페이지는 최신 경기부터이므로 오래된 경기부터 번호를 매겨야 더블헤더 번호가 바뀌지 않음
+    for row in reversed(game_log.to_dict(orient="records")):
+        date = game_date_key(row.get("일자", ""), now)
+        if not date:
+            continue
+        base = f"{date}|{row.get('상대', '')}"
+        seen[base] = seen.get(base, 0) + 1
+        key = base if seen[base] == 1 else f"{base}#{seen[base]}"
+        rows.append((key, date, row))
+    return rows
+
+
+def _digest(row):
+    return hashlib.sha1(json.dumps(row, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class RecordStore:
+    def __init__(self, path=RECORD_DB):
+        self.path = Path(path)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # === 선수 기록 ===
+    def save_snapshot(self, snap: RecordSnapshot):
+        """
+        선수 한 명의 기록 저장 (한 트랜잭션). 경기별 기록은 이력에 새 경기 / 정정만 추가하고,
+        바뀐 것이 없으면 최근 15경기 표도 다시 쓰지 않음
+        반환: {"new": 새 경기 수, "corrected": 정정된 경기 수}
+        """
+        has_rows = snap.game_log is not None or snap.career is not None
+        with self._conn() as conn:
+            synced = self._sync_game_log(conn, snap.player_id, snap.game_log, snap.fetched_at)
+            if synced["new"] or synced["corrected"] or synced["first"]:
+                conn.execute("DELETE FROM game_log WHERE player_id = ?", (snap.player_id,))
+                conn.executemany(
+                    "INSERT INTO game_log VALUES (?, ?, ?, ?)",
+                    [(snap.player_id, *r) for r in _rows(snap.game_log, "일자")],
+                )
+            conn.execute("DELETE FROM career WHERE player_id = ?", (snap.player_id,))
+            conn.executemany(
+                "INSERT INTO career VALUES (?, ?, ?, ?)",
+                [(snap.player_id, *r) for r in _rows(snap.career, "시즌")],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO players VALUES (?, ?, ?, NULL)",
+                (snap.player_id, snap.fetched_at, "ok" if has_rows else "empty"),
+            )
+        return {"new": synced["new"], "corrected": synced["corrected"]}
+
+    def _sync_game_log(self, conn, player_id, game_log, synced_at):
+        """마지막 저장 일자 이후 경기 추가 + 최근 경기 정정 감지 (이력은 추가만)"""
+        state = conn.execute(
+            "SELECT last_date, recent_json, games, corrections FROM game_log_sync WHERE player_id = ?",
+            (player_id,),
+        ).fetchone()
+        first = state is None
+        last_date, recent, games, corrections = state if state else (None, "{}", 0, 0)
+        recent = json.loads(recent)     # game_key -> [revision, digest, 날짜 키]
+
+        inserts = []
+        new = corrected = 0
+        for key, date, row in game_rows(game_log, synced_at):
+            digest = _digest(row)
+            if key in recent:
+                revision, old_digest, _ = recent[key]
+                if old_digest == digest:
+                    continue
+                revision += 1
+                corrected += 1
+            elif last_date is None or date >= last_date:
+                revision = 0
+                new += 1
+            else:
+                continue    # 비교 구간보다 오래된 경기
+            recent[key] = [revision, digest, date]
+            inserts.append((player_id, key, date, revision, json.dumps(row, ensure_ascii=False), synced_at))
+
+        if inserts:
+            conn.executemany("INSERT INTO game_log_history VALUES (?, ?, ?, ?, ?, ?)", inserts)
+        # 최근 N경기 + 마지막 날짜의 경기(더블헤더)는 다음 동기화 때 다시 비교
+        ordered = sorted(recent.items(), key=lambda kv: (kv[1][2], kv[0]))
+        if ordered:
+            last_date = max(last_date or "", ordered[-1][1][2])
+        window = [
+            kv for i, kv in enumerate(ordered)
+            if i >= len(ordered) - CORRECTION_WINDOW or kv[1][2] == last_date
+        ]
+        conn.execute(
+            "INSERT OR REPLACE INTO game_log_sync VALUES (?, ?, ?, ?, ?, ?)",
+            (player_id, last_date, json.dumps(dict(window)), games + new, corrections + corrected, synced_at),
+        )
+        return {"new": new, "corrected": corrected, "first": first}
+
+    def game_history(self, player_id):
+        """시즌 누적 경기별 기록 (경기마다 최신 revision, 최신 경기부터) / 없으면 None"""
+        rows = self._conn().execute(
+            "SELECT h.row_json FROM game_log_history h "
+            "JOIN (SELECT game_key, MAX(revision) AS revision FROM game_log_history "
+            "      WHERE player_id = ? GROUP BY game_key) latest "
+            "  ON h.game_key = latest.game_key AND h.revision = latest.revision "
+            "WHERE h.player_id = ? ORDER BY h.game_date DESC, h.game_key DESC",
+            (str(player_id), str(player_id)),
+        ).fetchall()
+        return _frame(rows)
+
+    def corrections(self, player_id):
+        """정정 이력 [{"game_key", "revision", "synced_at", "before", "after"}]"""
+        rows = self._conn().execute(
+            "SELECT game_key, revision, row_json, synced_at FROM game_log_history "
+            "WHERE player_id = ? AND game_key IN "
+            "  (SELECT game_key FROM game_log_history WHERE player_id = ? AND revision > 0) "
+            "ORDER BY game_key, revision",
+            (str(player_id), str(player_id)),
+        ).fetchall()
+        result = []
+        previous = {}
+        for key, revision, row_json, synced_at in rows:
+            row = json.loads(row_json)
+            if revision > 0:
+                before = previous.get(key, {})
+                changed = {c for c in set(before) | set(row) if before.get(c) != row.get(c)}
+                result.append({
+                    "game_key": key, "revision": revision, "synced_at": synced_at,
+                    "before": {c: before.get(c) for c in sorted(changed)},
+                    "after": {c: row.get(c) for c in sorted(changed)},
+                })
+            previous[key] = row
+        return result
+
+    def mark_failed(self, player_id, error, run_id=None):
+        """수집 실패 기록 (이전에 저장된 기록은 그대로 둠). run_id 를 주면 그 실행의 실패 목록에도 추가"""
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO players VALUES (?, ?, 'error', ?) "
+                "ON CONFLICT(player_id) DO UPDATE SET error = excluded.error, "
+                "status = CASE WHEN players.status = 'ok' THEN 'ok' ELSE 'error' END",
+                (str(player_id), time.time(), str(error)[:500]),
+            )
+            if run_id is not None:
+                conn.execute("INSERT OR IGNORE INTO crawl_run_failures VALUES (?, ?)", (run_id, str(player_id)))
+
+    def load_snapshot(self, player_id):
+        """저장된 RecordSnapshot (fetched_at 은 수집 시각) / 수집한 적 없으면 None"""
+        pid = str(player_id)
+        with span("record.store.load"):
+            conn = self._conn()
+            meta = conn.execute(
+                "SELECT fetched_at, status FROM players WHERE player_id = ?", (pid,)
+            ).fetchone()
+            if meta is None or meta[1] == "error":
+                return None
+            game_log = conn.execute(
+                "SELECT row_json FROM game_log WHERE player_id = ? ORDER BY seq", (pid,)
+            ).fetchall()
+            career = conn.execute(
+                "SELECT row_json FROM career WHERE player_id = ? ORDER BY seq", (pid,)
+            ).fetchall()
+        return RecordSnapshot(pid, _frame(game_log), _frame(career), fetched_at=meta[0])
+
+    def fetched_since(self, since):
+        """since 이후 수집에 성공한 playerId 집합"""
+        rows = self._conn().execute(
+            "SELECT player_id FROM players WHERE fetched_at >= ? AND status != 'error'", (since,)
+        ).fetchall()
+        return {r[0] for r in rows}
+
+    def summary(self):
+        conn = self._conn()
+        counts = dict(conn.execute("SELECT status, COUNT(*) FROM players GROUP BY status").fetchall())
+        oldest, newest = conn.execute(
+            "SELECT MIN(fetched_at), MAX(fetched_at) FROM players WHERE status != 'error'"
+        ).fetchone()
+        games, corrections = conn.execute(
+            "SELECT COALESCE(SUM(games), 0), COALESCE(SUM(corrections), 0) FROM game_log_sync"
+        ).fetchone()
+        return {"players": counts, "oldest": oldest, "newest": newest, "games": games, "corrections": corrections}
+
+    # === 일괄 수집 실행 (체크포인트) ===
+    def start_run(self, total):
+        with self._conn() as conn:
+            cur = conn.execute("INSERT INTO crawl_runs (started_at, total) VALUES (?, ?)", (time.time(), total))
+            return cur.lastrowid
+
+    def unfinished_run(self):
+        """가장 최근의 끝나지 않은 실행 {"run_id", "started_at", "total", "done", "failed"} / 없으면 None"""
+        row = self._conn().execute(
+            "SELECT run_id, started_at, total, done, failed FROM crawl_runs "
+            "WHERE finished_at IS NULL ORDER BY run_id DESC LIMIT 1"
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("run_id", "started_at", "total", "done", "failed"), row))
+
+    def run_failures(self, run_id):
+        """실행 중 수집에 실패한 playerId 집합"""
+        rows = self._conn().execute(
+            "SELECT player_id FROM crawl_run_failures WHERE run_id = ?", (run_id,)
+        ).fetchall()
+        return {r[0] for r in rows}
+
+    def update_run(self, run_id, done, failed, finished=False):
+        with self._conn() as conn:
+            conn.execute(
+                "UPDATE crawl_runs SET done = ?, failed = ?, finished_at = ? WHERE run_id = ?",
+                (done, failed, time.time() if finished else None, run_id),
+            )
+
+
+# === 프로세스 전역 저장소 ===
+_store = None
+_store_checked_at = None    # 마지막으로 파일을 확인한 시각 (time.monotonic)
+_store_pinned = False       # set_record_store 로 지정했으면 파일을 다시 확인하지 않음
+_store_lock = threading.Lock()
+
+
+def get_record_store():
+    """
+    KBO_RECORD_DB 파일이 있으면 RecordStore, 없으면 None (실시간 크롤링만 사용)
+    파일이 없으면 STORE_RECHECK 초마다 다시 확인 (서버 실행 중에 첫 일괄 수집이 끝나도 재시작 없이 사용)
+    """
+    global _store, _store_checked_at
+    with _store_lock:
+        if _store is None and not _store_pinned:
+            now = time.monotonic()
+            if _store_checked_at is None or now - _store_checked_at >= STORE_RECHECK:
+                _store_checked_at = now
+                if RECORD_DB.exists():
+                    _store = RecordStore(RECORD_DB)
+        return _store
+
+
+def set_record_store(store):
+    """일괄 수집 / 벤치마크용: 사용할 저장소 교체 (None 이면 저장소 사용 안 함)"""
+    global _store, _store_pinned
+    with _store_lock:
+        _store = store
+        _store_pinned = True
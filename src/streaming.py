@@ -0,0 +1,79 @@
+"""
+토큰 단위 스트리밍 답변
+
+LLM 응답 조각(chunk)을 그대로 흘려보내면서
+- 지금까지 받은 전체 문장(.text)
+- 첫 토큰까지 걸린 시간(.ttft) / 전체 시간(.total)
+을 기록한다. UI 는 이 객체를 순회하며 말풍선을 갱신하고, 끝나면 .text 를 기록에 저장.
+"""
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class StreamMetrics:
+    """최근 N개 스트리밍 답변의 첫 토큰 시간 / 전체 시간(초)"""
+
+    def __init__(self, max_samples=500):
+        self._ttft = deque(maxlen=max_samples)
+        self._total = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, ttft, total):
+        with self._lock:
+            if ttft is not None:
+                self._ttft.append(ttft)
+            self._total.append(total)
+
+    def summary(self):
+        with self._lock:
+            ttft, total = np.array(self._ttft), np.array(self._total)
+        result = {"count": int(total.size)}
+        for label, arr in (("ttft", ttft), ("total", total)):
+            if arr.size:
+                p50, p95 = np.percentile(arr, [50, 95])
+                result[f"{label}_p50"] = round(float(p50), 3)
+                result[f"{label}_p95"] = round(float(p95), 3)
+        return result
+
+
+stream_metrics = StreamMetrics()
+
+
+class StreamingAnswer:
+    def __init__(self, chunks, prefix=""):
+        self._chunks = chunks
+        self.prefix = prefix
+        self.text = ""
+        self.ttft = None
+        self.total = None
+        self.done = False
+
+    def __iter__(self):
+        if self.done:
+            yield self.text
+            return
+        start = time.perf_counter()
+        if self.prefix:
+            self.text += self.prefix
+            yield self.prefix
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            if self.ttft is None:
+                self.ttft = time.perf_counter() - start
+            self.text += chunk
+            yield chunk
+        self.total = time.perf_counter() - start
+        self.done = True
+        stream_metrics.record(self.ttft, self.total)
+
+
+def with_prefix(prefix, answer):
+    """고정 문구 + 답변 (답변이 스트리밍이면 스트리밍 유지)"""
+    if isinstance(answer, StreamingAnswer):
+        answer.prefix = prefix + answer.prefix
+        return answer
+    return prefix + answer
@@ -0,0 +1,198 @@
+"""
+답변 파이프라인 단계별 시간 측정 (span)
+
+    with start_trace("answer") as trace:          # 질문 하나
+        with span("data.refresh"):                # 단계 하나 (중첩 가능)
+            ...
+
+- 현재 trace / 부모 span 은 contextvars 로 전달되므로 asyncio.to_thread 로 실행한 작업도 같은 trace 에 붙는다.
+- trace 밖에서 실행된 span 은 집계(span_metrics)에만 반영
+- 집계는 JSON lines / Prometheus text 형식으로 내보낼 수 있고,
+  KBO_TRACE_LOG 를 지정하면 끝난 trace 를 한 줄씩 JSON 으로 남긴다.
+"""
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+TRACE_LOG = os.getenv("KBO_TRACE_LOG", "")
+
+# Prometheus histogram 구간(초)
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current_trace = contextvars.ContextVar("kbo_trace", default=None)
+_current_span = contextvars.ContextVar("kbo_span", default=None)
+
+
+class Trace:
+    def __init__(self, name):
+        self.name = name
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.duration = None
+        self.spans = []     # {"id", "parent", "name", "start", "duration", "attrs"}
+        self._lock = threading.Lock()
+
+    def _add(self, name, start, duration, parent, attrs):
+        with self._lock:
+            span_id = len(self.spans)
+            self.spans.append({
+                "id": span_id, "parent": parent, "name": name,
+                "start": start - self._t0, "duration": duration, "attrs": attrs,
+            })
+            return span_id
+
+    def to_dict(self):
+        with self._lock:
+            spans = [dict(s) for s in self.spans]
+        return {"name": self.name, "started_at": self.started_at, "duration": self.duration, "spans": spans}
+
+
+class SpanMetrics:
+    """span 이름별 누적 시간 (최근 N개 표본 + Prometheus histogram)"""
+
+    def __init__(self, max_samples=1000):
+        self.max_samples = max_samples
+        self._samples = {}
+        self._buckets = {}
+        self._count = {}
+        self._sum = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self.max_samples)).append(seconds)
+            buckets = self._buckets.setdefault(name, [0] * len(BUCKETS))
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    buckets[i] += 1
+            self._count[name] = self._count.get(name, 0) + 1
+            self._sum[name] = self._sum.get(name, 0.0) + seconds
+
+    def summary(self):
+        """{span 이름: {"count", "total", "p50", "p95", "p99", "max"}} (초)"""
+        with self._lock:
+            samples = {k: np.array(v) for k, v in self._samples.items()}
+            counts, sums = dict(self._count), dict(self._sum)
+        result = {}
+        for name, arr in sorted(samples.items()):
+            p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+            result[name] = {
+                "count": counts[name], "total": round(sums[name], 6),
+                "p50": round(float(p50), 6), "p95": round(float(p95), 6),
+                "p99": round(float(p99), 6), "max": round(float(arr.max()), 6),
+            }
+        return result
+
+    def to_jsonl(self):
+        return "".join(
+            json.dumps({"span": name, **values}, ensure_ascii=False) + "\n"
+            for name, values in self.summary().items()
+        )
+
+    def to_prometheus(self):
+        with self._lock:
+            names = sorted(self._count)
+            buckets = {k: list(v) for k, v in self._buckets.items()}
+            counts, sums = dict(self._count), dict(self._sum)
+        lines = [
+            "# HELP kbo_span_duration_seconds Time spent in each answer pipeline stage.",
+            "# TYPE kbo_span_duration_seconds histogram",
+        ]
+        for name in names:
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            for bound, count in zip(BUCKETS, buckets[name]):
+                lines.append(f'kbo_span_duration_seconds_bucket{{span="{label}",le="{bound}"}} {count}')
+            lines.append(f'kbo_span_duration_seconds_bucket{{span="{label}",le="+Inf"}} {counts[name]}')
+            lines.append(f'kbo_span_duration_seconds_sum{{span="{label}"}} {sums[name]:.6f}')
+            lines.append(f'kbo_span_duration_seconds_count{{span="{label}"}} {counts[name]}')
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._buckets.clear()
+            self._count.clear()
+            self._sum.clear()
+
+
+span_metrics = SpanMetrics()
+_last_trace = None
+_log_lock = threading.Lock()
+
+
+def last_trace():
+    """가장 최근에 끝난 trace (dict) / 없으면 None"""
+    return _last_trace
+
+
+def _write_log(trace_dict):
+    with _log_lock:
+        with open(TRACE_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(trace_dict, ensure_ascii=False) + "\n")
+
+
+@contextmanager
+def start_trace(name):
+    global _last_trace
+    trace = Trace(name)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        yield trace
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        trace.duration = time.perf_counter() - trace._t0
+        span_metrics.record(name, trace.duration)
+        _last_trace = trace.to_dict()
+        if TRACE_LOG:
+            _write_log(_last_trace)
+
+
+@contextmanager
+def span(name, **attrs):
+    """with span("llm.completion", model=...) as attrs: attrs["cache"] = "hit" 처럼 속성 추가 가능"""
+    trace = _current_trace.get()
+    parent = _current_span.get()
+    start = time.perf_counter()
+    span_id = None
+    token = None
+    if trace is not None:
+        # 시작 시점에 자리를 잡아 두어야 자식 span 이 부모를 가리킬 수 있음
+        span_id = trace._add(name, start, None, parent, attrs)
+        token = _current_span.set(span_id)
+    try:
+        yield attrs
+    finally:
+        duration = time.perf_counter() - start
+        if token is not None:
+            _current_span.reset(token)
+            with trace._lock:
+                trace.spans[span_id]["duration"] = duration
+        span_metrics.record(name, duration)
+
+
+def record(name, start, duration, **attrs):
+    """이미 끝난 구간을 현재 span 아래에 추가 (제너레이터처럼 with 로 감싸기 어려운 경우)"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace._add(name, start, duration, _current_span.get(), attrs)
+    span_metrics.record(name, duration)
+
+
+def traced(name):
+    """함수 전체를 span 으로 감싸는 데코레이터"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
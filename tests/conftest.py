@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 모듈들은 src 를 기준으로 import (streamlit run src/... 과 같은 방식)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,66 @@
+import json
+
+import requests
+
+from api_client import ApiClient
+from streaming import StreamingAnswer
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, lines, error=None):
+        self.lines = lines
+        self.error = error
+
+    def iter_lines(self):
+        for line in self.lines:
+            yield json.dumps(line, ensure_ascii=False).encode("utf-8")
+        if self.error:
+            raise self.error
+
+
+def _client(response):
+    client = ApiClient("http://api.test")
+    client.session.post = lambda *args, **kwargs: response
+    return client
+
+
+def _read(answer):
+    assert isinstance(answer["content"], StreamingAnswer)
+    return "".join(answer["content"])
+
+
+def test_stream_completes_with_final_answer():
+    client = _client(FakeResponse([
+        {"event": "delta", "text": "안녕"},
+        {"event": "delta", "text": "하세요"},
+        {"event": "answer", "answer": {"role": "bot", "content": "안녕하세요", "name": "구본혁"}, "trace": None},
+    ]))
+    answer = client.ask("구본혁")
+    assert _read(answer) == "안녕하세요"
+    assert answer["name"] == "구본혁"
+
+
+def test_connection_drop_mid_stream_shows_error():
+    client = _client(FakeResponse(
+        [{"event": "delta", "text": "요약 "}],
+        error=requests.ConnectionError("reset by peer"),
+    ))
+    text = _read(client.ask("구본혁"))
+    assert text.startswith("요약 ")
+    assert "❌" in text and "reset by peer" in text
+
+
+def test_server_error_event_mid_stream_shows_error():
+    client = _client(FakeResponse([
+        {"event": "delta", "text": "요약 "},
+        {"event": "error", "error": "upstream timeout"},
+    ]))
+    text = _read(client.ask("구본혁"))
+    assert "❌" in text and "upstream timeout" in text
+
+
+def test_stream_ending_without_final_event_shows_error():
+    client = _client(FakeResponse([{"event": "delta", "text": "요약 "}]))
+    assert "❌" in _read(client.ask("구본혁"))
@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+
+from browser_pool import BrowserPool
+
+
+class FakeDriver:
+    def __init__(self, n):
+        self.n = n
+        self.healthy = True
+        self.quit_called = 0
+
+    @property
+    def current_window_handle(self):
+        if not self.healthy:
+            raise RuntimeError("browser died")
+        return f"window-{self.n}"
+
+    def quit(self):
+        self.quit_called += 1
+
+
+@pytest.fixture
+def drivers():
+    return []
+
+
+def _pool(drivers, **kw):
+    def factory():
+        driver = FakeDriver(len(drivers))
+        drivers.append(driver)
+        return driver
+    kw.setdefault("checkout_timeout", 1)
+    return BrowserPool(driver_factory=factory, **kw)
+
+
+def test_checkin_makes_session_reusable(drivers):
+    pool = _pool(drivers, size=2)
+    with pool.driver() as first:
+        pass
+    with pool.driver() as second:
+        pass
+
+    assert first is second
+    assert len(drivers) == 1
+    assert pool.stats["created"] == 1 and pool.stats["reused"] == 1
+
+
+def test_session_recycled_after_max_pages(drivers):
+    pool = _pool(drivers, size=1, max_pages=2)
+    for _ in range(3):
+        with pool.driver():
+            pass
+
+    # 두 페이지를 쓴 첫 브라우저는 종료되고 새로 생성
+    assert len(drivers) == 2
+    assert drivers[0].quit_called == 1 and drivers[1].quit_called == 0
+    assert pool.stats["recycled"] == 1
+
+
+def test_unhealthy_idle_driver_is_replaced(drivers):
+    pool = _pool(drivers, size=1)
+    with pool.driver():
+        pass
+    drivers[0].healthy = False
+
+    with pool.driver() as driver:
+        assert driver is drivers[1]
+    assert drivers[0].quit_called == 1
+    assert pool.stats["broken"] == 1
+
+
+def test_error_inside_with_discards_session(drivers):
+    pool = _pool(drivers, size=1)
+    with pytest.raises(ValueError):
+        with pool.driver():
+            raise ValueError("page failed")
+
+    with pool.driver() as driver:
+        assert driver is drivers[1]
+    assert drivers[0].quit_called == 1
+
+
+def test_checkout_waits_then_times_out_when_pool_is_full(drivers):
+    pool = _pool(drivers, size=1)
+    session = pool.checkout()
+    with pytest.raises(TimeoutError):
+        pool.checkout(timeout=0.05)
+
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.checkout(timeout=2)))
+    waiter.start()
+    pool.checkin(session)
+    waiter.join()
+    assert got[0] is session
+
+
+def test_close_quits_every_driver(drivers):
+    pool = _pool(drivers, size=3)
+    pool.warm_up(2)
+    in_use = pool.checkout()
+    pool.close()
+
+    # 쉬고 있던 브라우저는 바로, 사용 중이던 브라우저는 반납할 때 종료
+    assert sum(d.quit_called for d in drivers) == 1
+    pool.checkin(in_use)
+    assert all(d.quit_called == 1 for d in drivers)
+    with pytest.raises(RuntimeError):
+        pool.checkout()
@@ -0,0 +1,85 @@
+import time
+from pathlib import Path
+
+import pytest
+
+import bulk_crawl
+import record_store
+from record_parse import RecordSnapshot, parse_career, parse_game_log
+from record_store import RecordStore
+
+FIXTURE = Path(__file__).resolve().parent.parent / "data" / "fixtures" / "naver_record" / "69100.html"
+
+
+def _snapshot(player_id):
+    html = FIXTURE.read_text(encoding="utf-8")
+    return RecordSnapshot(player_id, parse_game_log(html), parse_career(html))
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    calls = []
+
+    def fetch(player_id):
+        calls.append(player_id)
+        return _snapshot(player_id)
+
+    monkeypatch.setattr(bulk_crawl.record_snapshot, "fetch_snapshot", fetch)
+    return calls
+
+
+def test_resume_carries_failed_count_and_skips_attempted_players(tmp_path, fetched):
+    store = RecordStore(tmp_path / "records.sqlite3")
+    run_id = store.start_run(4)
+    store.save_snapshot(_snapshot("1"))
+    store.mark_failed("3", "TimeoutException", run_id=run_id)
+    store.update_run(run_id, 1, 1)
+
+    progress = bulk_crawl.run(store, ["1", "2", "3", "4"], workers=2, delay=0, log=lambda *_: None)
+
+    assert sorted(fetched) == ["2", "4"]
+    assert (progress.done, progress.failed) == (3, 1)
+    row = store._conn().execute("SELECT done, failed, finished_at FROM crawl_runs WHERE run_id = ?",
+                                (run_id,)).fetchone()
+    assert row[0] == 3 and row[1] == 1 and row[2] is not None
+
+
+def test_failures_are_recorded_per_run(tmp_path, monkeypatch):
+    def fail(player_id):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(bulk_crawl.record_snapshot, "fetch_snapshot", fail)
+    store = RecordStore(tmp_path / "records.sqlite3")
+    progress = bulk_crawl.run(store, ["7"], workers=1, delay=0, retries=0, log=lambda *_: None)
+
+    assert progress.failed == 1
+    run_id = store._conn().execute("SELECT MAX(run_id) FROM crawl_runs").fetchone()[0]
+    assert store.run_failures(run_id) == {"7"}
+
+
+def test_get_record_store_rechecks_for_new_database(tmp_path, monkeypatch):
+    path = tmp_path / "records.sqlite3"
+    monkeypatch.setattr(record_store, "RECORD_DB", path)
+    monkeypatch.setattr(record_store, "STORE_RECHECK", 0.1)
+    monkeypatch.setattr(record_store, "_store", None)
+    monkeypatch.setattr(record_store, "_store_checked_at", None)
+    monkeypatch.setattr(record_store, "_store_pinned", False)
+
+    assert record_store.get_record_store() is None
+    RecordStore(path)       # 일괄 수집이 파일을 만듦
+    assert record_store.get_record_store() is None      # 확인 간격 전에는 그대로
+    time.sleep(0.15)
+    assert record_store.get_record_store() is not None
+
+
+def test_set_record_store_none_disables_recheck(tmp_path, monkeypatch):
+    path = tmp_path / "records.sqlite3"
+    RecordStore(path)
+    monkeypatch.setattr(record_store, "RECORD_DB", path)
+    monkeypatch.setattr(record_store, "STORE_RECHECK", 0)
+    monkeypatch.setattr(record_store, "_store_checked_at", None)
+    monkeypatch.setattr(record_store, "_store_pinned", False)
+    monkeypatch.setattr(record_store, "_store", None)
+
+    record_store.set_record_store(None)
+    assert record_store.get_record_store() is None
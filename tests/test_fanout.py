@@ -0,0 +1,43 @@
+import time
+
+from fanout import run_sources
+
+
+def _sleeper(seconds, value):
+    def fn():
+        time.sleep(seconds)
+        return value
+    return fn
+
+
+def test_slow_source_times_out_without_blocking_the_call():
+    start = time.perf_counter()
+    results = run_sources(
+        {"news": _sleeper(3.0, "late"), "record": _sleeper(0.05, "ok")},
+        timeouts={"news": 0.5, "record": 1.0},
+    )
+    elapsed = time.perf_counter() - start
+
+    assert results["news"].error == "timeout"
+    assert results["record"].value == "ok"
+    # 전체 시간은 가장 긴 제한 시간 + 약간의 여유 안 (시간을 넘긴 스레드를 기다리지 않음)
+    assert elapsed < 1.0 + 0.3
+
+
+def test_results_are_reported_in_completion_order():
+    seen = []
+    run_sources(
+        {"slow": _sleeper(0.2, 2), "fast": _sleeper(0.01, 1)},
+        timeouts={"slow": 1.0, "fast": 1.0},
+        on_result=lambda r: seen.append(r.name),
+    )
+    assert seen == ["fast", "slow"]
+
+
+def test_source_errors_are_captured():
+    def boom():
+        raise ValueError("x")
+
+    results = run_sources({"summary": boom}, timeouts={"summary": 1.0})
+    assert isinstance(results["summary"].error, ValueError)
+    assert not results["summary"].ok
@@ -0,0 +1,53 @@
+import pytest
+
+from intent_model import INTENTS, build_training_set, get_intent_model
+
+# 학습 키워드 / 템플릿에 없는 표현 (모델 평가용, 학습 씨앗에 추가하지 말 것)
+HELD_OUT = [
+    ("요즘 잘 지내?", "news"), ("무슨 일 있었어? 최근에", "news"), ("새로 나온 소식 있어?", "news"),
+    ("언론에 뭐라고 나왔어", "news"), ("인스타에 뭐 올라왔어", "news"), ("요새 어떻게 지내", "news"),
+    ("타격감 어때", "stats"), ("올해 몇 승 했어", "stats"), ("방어율 얼마야", "stats"),
+    ("장타 몇 개 쳤어", "stats"), ("이번 시즌 기록 좀", "stats"), ("삼진 몇 개 잡았어", "stats"),
+    ("타점 몇 개야", "stats"), ("평균자책점 알려줘", "stats"),
+    ("어디 지켜?", "position"), ("어느 포지션 맡아", "position"), ("공 던지는 선수야", "position"),
+    ("수비 위치가 어디야", "position"), ("투수야 타자야", "position"), ("외야 보는 선수야?", "position"),
+    ("몇 년생이야", "profile"), ("어느 팀 소속이야", "profile"), ("등 번호 몇 번", "profile"),
+    ("키 몇이야", "profile"), ("연봉 얼마 받아", "profile"), ("출신 학교가 어디야", "profile"),
+    ("어떤 사람이야 소개해줘", "profile"),
+    ("오늘 날씨 좋다", "unknown"), ("점심 뭐 먹을까", "unknown"), ("너 이름이 뭐야", "unknown"),
+    ("고맙습니다", "unknown"), ("잘 자", "unknown"),
+]
+
+
+@pytest.fixture(scope="module")
+def model():
+    return get_intent_model()
+
+
+def test_held_out_queries_are_not_training_sentences():
+    training = {text for text, _ in build_training_set()}
+    assert not [q for q, _ in HELD_OUT if q in training]
+
+
+def test_held_out_accuracy(model):
+    correct = sum(model.predict(q)[0] == label for q, label in HELD_OUT)
+    assert correct / len(HELD_OUT) >= 0.75
+
+
+@pytest.mark.parametrize("query,label", [
+    ("요즘 잘 지내?", "news"),
+    ("올해 몇 승 했어", "stats"),
+    ("공 던지는 선수야", "position"),
+    ("출신 학교가 어디야", "profile"),
+    ("점심 뭐 먹을까", "unknown"),
+])
+def test_clear_held_out_queries(model, query, label):
+    intent, confidence = model.predict(query)
+    assert intent == label
+    assert confidence >= 0.6
+
+
+def test_predict_returns_known_intent_and_probability(model):
+    intent, confidence = model.predict("아무 말")
+    assert intent in INTENTS
+    assert 0.0 <= confidence <= 1.0
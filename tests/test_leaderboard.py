@@ -0,0 +1,95 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from leaderboard import QUALIFIED_IP, QUALIFIED_PA, Leaderboard, parse_query, qualification_note
+
+# 엔진은 import 할 때 OpenAI 클라이언트를 만듦 (팀 이름 인식만 사용하므로 실제 호출 없음)
+os.environ.setdefault("OPENAI_API_KEY", "test")
+chatbot_engine = pytest.importorskip("chatbot_engine")
+
+
+@pytest.fixture(scope="module")
+def board():
+    nan = np.nan
+    rows = [
+        # playerId, 팀명, PA, AB, AVG, HR, IP, ERA, SV
+        ("1", "LG", 500, 450, 0.310, 20, nan, nan, nan),
+        ("2", "KIA", 480, 430, 0.330, 25, nan, nan, nan),
+        ("3", "KIA", 120, 110, 0.400, 3, nan, nan, nan),       # 규정타석 미달
+        ("4", "SSG", 460, 410, 0.290, 25, nan, nan, nan),
+        ("5", "KIA", nan, nan, nan, nan, 150.0, 2.80, 0),
+        ("6", "NC", nan, nan, nan, nan, 40.0, 1.50, 30),       # 규정이닝 미달
+        ("7", "NC", nan, nan, nan, nan, 160.0, 3.10, 0),
+    ]
+    stats = pd.DataFrame(rows, columns=["playerId", "팀명", "PA", "AB", "AVG", "HR", "IP", "ERA", "SV"])
+    profiles = pd.DataFrame({
+        "playerId": [r[0] for r in rows],
+        "name": [f"선수{r[0]}" for r in rows],
+        "team": [r[1] for r in rows],
+    })
+    return Leaderboard(stats, profiles)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("홈런 1위", {"stat": "HR", "mode": "at", "n": 1}),
+    ("타율 top 3", {"stat": "AVG", "mode": "top", "n": 3}),
+    ("평균자책 순위", {"stat": "ERA", "mode": "top", "n": 5}),
+    ("최다안타", {"stat": "H", "mode": "at", "n": 1}),
+    ("세이브 상위 50", {"stat": "SV", "mode": "top", "n": 30}),
+    ("OPS 2위", {"stat": "OPS", "mode": "at", "n": 2}),
+])
+def test_parse_query_top_and_rank(text, expected):
+    query = parse_query(text)
+    assert {k: query[k] for k in expected} == expected
+    assert query["team"] is None
+
+
+def test_parse_query_ignores_non_leaderboard_questions():
+    assert parse_query("구본혁 성적") is None
+    assert parse_query("피홈런 순위") is None
+    assert parse_query("양의지 타율 몇 위")["stat"] == "AVG"
+
+
+@pytest.mark.parametrize("text, team", [
+    ("LG 타율 top 5", "LG"),
+    ("KIA 타율 top 5", "KIA"),
+    ("kia 타율 top 5", "KIA"),
+    ("SSG 홈런 top 3", "SSG"),
+    ("KT 홈런 1위", "KT"),
+    ("NC 세이브 순위", "NC"),
+    ("기아 타율 top 3", "KIA"),
+    ("한화 평균자책 1위", "한화"),
+])
+def test_team_filter_with_any_case(text, team):
+    found = chatbot_engine.find_team(text)
+    assert found == team
+    assert parse_query(text, found)["team"] == team
+
+
+def test_rate_stats_require_qualification(board):
+    avg = [e["playerId"] for e in board.top("AVG", n=10)]
+    assert avg == ["2", "1", "4"]          # 0.400 인 3번은 규정타석 미달
+    era = [e["playerId"] for e in board.top("ERA", n=10)]
+    assert era == ["5", "7"]               # 1.50 인 6번은 규정이닝 미달
+    assert board.rank_of("AVG", "3")[0] is None
+    assert qualification_note("AVG") == f"규정타석 {QUALIFIED_PA:.0f} 이상"
+    assert qualification_note("ERA") == f"규정이닝 {QUALIFIED_IP:.0f} 이상"
+
+
+def test_counting_stats_include_everyone(board):
+    assert "3" in [e["playerId"] for e in board.top("HR", n=10)]
+    assert board.top("SV", n=1)[0]["playerId"] == "6"
+    assert qualification_note("HR") == ""
+
+
+def test_ties_share_rank_and_team_filter(board):
+    first = board.at_rank("HR", 1)
+    assert sorted(e["playerId"] for e in first) == ["2", "4"]
+    assert board.rank_of("HR", "1")[0] == 3
+
+    kia = board.top("HR", n=5, team="KIA")
+    assert [(e["playerId"], e["rank"]) for e in kia] == [("2", 1), ("3", 2)]
+    assert board.top("HR", team="두산") == []
@@ -0,0 +1,117 @@
+import json
+import time
+
+from llm_cache import LLMCache, completion_key, make_cache_key, temperature_bucket
+
+
+def test_puts_are_batched_into_one_background_save(tmp_path):
+    path = tmp_path / "llm_cache.json"
+    cache = LLMCache(path=path, save_delay=0.2)
+    for i in range(50):
+        cache.put(f"k{i}", f"답변 {i}", tokens=10)
+
+    # put 은 파일을 쓰지 않고 저장만 예약
+    assert not path.exists()
+    deadline = time.time() + 3
+    while not path.exists() and time.time() < deadline:
+        time.sleep(0.02)
+    assert len(json.loads(path.read_text(encoding="utf-8"))) == 50
+    assert cache.stats["saves"] == 1
+
+
+def test_flush_persists_and_reloads(tmp_path):
+    path = tmp_path / "llm_cache.json"
+    cache = LLMCache(path=path, save_delay=60)
+    cache.put("a", "첫 답변", tokens=5)
+    cache.flush()
+    cache.flush()       # 바뀐 게 없으면 다시 쓰지 않음
+    assert cache.stats["saves"] == 1
+
+    reloaded = LLMCache(path=path, save_delay=60)
+    assert reloaded.get("a") == "첫 답변"
+
+
+def test_clear_is_written_immediately(tmp_path):
+    path = tmp_path / "llm_cache.json"
+    cache = LLMCache(path=path, save_delay=60)
+    cache.put("a", "답변")
+    cache.clear()
+    assert json.loads(path.read_text(encoding="utf-8")) == []
+
+
+def test_memory_only_cache_never_touches_disk(tmp_path):
+    cache = LLMCache(path="", save_delay=0)
+    cache.put("a", "답변")
+    cache.flush()
+    assert cache.get("a") == "답변"
+    assert cache.stats["saves"] == 0
+
+
+def _evaluation_prompt(name, stats_text, header="아래는 {name} 선수의 주요 성적 요약입니다."):
+    return header.format(name=name) + f"\n[성적 요약]\n{stats_text}\n"
+
+
+def test_normalized_inputs_share_a_key():
+    a = make_cache_key("m", {"player": "구본혁", "stats_text": "타율 0.286  홈런 1"}, 0.8, 200)
+    b = make_cache_key("m", {"stats_text": "  타율 0.286 홈런 1", "player": "구본혁 "}, 0.8, 200)
+    c = make_cache_key("m", {"user_input": "LG 뉴스"}, 0, 5)
+    d = make_cache_key("m", {"user_input": "lg   뉴스"}, 0, 5)
+    assert a == b and c == d
+    assert a != make_cache_key("m", {"player": "구본혁", "stats_text": "타율 0.300 홈런 1"}, 0.8, 200)
+
+
+def test_temperature_buckets():
+    assert temperature_bucket(0.81) == temperature_bucket(0.84) == "0.8"
+    assert temperature_bucket(0) == "0" != temperature_bucket(0.04)
+    assert make_cache_key("m", "q", 0.81, 10) == make_cache_key("m", "q", 0.84, 10)
+    assert make_cache_key("m", "q", 0, 10) != make_cache_key("m", "q", 0.04, 10)
+
+
+def test_prompt_template_change_changes_key():
+    inputs = {"kind": "evaluation", "player": "구본혁", "stats_text": "타율 0.286"}
+    old = completion_key(_evaluation_prompt("구본혁", "타율 0.286"), "m", 0.8, 200, inputs)
+    same = completion_key(_evaluation_prompt("구본혁", "타율   0.286"), "m", 0.8, 200,
+                          {**inputs, "stats_text": "타율   0.286"})
+    edited = completion_key(
+        _evaluation_prompt("구본혁", "타율 0.286", header="{name} 선수의 2025 시즌 성적입니다."),
+        "m", 0.8, 200, inputs,
+    )
+    assert old == same
+    assert old != edited
+
+
+def test_ttl_expiry():
+    cache = LLMCache(ttl=0.05, path="")
+    cache.put("a", "답변")
+    assert cache.get("a") == "답변"
+    time.sleep(0.08)
+    assert cache.get("a") is None
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_lru_eviction():
+    cache = LLMCache(max_size=2, path="")
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")          # a 가 최근 사용
+    cache.put("c", "3")     # b 제거
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+
+
+def test_malformed_entries_are_skipped_on_load(tmp_path):
+    path = tmp_path / "llm_cache.json"
+    now = time.time()
+    path.write_text(json.dumps([
+        ["ok", "답변", now, 3],
+        ["short", "답변"],
+        ["bad_time", "답변", "어제", 1],
+        [1, 2, now, 0],
+        "not a list",
+        None,
+    ]), encoding="utf-8")
+    cache = LLMCache(path=path, save_delay=60)
+    assert list(cache._data) == ["ok"]
+
+    path.write_text(json.dumps({"unexpected": "shape"}), encoding="utf-8")
+    assert LLMCache(path=path, save_delay=60)._data == {}
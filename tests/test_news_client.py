@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+from fixture_server import start_fixture_server
+from news_client import NewsClient, RateLimiter
+
+
+@pytest.fixture
+def server():
+    srv, base = start_fixture_server()
+    srv.base = base
+    yield srv
+    srv.shutdown()
+
+
+class CountingLimiter(RateLimiter):
+    """acquire 호출 수를 세는 속도 제한 (allow 개까지만 허용)"""
+
+    def __init__(self, allow=1000):
+        super().__init__(rate=1000)
+        self.allow = allow
+        self.acquired = 0
+
+    def acquire(self, timeout=1.0):
+        if self.acquired >= self.allow:
+            return False
+        self.acquired += 1
+        return True
+
+
+def _client(server, **kw):
+    kw.setdefault("retry_backoff", 0.01)
+    return NewsClient(base_url=server.base, **kw)
+
+
+def test_search_caches_results(server):
+    client = _client(server)
+    first = client.search("구본혁", display=2)
+    second = client.search("구본혁", display=2)
+
+    assert len(first) == 2 and "<b>" not in first[0]["title"]
+    assert second == first
+    assert server.RequestHandlerClass.request_count == 1
+    assert client.stats["hits"] == 1 and client.stats["misses"] == 1
+
+
+def test_each_retry_takes_a_rate_limit_token(server):
+    server.RequestHandlerClass.fail_next = 2
+    limiter = CountingLimiter()
+    client = _client(server, retries=2, rate_limiter=limiter)
+
+    assert client.search("LG 트윈스")
+    assert server.RequestHandlerClass.request_count == 3
+    assert limiter.acquired == 3
+    assert client.stats["retries"] == 2 and client.stats["errors"] == 0
+
+
+def test_retries_stop_when_limiter_refuses(server):
+    server.RequestHandlerClass.fail_next = 5
+    client = _client(server, retries=3, rate_limiter=CountingLimiter(allow=2))
+
+    assert client.search("LG 트윈스") == []
+    # 토큰 두 개만큼만 실제 요청이 나감
+    assert server.RequestHandlerClass.request_count == 2
+    assert client.stats["throttled"] == 1
+
+
+def test_cache_is_bounded_lru(server):
+    client = _client(server, max_size=2)
+    client.search("a")
+    client.search("b")
+    client.search("a")          # a 가 최근 사용
+    client.search("c")          # b 제거
+
+    assert set(client._cache) == {("a", 3), ("c", 3)}
+    assert client.stats["evictions"] == 1
+
+
+def test_stale_result_returned_and_refreshed(server):
+    client = _client(server, cache_ttl=0.05, stale_ttl=60)
+    client.search("구본혁")
+    time.sleep(0.1)
+
+    assert client.search("구본혁")
+    assert client.stats["stale_hits"] == 1
+    deadline = time.time() + 2
+    while server.RequestHandlerClass.request_count < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert server.RequestHandlerClass.request_count == 2
+
+
+def test_stats_consistent_under_concurrency(server):
+    client = _client(server)
+    client.search("구본혁")
+
+    threads = [threading.Thread(target=lambda: [client.search("구본혁") for _ in range(200)])
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert client.stats["hits"] == 8 * 200
@@ -0,0 +1,44 @@
+import os
+
+import pandas as pd
+import pytest
+
+# 엔진은 import 할 때 OpenAI 클라이언트를 만듦 (ask_llm 은 테스트에서 대체하므로 실제 호출 없음)
+os.environ.setdefault("OPENAI_API_KEY", "test")
+chatbot_engine = pytest.importorskip("chatbot_engine")
+
+PLAYER_ID = "69100"
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    def fake_ask_llm(prompt, cache_inputs=None, **kwargs):
+        calls.append(cache_inputs)
+        return "요약"
+
+    class FakeCache:
+        def warm(self, player_id, refresh=False):
+            return None
+
+    season = pd.DataFrame([{"시즌": "2025", "타율": "0.286", "홈런": "1"}])
+    monkeypatch.setattr(chatbot_engine, "ask_llm", fake_ask_llm)
+    monkeypatch.setattr(chatbot_engine, "get_snapshot_cache", lambda: FakeCache())
+    monkeypatch.setattr(chatbot_engine, "get_player_career_stats", lambda pid, snap=None: (None, season))
+    monkeypatch.setattr(chatbot_engine, "fetch_news", lambda query, display=3: [])
+    return calls
+
+
+def test_warm_player_covers_the_player_card_summary(llm_calls):
+    assert chatbot_engine.warm_player(PLAYER_ID)
+    warmed = list(llm_calls)
+    assert len(warmed) == 2
+
+    llm_calls.clear()
+    p = chatbot_engine.store.player_index.profile(PLAYER_ID)
+    chatbot_engine.build_player_card(p.get("name"), p)
+    card_keys = [c for c in llm_calls if c and c.get("kind") == "evaluation"]
+
+    # 선수 카드가 쓰는 요약 키를 prefetch 가 미리 만들어 둠
+    assert card_keys and all(key in warmed for key in card_keys)
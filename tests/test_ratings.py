@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_snapshot import coerce_stats
+from ratings import PlayerRatings, shrink
+
+STATS_CSV = Path(__file__).resolve().parent.parent / "data" / "KBO_2025_player_stats_type.csv"
+
+
+@pytest.fixture(scope="module")
+def stats():
+    return coerce_stats(pd.read_csv(STATS_CSV, dtype=str))
+
+
+def _labels(ratings, player_id):
+    found = ratings.get(player_id)
+    return {label: (score, grade) for label, score, grade in found["ratings"]} if found else {}
+
+
+def test_control_dropped_when_walks_cover_only_part_of_the_pool(stats):
+    # 투수 BB 는 일부 선수에게만 있으므로 WHIP 기반 제구는 아무에게도 매기지 않음
+    ratings = PlayerRatings(stats)
+    for pid in ratings.frames["pitcher"].index:
+        assert "제구" not in _labels(ratings, pid)
+
+
+def test_control_used_when_walks_exist_for_the_pool(stats):
+    stats = stats.copy()
+    pitchers = stats["ERA"].notna()
+    stats.loc[pitchers, "BB"] = stats.loc[pitchers, "BB"].fillna(10.0)
+    ratings = PlayerRatings(stats)
+    pid = ratings.frames["pitcher"].index[0]
+    assert "제구" in _labels(ratings, pid)
+
+
+def test_hit_prevention_covers_every_pitcher(stats):
+    ratings = PlayerRatings(stats)
+    for pid in ratings.frames["pitcher"].index:
+        assert "피안타 억제" in _labels(ratings, pid)
+
+
+def test_small_sample_is_not_graded_extreme(stats):
+    # 77263: 12.1이닝 ERA 1.46 -> 백분위는 최상위지만 표본이 적어 50 쪽으로 보정
+    ratings = PlayerRatings(stats)
+    found = ratings.get("77263")
+    assert found["sample_ok"] is False
+    score, grade = _labels(ratings, "77263")["실점 억제"]
+    assert 50 < score < 90
+    assert grade != "S"
+
+
+def test_shrink_weights_by_sample():
+    scores = np.array([100.0, 100.0, 100.0, 0.0])
+    sample = np.array([0.0, 15.0, 60.0, np.nan])
+    assert shrink(scores, sample, 30).tolist() == [50.0, 75.0, 100.0, 50.0]
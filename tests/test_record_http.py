@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import pytest
+
+import record_parse
+import record_snapshot
+from fixture_server import start_fixture_server
+from record_http import ClientRenderedPage, RecordUnavailable, fetch_snapshot_http, is_client_rendered
+from record_parse import parse_career, parse_game_log
+
+FIXTURES = Path(__file__).resolve().parent.parent / "data" / "fixtures" / "naver_record"
+
+# 실제 서비스처럼 기록 영역 없이 스크립트만 내려오는 페이지
+SHELL_HTML = '<html><body><div id="root"></div><script src="/static/app.js"></script></body></html>'
+
+
+@pytest.fixture(scope="module")
+def fixture_base():
+    server, base = start_fixture_server()
+    yield base
+    server.shutdown()
+
+
+@pytest.fixture
+def naver_base(monkeypatch, fixture_base):
+    monkeypatch.setattr(record_parse, "NAVER_SPORTS_BASE", fixture_base)
+    return fixture_base
+
+
+def test_parsers_read_server_rendered_fixture():
+    html = (FIXTURES / "69100.html").read_text(encoding="utf-8")
+    game_log = parse_game_log(html)
+    career = parse_career(html)
+
+    assert not is_client_rendered(html)
+    assert list(game_log.columns[:1]) == ["일자"]
+    assert 0 < len(game_log) <= record_parse.GAME_LOG_LIMIT
+    assert game_log["일자"].iloc[0] == "09.28"
+    assert list(career.columns[:1]) == ["시즌"]
+    assert len(career) > 0
+
+
+def test_parsers_return_none_for_client_rendered_shell():
+    assert is_client_rendered(SHELL_HTML)
+    assert parse_game_log(SHELL_HTML) is None
+    assert parse_career(SHELL_HTML) is None
+
+
+def test_fetch_snapshot_http_against_local_server(naver_base):
+    snap = fetch_snapshot_http(69100)
+    assert snap.player_id == "69100"
+    assert snap.career is not None and snap.game_log is not None
+
+
+def test_fetch_snapshot_http_missing_player_is_unavailable(naver_base):
+    with pytest.raises(RecordUnavailable) as exc:
+        fetch_snapshot_http(1)
+    assert not isinstance(exc.value, ClientRenderedPage)
+
+
+class _Calls:
+    def __init__(self, http_error=None):
+        self.http_error = http_error
+        self.http = 0
+        self.selenium = 0
+
+    def fetch_http(self, player_id):
+        self.http += 1
+        raise self.http_error
+
+    def fetch_selenium(self, player_id):
+        self.selenium += 1
+        return f"selenium:{player_id}"
+
+
+@pytest.fixture
+def auto_backend(monkeypatch):
+    monkeypatch.setattr(record_snapshot, "RECORD_BACKEND", "auto")
+    monkeypatch.setattr(record_snapshot, "_http_skip_until", 0.0)
+
+    def install(calls):
+        monkeypatch.setattr(record_snapshot, "fetch_snapshot_http", calls.fetch_http)
+        monkeypatch.setattr(record_snapshot, "fetch_snapshot_selenium", calls.fetch_selenium)
+        return calls
+    return install
+
+
+def test_auto_skips_http_after_client_rendered_page(auto_backend):
+    calls = auto_backend(_Calls(ClientRenderedPage("shell")))
+
+    assert record_snapshot.fetch_snapshot(1) == "selenium:1"
+    assert record_snapshot.fetch_snapshot(2) == "selenium:2"
+    # 빈 페이지를 한 번 받은 뒤로는 HTTP 왕복 없이 바로 Selenium
+    assert calls.http == 1
+    assert calls.selenium == 2
+    assert not record_snapshot.auto_tries_http()
+
+
+def test_auto_keeps_trying_http_after_transient_error(auto_backend):
+    calls = auto_backend(_Calls(RecordUnavailable("HTTP 503")))
+
+    record_snapshot.fetch_snapshot(1)
+    record_snapshot.fetch_snapshot(2)
+    assert calls.http == 2
+    assert calls.selenium == 2
+    assert record_snapshot.auto_tries_http()
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+import record_snapshot
+from record_snapshot import WaitTimings, wait_for_css
+
+
+class FakeDriver:
+    """ready_after 번째 조회부터 요소를 찾는 가짜 webdriver (None 이면 끝까지 못 찾음)"""
+
+    def __init__(self, ready_after=None):
+        self.ready_after = ready_after
+        self.lookups = 0
+
+    def find_element(self, by, value):
+        self.lookups += 1
+        if self.ready_after is None or self.lookups < self.ready_after:
+            raise NoSuchElementException(value)
+        return object()
+
+
+@pytest.fixture
+def timings(monkeypatch):
+    timings = WaitTimings()
+    monkeypatch.setattr(record_snapshot, "wait_timings", timings)
+    return timings
+
+
+def test_ready_element_stops_waiting(timings):
+    driver = FakeDriver(ready_after=3)
+    assert wait_for_css(driver, "#_careerStatsArea table", "career", timeout=2, poll=0.01)
+
+    summary = timings.summary()["career"]
+    assert driver.lookups == 3
+    assert summary["count"] == 1 and summary["timeouts"] == 0
+    assert summary["max"] < 1
+
+
+def test_missing_element_times_out_and_is_counted(timings):
+    assert not wait_for_css(FakeDriver(), "#_gameLogArea", "game_log", timeout=0.2, poll=0.05)
+    assert wait_for_css(FakeDriver(ready_after=1), "#_gameLogArea", "game_log", timeout=0.2, poll=0.05)
+
+    summary = timings.summary()["game_log"]
+    assert summary["count"] == 2 and summary["timeouts"] == 1
+    assert summary["max"] >= 0.2
+
+
+def test_engine_stats_reports_page_wait(timings, monkeypatch):
+    # 엔진은 import 할 때 OpenAI 클라이언트를 만듦 (상태 조회만 하므로 실제 호출 없음)
+    os.environ.setdefault("OPENAI_API_KEY", "test")
+    chatbot_engine = pytest.importorskip("chatbot_engine")
+    monkeypatch.setattr(chatbot_engine, "wait_timings", timings)
+
+    wait_for_css(FakeDriver(ready_after=1), "#_careerStatsArea table", "career", timeout=1, poll=0.01)
+    assert chatbot_engine.engine_stats()["page_wait"]["career"]["count"] == 1